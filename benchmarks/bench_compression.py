@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures the bytes on the wire and the time until the first object is
+delivered for large list responses of the laps and venues endpoints, with
+and without a compressed response, over a local server throttled to a
+cellular link.
+
+    python -m benchmarks.bench_compression [bytes per second]
+
+The payloads are generated with a fixed seed, shaped like expanded laps of
+a race and venues with their track maps, so every run serves the same bytes.
+"""
+import gzip
+import json
+import random
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from importlib.util import find_spec
+
+import podium_api
+from podium_api.laps import make_laps_get
+from podium_api.transport import PooledTransport
+from podium_api.types.token import PodiumToken
+from podium_api.venues import make_venues_get
+
+BANDWIDTH = 500 * 1024
+WRITE_SIZE = 4096
+
+
+def make_laps_payload(count=500, seed=1):
+    rand = random.Random(seed)
+    laps = []
+    end_time = 1500000000.0
+    for number in range(1, count + 1):
+        lap_time = round(rand.uniform(88, 96), 3)
+        end_time += lap_time
+        laps.append(
+            {
+                "URI": "https://podium.live/api/v1/events/12/devices/34/laps/{}".format(number),
+                "raw_data_uri": "https://podium.live/api/v1/events/12/devices/34/laps/{}/raw".format(number),
+                "lap_number": number,
+                "end_time": end_time,
+                "lap_time": lap_time,
+                "aggregates": {
+                    channel: {
+                        "min": round(rand.uniform(0, 50), 2),
+                        "max": round(rand.uniform(50, 200), 2),
+                        "avg": round(rand.uniform(25, 125), 2),
+                    }
+                    for channel in ("Speed", "RPM", "EngineTemp", "OilPress", "AccelX", "AccelY", "Yaw", "TPS")
+                },
+            }
+        )
+    return {"laps": laps, "total": count, "nextURI": None, "prevURI": None}
+
+
+def make_venues_payload(count=100, seed=2):
+    rand = random.Random(seed)
+    venues = []
+    for venue_id in range(1, count + 1):
+        lat, lon = rand.uniform(-60, 60), rand.uniform(-180, 180)
+        track = [
+            [round(lat + rand.uniform(-0.01, 0.01), 6), round(lon + rand.uniform(-0.01, 0.01), 6)] for _ in range(300)
+        ]
+        venues.append(
+            {
+                "id": venue_id,
+                "URI": "https://podium.live/api/v1/venues/{}".format(venue_id),
+                "events_uri": "https://podium.live/api/v1/venues/{}/events".format(venue_id),
+                "updated": "2017-07-01T12:00:00Z",
+                "created": "2016-03-01T12:00:00Z",
+                "name": "Venue {}".format(venue_id),
+                "centerpoint": "{:.6f},{:.6f}".format(lat, lon),
+                "country_code": "US",
+                "configuration": "Full course",
+                "track_map_array": track,
+                "start_finish": {"lat": track[0][0], "lon": track[0][1]},
+                "finish": {"lat": track[0][0], "lon": track[0][1]},
+                "sector_points": [{"lat": point[0], "lon": point[1]} for point in track[::50]],
+                "length": round(rand.uniform(1, 6), 3),
+            }
+        )
+    return {"venues": venues, "total": count, "nextURI": None, "prevURI": None}
+
+
+def encode(body, encoding):
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(body, 6)
+    if encoding == "br":
+        import brotli
+
+        return brotli.compress(body, quality=5)
+    return body
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    payloads = {}
+    encoding = None
+    bandwidth = BANDWIDTH
+    wire_bytes = 0
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        body = self.payloads[self.path.split("?")[0]]
+        encoding = self.encoding
+        if encoding is None or encoding not in self.headers.get("Accept-Encoding", ""):
+            encoding = None
+        else:
+            body = encode(body, encoding)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if encoding is not None:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        FixtureHandler.wire_bytes += len(body)
+        for offset in range(0, len(body), WRITE_SIZE):
+            chunk = body[offset : offset + WRITE_SIZE]
+            self.wfile.write(chunk)
+            self.wfile.flush()
+            time.sleep(len(chunk) / float(self.bandwidth))
+
+
+def fetch(make_get, token, url):
+    done = threading.Event()
+    result = {}
+
+    def on_success(paged):
+        result["first"] = paged.payload[0]
+        done.set()
+
+    def on_failure(failure_type, failed, data):
+        result["failure"] = failure_type
+        done.set()
+
+    start = time.perf_counter()
+    make_get(token, url, success_callback=on_success, failure_callback=on_failure)
+    done.wait(120)
+    if "first" not in result:
+        raise RuntimeError("request failed: {}".format(result.get("failure")))
+    return time.perf_counter() - start
+
+
+def main():
+    if len(sys.argv) > 1:
+        FixtureHandler.bandwidth = float(sys.argv[1])
+    FixtureHandler.payloads = {
+        "/api/v1/events/12/devices/34/laps": json.dumps(make_laps_payload()).encode("utf-8"),
+        "/api/v1/venues": json.dumps(make_venues_payload()).encode("utf-8"),
+    }
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}".format(server.server_address[1])
+    podium_api.register_podium_application("app_id", "app_secret", podium_url=url)
+    token = PodiumToken("0123456789abcdef0123456789abcdef", "bearer", 1)
+    encodings = [None, "gzip", "deflate"]
+    if find_spec("brotli") is not None:
+        encodings.append("br")
+
+    print("link: {:.0f} KiB/s".format(FixtureHandler.bandwidth / 1024))
+    print("{:<8} {:<10} {:>12} {:>10} {:>16}".format("endpoint", "encoding", "json bytes", "wire", "first object ms"))
+    for name, make_get, path in [
+        ("laps", make_laps_get, "/api/v1/events/12/devices/34/laps"),
+        ("venues", make_venues_get, "/api/v1/venues"),
+    ]:
+        for encoding in encodings:
+            FixtureHandler.encoding = encoding
+            podium_api.register_podium_transport(PooledTransport(decompress=encoding is not None))
+            FixtureHandler.wire_bytes = 0
+            elapsed = fetch(make_get, token, url + path)
+            print(
+                "{:<8} {:<10} {:>12} {:>10} {:>16.0f}".format(
+                    name,
+                    encoding or "identity",
+                    len(FixtureHandler.payloads[path]),
+                    FixtureHandler.wire_bytes,
+                    elapsed * 1000,
+                )
+            )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures the time and peak memory of turning a 100 item page of expanded
+laps into a PodiumPagedResponse and reading its rows: the whole page loaded
+at once with each installed json package, reading all the rows or the 10
+rows a list screen shows, then parsed item by item by a PagedPayloadParser
+fed 8 KiB chunks, keeping the rows or passing each of them to a callback
+that only reads it.
+
+    python -m benchmarks.bench_decode
+"""
+import json
+import timeit
+import tracemalloc
+from importlib.util import find_spec
+
+from podium_api.decoding import find_json_decoder, JSON_DECODERS, PagedPayloadParser
+from podium_api.types.paged_response import get_paged_response_from_json
+
+CHUNK_SIZE = 8192
+SHOWN_ROWS = 10
+
+
+def make_page(count=100):
+    laps = []
+    for number in range(1, count + 1):
+        laps.append(
+            {
+                "URI": "https://podium.live/api/v1/events/12/devices/34/laps/{}".format(number),
+                "raw_data_uri": "https://podium.live/api/v1/events/12/devices/34/laps/{}/raw".format(number),
+                "lap_number": number,
+                "end_time": 1500000000.0 + number * 90,
+                "lap_time": 90.0 + number / 100.0,
+                "aggregates": {
+                    "channel{}".format(channel): {"min": channel * 1.5, "max": channel * 9.5, "avg": channel * 4.25}
+                    for channel in range(40)
+                },
+            }
+        )
+    return json.dumps({"laps": laps, "total": count, "nextURI": None, "prevURI": None}).encode("utf-8")
+
+
+def load_page(body, loads):
+    page = get_paged_response_from_json(loads(body), "laps")
+    list(page.payload)
+    return page
+
+
+def load_shown_rows(body, loads):
+    page = get_paged_response_from_json(loads(body), "laps")
+    page.payload[:SHOWN_ROWS]
+    return page
+
+
+def parse_page(body, loads):
+    parser = PagedPayloadParser("laps", loads=loads)
+    for i in range(0, len(body), CHUNK_SIZE):
+        parser.feed(body[i : i + CHUNK_SIZE])
+    return parser.close()
+
+
+def stream_page(body, loads):
+    rows = []
+    parser = PagedPayloadParser(
+        "laps", loads=loads, item_callback=lambda lap: rows.append(lap.lap_time), keep_items=False
+    )
+    for i in range(0, len(body), CHUNK_SIZE):
+        parser.feed(body[i : i + CHUNK_SIZE])
+    return parser.close(), rows
+
+
+def peak_memory(func, *args):
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    body = make_page()
+    print("page: {} bytes".format(len(body)))
+    print("{:<28} {:>10} {:>12}".format("decoder", "ms/page", "peak KiB"))
+    for name in JSON_DECODERS:
+        if find_spec(name) is None:
+            continue
+        loads = find_json_decoder((name,))
+        for mode, func in (
+            ("whole", load_page),
+            ("whole {} rows".format(SHOWN_ROWS), load_shown_rows),
+            ("incremental", parse_page),
+            ("incremental callback", stream_page),
+        ):
+            number = 20
+            elapsed = min(timeit.repeat(lambda: func(body, loads), number=number, repeat=5)) / number
+            peak = peak_memory(func, body, loads)
+            print("{:<28} {:>10.2f} {:>12.0f}".format("{} {}".format(name, mode), elapsed * 1000, peak / 1024.0))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures the cost of encoding the body of a make_racestats_create batch,
+comparing the dict of formatted keys run through urlencode with the
+precompiled RACESTATS_SCHEMA encoder.
+
+    python -m benchmarks.bench_encode [cars]
+"""
+import sys
+import timeit
+
+from podium_api.racestat import RACESTATS_SCHEMA
+
+try:
+    from urllib.parse import urlencode
+except:
+    from urllib import urlencode
+
+CARS = 100
+
+
+def make_racestats(cars):
+    return [
+        {
+            "device_id": 1000 + index,
+            "comp_number": str(index),
+            "comp_class": "GT3",
+            "total_laps": 42,
+            "last_lap_time": 92.345 + index / 100.0,
+            "position_overall": index + 1,
+            "position_in_class": index + 1,
+            "comp_number_ahead": str(index - 1),
+            "comp_number_behind": str(index + 1),
+            "gap_to_ahead": 0.512,
+            "gap_to_behind": 1.204,
+            "laps_to_ahead": 0,
+            "laps_to_behind": 0,
+            "fc_flag": 1,
+            "comp_flag": 0,
+        }
+        for index in range(cars)
+    ]
+
+
+def encode_dict(racestats):
+    # the encoding make_racestats_create used before RACESTATS_SCHEMA
+    body = {}
+    for index, racestat in enumerate(racestats):
+        for field in RACESTATS_SCHEMA.fields:
+            body[f"racestat[{index}][{field}]"] = racestat[field]
+    return urlencode(body).encode("ascii")
+
+
+def main():
+    cars = int(sys.argv[1]) if len(sys.argv) > 1 else CARS
+    racestats = make_racestats(cars)
+    assert encode_dict(racestats) == RACESTATS_SCHEMA.encode(racestats)
+    encoders = [
+        ("dict + urlencode", encode_dict),
+        ("schema form", RACESTATS_SCHEMA.encode),
+        ("schema json", RACESTATS_SCHEMA.encode_json),
+    ]
+    print("{} racestats per batch".format(cars))
+    print("{:<20} {:>12} {:>10}".format("encoder", "us/batch", "bytes"))
+    for name, encode in encoders:
+        number = 200
+        best = min(timeit.repeat(lambda: encode(racestats), number=number, repeat=5)) / number
+        print("{:<20} {:>12.1f} {:>10}".format(name, best * 1e6, len(encode(racestats))))
+
+
+if __name__ == "__main__":
+    main()
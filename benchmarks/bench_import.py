@@ -0,0 +1,62 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures how long importing the podium_api modules takes in a fresh
+interpreter and whether the import pulled in Kivy. A module whose fastest
+import is slower than MAX_IMPORT_MS is flagged, a heavy import crept in, and
+the script exits with status 1 so a release script can fail on it.
+
+    python -m benchmarks.bench_import
+"""
+import statistics
+import subprocess
+import sys
+
+MODULES = ["podium_api", "podium_api.asyncreq", "podium_api.api", "podium_api.aioapi"]
+RUNS = 10
+# generous compared to the tens of milliseconds the imports take
+MAX_IMPORT_MS = 150
+
+SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "kivy" in sys.modules)
+"""
+
+
+def measure(module):
+    timings = []
+    kivy_loaded = False
+    for i in range(RUNS):
+        output = subprocess.check_output([sys.executable, "-c", SCRIPT.format(module=module)])
+        elapsed, loaded = output.decode("utf-8").split()
+        timings.append(float(elapsed) * 1000)
+        kivy_loaded = kivy_loaded or loaded == "True"
+    return timings, kivy_loaded
+
+
+def main():
+    over_budget = []
+    print("{:<24} {:>10} {:>10} {:>8} {:>8}".format("module", "median ms", "min ms", "kivy", "budget"))
+    for module in MODULES:
+        timings, kivy_loaded = measure(module)
+        if min(timings) >= MAX_IMPORT_MS:
+            over_budget.append(module)
+        print(
+            "{:<24} {:>10.1f} {:>10.1f} {:>8} {:>8}".format(
+                module,
+                statistics.median(timings),
+                min(timings),
+                "yes" if kivy_loaded else "no",
+                "OVER" if module in over_budget else "ok",
+            )
+        )
+    if over_budget:
+        sys.exit("over the import budget of {} ms: {}".format(MAX_IMPORT_MS, ", ".join(over_budget)))
+
+
+if __name__ == "__main__":
+    main()
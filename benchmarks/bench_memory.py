@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures the memory used per PodiumLap and Racestat instance, compared to
+the same classes with a per-instance __dict__ as they were before __slots__.
+
+    python -m benchmarks.bench_memory [count]
+"""
+import gc
+import sys
+import tracemalloc
+
+from podium_api.types.lap import PodiumLap
+from podium_api.types.racestat import Racestat
+
+COUNT = 1000000
+
+LAP_ARGS = ("/laps/1", "/laps/1/raw", 1, "2020-01-01T00:00:00Z", None, 61.5)
+RACESTAT_ARGS = (
+    "1",
+    "/racestats/1",
+    "42",
+    "P1",
+    10,
+    61.5,
+    3,
+    2,
+    "41",
+    "43",
+    1.5,
+    2.5,
+    0,
+    0,
+    1,
+    0,
+    "/eventdevices/1",
+    "/devices/1",
+    "/users/1",
+)
+
+
+def dict_backed(cls):
+    # same __init__ on a plain class, i.e. a __dict__ per instance
+    return type("Dict" + cls.__name__, (object,), {"__init__": cls.__init__})
+
+
+def bytes_per_instance(cls, args, count):
+    gc.collect()
+    tracemalloc.start()
+    instances = [cls(*args) for i in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return float(size) / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else COUNT
+    print("{:<12} {:>14} {:>14} {:>8}".format("type", "dict bytes", "slots bytes", "saved"))
+    for cls, args in ((PodiumLap, LAP_ARGS), (Racestat, RACESTAT_ARGS)):
+        before = bytes_per_instance(dict_backed(cls), args, count)
+        after = bytes_per_instance(cls, args, count)
+        print("{:<12} {:>14.1f} {:>14.1f} {:>7.0f}%".format(cls.__name__, before, after, 100 * (1 - after / before)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Measures the per-request overhead of podium_api before the transport, from
+make_user_get to the transport call, with a transport that does nothing.
+Compares the headers built on every request with the headers cached on the
+PodiumToken.
+
+    python -m benchmarks.bench_request
+"""
+import timeit
+
+import podium_api
+from podium_api import asyncreq
+from podium_api.transport import PodiumTransport
+from podium_api.types.token import PodiumToken
+from podium_api.users import make_user_get
+
+
+class NullTransport(PodiumTransport):
+    def request(self, url, **kwargs):
+        return None
+
+
+def get_json_header_token_per_request(token):
+    # get_json_header_token before the header was cached on the token
+    if podium_api.PODIUM_APP is None:
+        raise RuntimeError()
+    return {
+        "Content-Type": "application/x-www-form-urlencoded",
+        "Authorization": "Bearer {}".format(token.token),
+        "Accept": "application/json",
+    }
+
+
+def main():
+    podium_api.register_podium_application("app_id", "app_secret")
+    podium_api.register_podium_transport(NullTransport())
+    token = PodiumToken("0123456789abcdef0123456789abcdef", "bearer", 1)
+    cached = asyncreq.get_json_header_token
+
+    def request():
+        make_user_get(token, "https://podium.live/api/v1/users/1")
+
+    print("{:<20} {:>12} {:>12}".format("headers", "ns/header", "ns/request"))
+    for name, get_header in [("per request", get_json_header_token_per_request), ("cached", cached)]:
+        asyncreq.get_json_header_token = get_header
+        # make_user_get imported the function, patch the module it uses
+        podium_api.users.get_json_header_token = get_header
+        number = 200000
+        header = min(timeit.repeat(lambda: get_header(token), number=number, repeat=5)) / number
+        full = min(timeit.repeat(request, number=number // 10, repeat=5)) / (number // 10)
+        print("{:<20} {:>12.0f} {:>12.0f}".format(name, header * 1e9, full * 1e9))
+    asyncreq.get_json_header_token = cached
+    podium_api.users.get_json_header_token = cached
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import logging
+import sys
+
 from podium_api.types.application import PodiumApplication
 
 """
@@ -42,3 +45,107 @@ def register_podium_application(app_id, app_secret, podium_url=None):
 def unregister_podium_application():
     global PODIUM_APP
     PODIUM_APP = None
+
+
+"""
+
+    **PODIUM_TRANSPORT** (PodiumTransport): The transport used to make
+    requests. Starts out as None, in which case every request is made with
+    its own Kivy UrlRequest. Call **register_podium_transport** to use a
+    different transport, such as a PooledTransport.
+
+"""
+
+PODIUM_TRANSPORT = None
+
+
+def register_podium_transport(transport):
+    """Registers the transport used by every request made through
+    podium_api.asyncreq.make_request.
+
+    Args:
+        transport (PodiumTransport): The transport to use, see
+        podium_api.transport.
+    """
+
+    global PODIUM_TRANSPORT
+    PODIUM_TRANSPORT = transport
+
+
+def unregister_podium_transport():
+    global PODIUM_TRANSPORT
+    PODIUM_TRANSPORT = None
+
+
+"""
+
+    **PODIUM_LOGGER** (logging.Logger): The logger podium_api writes to.
+    Starts out as None, in which case Kivy's Logger is used if the program
+    already imported Kivy and the 'podium_api' logger otherwise. Call
+    **register_podium_logger** to inject a different logger.
+
+"""
+
+PODIUM_LOGGER = None
+
+
+def register_podium_logger(logger):
+    """Registers the logger podium_api writes to.
+
+    Args:
+        logger (logging.Logger): The logger to use.
+    """
+
+    global PODIUM_LOGGER
+    PODIUM_LOGGER = logger
+
+
+def unregister_podium_logger():
+    global PODIUM_LOGGER
+    PODIUM_LOGGER = None
+
+
+def get_logger():
+    """Returns the logger podium_api writes to. Never imports Kivy, its
+    Logger is only used when the program already loaded it.
+
+    Return:
+        logging.Logger: The registered logger, Kivy's Logger or the
+        'podium_api' logger.
+    """
+    if PODIUM_LOGGER is not None:
+        return PODIUM_LOGGER
+    kivy_logger = sys.modules.get("kivy.logger")
+    if kivy_logger is not None:
+        return kivy_logger.Logger
+    return logging.getLogger("podium_api")
+
+
+"""
+
+    **PODIUM_JSON_DECODER** (function): The function json responses are
+    loaded with, called with the bytes of the response. Starts out as None,
+    in which case the fastest json package installed is used, see
+    podium_api.decoding. Call **register_podium_json_decoder** to use a
+    different decoder.
+
+"""
+
+PODIUM_JSON_DECODER = None
+
+
+def register_podium_json_decoder(decoder):
+    """Registers the function json responses are loaded with.
+
+    Args:
+        decoder (function): Loads a json document given as bytes, such as
+        json.loads or orjson.loads.
+    """
+
+    global PODIUM_JSON_DECODER
+    PODIUM_JSON_DECODER = decoder
+
+
+def unregister_podium_json_decoder():
+    global PODIUM_JSON_DECODER
+    PODIUM_JSON_DECODER = None
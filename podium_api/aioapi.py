@@ -0,0 +1,607 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+asyncio twin of **podium_api.api**. Every request method is a coroutine that
+returns the same objects the success_callback of the matching callback API
+receives, and raises PodiumRequestFailed instead of calling the
+failure_callback:
+
+    api = PodiumAsyncAPI(token)
+    laps = await api.laps.list(laps_uri, per_page=100)
+
+Requests are built by the same make_* functions as the callback API and run on
+the asyncio event loop through an AsyncioTransport, without a thread per
+request.
+"""
+import asyncio
+
+import podium_api
+from podium_api.account import make_account_get
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.alertmessages import (
+    make_alertmessage_create,
+    make_alertmessage_get,
+    make_alertmessages_get,
+)
+from podium_api.asyncreq import CURRENT_TRANSPORT
+from podium_api.devices import (
+    make_device_create,
+    make_device_delete,
+    make_device_get,
+    make_device_update,
+    make_devices_get,
+)
+from podium_api.eventdevices import (
+    make_eventdevice_create,
+    make_eventdevice_delete,
+    make_eventdevice_get,
+    make_eventdevice_update,
+    make_eventdevices_get,
+)
+from podium_api.events import (
+    make_event_create,
+    make_event_delete,
+    make_event_get,
+    make_event_update,
+    make_events_get,
+)
+from podium_api.friendships import (
+    make_friendship_create,
+    make_friendship_delete,
+    make_friendship_get,
+    make_friendships_get,
+)
+from podium_api.laps import make_lap_get, make_laps_get, make_laps_table_get
+from podium_api.logfiles import (
+    make_logfile_create,
+    make_logfile_file_upload,
+    make_logfile_get,
+    make_logfile_new,
+    make_logfiles_get,
+)
+from podium_api.login import make_login_post
+from podium_api.pagination import follow_pages, gather_windows, make_paged_get
+from podium_api.presets import (
+    make_preset_create,
+    make_preset_delete,
+    make_preset_get,
+    make_preset_update,
+    make_presets_get,
+)
+from podium_api.ratings import make_rating_create
+from podium_api.types.exceptions import PodiumRequestFailed
+from podium_api.users import make_user_get
+from podium_api.venues import make_venue_get, make_venues_get
+
+
+async def call_async(transport, make_func, *args, **kwargs):
+    """
+    Runs one of the make_* request functions on the asyncio transport and
+    waits for its result.
+
+    Args:
+        transport (AsyncioTransport): The transport to make the request with.
+
+        make_func (function): The make_* function to call, any args and kwargs
+        are passed through. The success, failure and redirect callbacks are
+        provided by this function.
+
+    Return:
+        object: The value passed to the success_callback, a tuple if the
+        callback receives several values. Create requests resolve to the
+        PodiumRedirect passed to their redirect_callback, other redirects to
+        the response headers.
+
+    Raises:
+        PodiumRequestFailed: The request failed or errored.
+    """
+    future = asyncio.get_running_loop().create_future()
+
+    def on_success(*results):
+        if not future.done():
+            future.set_result(results[0] if len(results) == 1 else results)
+
+    def on_redirect(*results):
+        if not future.done():
+            future.set_result(results[0] if len(results) == 1 else results[1])
+
+    def on_failure(failure_type, results, data):
+        if not future.done():
+            future.set_exception(PodiumRequestFailed(failure_type, results))
+
+    kwargs["success_callback"] = on_success
+    kwargs["failure_callback"] = on_failure
+    kwargs["redirect_callback"] = on_redirect
+    context_token = CURRENT_TRANSPORT.set(transport)
+    try:
+        req = make_func(*args, **kwargs)
+    finally:
+        CURRENT_TRANSPORT.reset(context_token)
+    try:
+        await req.wait()
+    except asyncio.CancelledError:
+        req.cancel()
+        raise
+    if not future.done():
+        # requests without a success handler, such as a create answered
+        # with a 2xx instead of a redirect, resolve to the raw result
+        future.set_result(req.result)
+    return await future
+
+
+async def login(username, password, transport=None):
+    """
+    Logs a user in, see **podium_api.login.make_login_post**.
+
+    Kwargs:
+        transport (AsyncioTransport): The transport to make the request with.
+        Defaults to a new AsyncioTransport.
+
+    Return:
+        PodiumToken: The token for the user.
+    """
+    return await call_async(transport or AsyncioTransport(), make_login_post, username, password)
+
+
+class PodiumAsyncAPI(object):
+    """
+    The PodiumAsyncAPI object holds references to the asyncio interfaces to
+    the various requests. It mirrors **podium_api.api.PodiumAPI**, but every
+    request method is a coroutine returning the result.
+
+    **Attributes:**
+        **token** (PodiumToken): The token for the logged in user.
+
+        **transport** (AsyncioTransport): The transport all requests of this
+        object are made with.
+
+        **account**, **events**, **devices**, **friendships**, **users**,
+        **eventdevices**, **laps**, **alertmessages**, **presets**,
+        **ratings**, **logfiles**, **venues**: API objects for the matching
+        requests.
+
+        **identity_map** (IdentityMap): If provided the objects returned by
+        every request are interned in it, see
+        **podium_api.identity.IdentityMap**. Defaults to None.
+    """
+
+    def __init__(self, token, transport=None, identity_map=None):
+        self.token = token
+        self.transport = AsyncioTransport() if transport is None else transport
+        self.identity_map = identity_map
+        self.account = PodiumAsyncAccountAPI(token, self.transport, identity_map)
+        self.events = PodiumAsyncEventsAPI(token, self.transport, identity_map)
+        self.devices = PodiumAsyncDevicesAPI(token, self.transport, identity_map)
+        self.friendships = PodiumAsyncFriendshipsAPI(token, self.transport, identity_map)
+        self.users = PodiumAsyncUsersAPI(token, self.transport, identity_map)
+        self.eventdevices = PodiumAsyncEventDevicesAPI(token, self.transport, identity_map)
+        self.laps = PodiumAsyncLapsAPI(token, self.transport, identity_map)
+        self.alertmessages = PodiumAsyncAlertMessagesAPI(token, self.transport, identity_map)
+        self.presets = PodiumAsyncPresetsAPI(token, self.transport, identity_map)
+        self.ratings = PodiumAsyncRatingsAPI(token, self.transport, identity_map)
+        self.logfiles = PodiumAsyncLogfilesAPI(token, self.transport, identity_map)
+        self.venues = PodiumAsyncVenuesAPI(token, self.transport, identity_map)
+
+    def close(self):
+        """
+        Closes the idle connections of the transport.
+        """
+        self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class PodiumAsyncSubAPI(object):
+    """
+    Base for the asyncio API objects, keeps track of the authentication
+    token and the transport. Usually accessed via PodiumAsyncAPI object.
+
+    **Attributes:**
+        **token** (PodiumToken): The token for the logged in user.
+
+        **transport** (AsyncioTransport): The transport requests are made
+        with.
+
+        **identity_map** (IdentityMap): If not None the objects returned are
+        interned in it, see **podium_api.identity.IdentityMap**.
+    """
+
+    def __init__(self, token, transport, identity_map=None):
+        self.token = token
+        self.transport = transport
+        self.identity_map = identity_map
+
+    def _call(self, make_func, *args, **kwargs):
+        if self.identity_map is None:
+            return call_async(self.transport, make_func, self.token, *args, **kwargs)
+        return self._interned(call_async(self.transport, make_func, self.token, *args, **kwargs))
+
+    async def _interned(self, coro):
+        return self.identity_map.intern_result(await coro)
+
+    async def iter_pages(self, *args, prefetch=True, **kwargs):
+        """
+        Async generator yielding every page of the list request made with
+        args and kwargs, following next_uri until the last page. The next
+        page is fetched while the current one is being consumed.
+
+        Kwargs:
+            prefetch (bool): Fetch the next page before yielding the current
+            one. Defaults to True.
+        """
+        page = await self.list(*args, **kwargs)
+
+        def fetch_page(uri, payload_name):
+            return self._call(make_paged_get, uri, payload_name)
+
+        async for page in follow_pages(page, fetch_page, prefetch=prefetch):
+            yield page
+
+    async def iter_items(self, *args, prefetch=True, **kwargs):
+        """
+        Async generator yielding every item of every page of the list
+        request made with args and kwargs, see **iter_pages**.
+        """
+        async for page in self.iter_pages(*args, prefetch=prefetch, **kwargs):
+            for item in page.payload:
+                yield item
+
+    async def list_all(self, *args, start=0, per_page=100, concurrency=4, **kwargs):
+        """
+        Returns every item of the list request made with args and kwargs.
+        After the first page reports the total the remaining start/per_page
+        windows are fetched concurrently, see
+        **podium_api.pagination.gather_windows**.
+
+        Kwargs:
+            start (int): Index of the first item. Defaults to 0.
+
+            per_page (int): Size of the windows, max of 100. Defaults to 100.
+
+            concurrency (int): Maximum number of windows fetched at once.
+            Defaults to 4.
+
+        Return:
+            list: The items, in order.
+        """
+
+        def fetch_window(window_start, window_size):
+            return self.list(*args, start=window_start, per_page=window_size, **kwargs)
+
+        pages = await gather_windows(fetch_window, start=start, per_page=per_page, concurrency=concurrency)
+        return [item for page in pages for item in page.payload]
+
+
+class PodiumAsyncLapsAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumLapsAPI.
+    """
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of laps, see PodiumLapsAPI.list.
+        """
+        return await self._call(make_laps_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumLap, see PodiumLapsAPI.get.
+        """
+        return await self._call(make_lap_get, *args, **kwargs)
+
+    async def table(self, *args, **kwargs):
+        """
+        Returns a page of laps as a LapTable, see PodiumLapsAPI.table.
+        """
+        return await self._call(make_laps_table_get, *args, **kwargs)
+
+
+class PodiumAsyncEventDevicesAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumEventDevicesAPI.
+    """
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of event devices, see
+        PodiumEventDevicesAPI.list.
+        """
+        return await self._call(make_eventdevices_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new event device, see
+        PodiumEventDevicesAPI.create.
+        """
+        return await self._call(make_eventdevice_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        Returns (result, updated_uri), see PodiumEventDevicesAPI.update.
+        """
+        return await self._call(make_eventdevice_update, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumEventDevice, see PodiumEventDevicesAPI.get.
+        """
+        return await self._call(make_eventdevice_get, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        Returns the deleted uri, see PodiumEventDevicesAPI.delete.
+        """
+        return await self._call(make_eventdevice_delete, *args, **kwargs)
+
+
+class PodiumAsyncUsersAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumUsersAPI.
+    """
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumUser, see PodiumUsersAPI.get.
+        """
+        return await self._call(make_user_get, *args, **kwargs)
+
+
+class PodiumAsyncFriendshipsAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumFriendshipsAPI.
+    """
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumFriendship, see PodiumFriendshipsAPI.get.
+        """
+        return await self._call(make_friendship_get, *args, **kwargs)
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of users, see PodiumFriendshipsAPI.list.
+        """
+        return await self._call(make_friendships_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new friendship, see
+        PodiumFriendshipsAPI.create.
+        """
+        return await self._call(make_friendship_create, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        Returns the deleted uri, see PodiumFriendshipsAPI.delete.
+        """
+        return await self._call(make_friendship_delete, *args, **kwargs)
+
+
+class PodiumAsyncAccountAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumAccountAPI.
+    """
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns the PodiumAccount, see PodiumAccountAPI.get.
+        """
+        return await self._call(make_account_get, *args, **kwargs)
+
+
+class PodiumAsyncDevicesAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumDevicesAPI.
+    """
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new device, see PodiumDevicesAPI.create.
+        """
+        return await self._call(make_device_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        Returns (result, updated_uri), see PodiumDevicesAPI.update.
+        """
+        return await self._call(make_device_update, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumDevice, see PodiumDevicesAPI.get.
+        """
+        return await self._call(make_device_get, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        Returns the deleted uri, see PodiumDevicesAPI.delete.
+        """
+        return await self._call(make_device_delete, *args, **kwargs)
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of devices, see PodiumDevicesAPI.list.
+        """
+        return await self._call(make_devices_get, *args, **kwargs)
+
+
+class PodiumAsyncEventsAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumEventsAPI.
+    """
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of events, see PodiumEventsAPI.list.
+        """
+        return await self._call(make_events_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumEvent, see PodiumEventsAPI.get.
+        """
+        return await self._call(make_event_get, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        Returns the deleted uri, see PodiumEventsAPI.delete.
+        """
+        return await self._call(make_event_delete, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new event, see PodiumEventsAPI.create.
+        """
+        return await self._call(make_event_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        Returns (result, updated_uri), see PodiumEventsAPI.update.
+        """
+        return await self._call(make_event_update, *args, **kwargs)
+
+
+class PodiumAsyncAlertMessagesAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumAlertMessagesAPI.
+    """
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of alert messages, see
+        PodiumAlertMessagesAPI.list.
+        """
+        return await self._call(make_alertmessages_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumAlertMessage, see PodiumAlertMessagesAPI.get.
+        """
+        return await self._call(make_alertmessage_get, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new alert message, see
+        PodiumAlertMessagesAPI.create.
+        """
+        return await self._call(make_alertmessage_create, *args, **kwargs)
+
+
+class PodiumAsyncVenuesAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumVenuesAPI.
+    """
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of venues, see PodiumVenuesAPI.list.
+        """
+        return await self._call(make_venues_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumVenue, see PodiumVenuesAPI.get.
+        """
+        return await self._call(make_venue_get, *args, **kwargs)
+
+
+class PodiumAsyncPresetsAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumPresetsAPI.
+    """
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of presets, see PodiumPresetsAPI.list.
+        """
+        return await self._call(make_presets_get, *args, **kwargs)
+
+    async def list_my(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of the logged in user's presets, see
+        PodiumPresetsAPI.list_my.
+        """
+        endpoint = "{}/api/v1/users/me/presets".format(podium_api.PODIUM_APP.podium_url)
+        return await self._call(make_presets_get, endpoint=endpoint, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumPreset, see PodiumPresetsAPI.get.
+        """
+        return await self._call(make_preset_get, *args, **kwargs)
+
+    async def delete(self, *args, **kwargs):
+        """
+        Returns the deleted uri, see PodiumPresetsAPI.delete.
+        """
+        return await self._call(make_preset_delete, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new preset, see PodiumPresetsAPI.create.
+        """
+        return await self._call(make_preset_create, *args, **kwargs)
+
+    async def update(self, *args, **kwargs):
+        """
+        Returns (result, updated_uri), see PodiumPresetsAPI.update.
+        """
+        return await self._call(make_preset_update, *args, **kwargs)
+
+
+class PodiumAsyncRatingsAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumRatingsAPI.
+    """
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new rating, see PodiumRatingsAPI.create.
+        """
+        return await self._call(make_rating_create, *args, **kwargs)
+
+
+class PodiumAsyncLogfilesAPI(PodiumAsyncSubAPI):
+    """
+    asyncio version of PodiumLogfilesAPI.
+    """
+
+    async def new(self, *args, **kwargs):
+        """
+        Returns a PodiumLogfile prepared for upload, see PodiumLogfilesAPI.new.
+        """
+        return await self._call(make_logfile_new, *args, **kwargs)
+
+    async def create(self, *args, **kwargs):
+        """
+        Returns a PodiumRedirect to the new logfile, see
+        PodiumLogfilesAPI.create.
+        """
+        return await self._call(make_logfile_create, *args, **kwargs)
+
+    async def upload(self, device_id, path, source, source_ver, event_id=None, progress_callback=None):
+        """
+        Uploads the logfile at path and returns a PodiumRedirect to the new
+        logfile, see PodiumLogfilesAPI.upload.
+        """
+        logfile = await self.new(device_id, event_id)
+        await call_async(
+            self.transport, make_logfile_file_upload, logfile.upload_url, path, progress_callback=progress_callback
+        )
+        return await self.create(logfile.file_key, logfile.eventdevice_id, source, source_ver)
+
+    async def list(self, *args, **kwargs):
+        """
+        Returns a PodiumPagedResponse of logfiles, see PodiumLogfilesAPI.list.
+        """
+        return await self._call(make_logfiles_get, *args, **kwargs)
+
+    async def get(self, *args, **kwargs):
+        """
+        Returns a PodiumLogfile, see PodiumLogfilesAPI.get.
+        """
+        return await self._call(make_logfile_get, *args, **kwargs)
@@ -0,0 +1,490 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+A transport for **podium_api.asyncreq.make_request** that runs every request
+as a task on a single asyncio event loop over non-blocking keep-alive
+connections. It is used by **podium_api.aioapi.PodiumAsyncAPI** and must only
+be used from code running on the event loop.
+"""
+import asyncio
+import ssl
+
+try:
+    from urllib.parse import urlsplit
+except:
+    from urlparse import urlsplit
+
+from podium_api.encoding import StreamedBody
+from podium_api.transport import (
+    decode_result,
+    get_accept_encoding,
+    get_content_decoder,
+    get_payload_stream,
+    IDEMPOTENT_METHODS,
+    PodiumTransport,
+)
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class AsyncioRequest(object):
+    """
+    Object that represents a request made through an **AsyncioTransport**.
+    It mirrors the parts of UrlRequest used by podium_api callbacks.
+
+    **Attributes:**
+        **url** (str): Url of the request.
+
+        **req_body** (str): Body of the request.
+
+        **req_headers** (dict): Headers of the request.
+    """
+
+    def __init__(self, url, method, body, headers):
+        self.url = url
+        self.req_body = body
+        self.req_headers = headers
+        self._method = method
+        self._result = None
+        self._error = None
+        self._resp_status = None
+        self._resp_headers = None
+        self._is_finished = False
+        self._finished = asyncio.Event()
+        self._task = None
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def resp_status(self):
+        return self._resp_status
+
+    @property
+    def resp_headers(self):
+        return self._resp_headers
+
+    @property
+    def is_finished(self):
+        return self._is_finished
+
+    def cancel(self):
+        """
+        Cancels the request, no further callbacks will be dispatched.
+        """
+        if self._task is not None:
+            self._task.cancel()
+
+    async def wait(self):
+        """
+        Waits until the request has finished, was cancelled or failed, and
+        all of its callbacks have run.
+        """
+        await self._finished.wait()
+
+
+class AsyncConnectionPool(object):
+    """
+    Bounded pool of keep-alive stream connections to a single host. Waiting
+    for a free connection suspends the calling task instead of a thread.
+
+    **Attributes:**
+        **max_connections** (int): Maximum number of connections open to the
+        host at the same time.
+    """
+
+    def __init__(self, scheme, host, port, max_connections, ssl_context=None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.ssl_context = ssl_context
+        self._idle = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _open(self):
+        if self.scheme == "https":
+            context = self.ssl_context if self.ssl_context is not None else ssl.create_default_context()
+            return await asyncio.open_connection(self.host, self.port, ssl=context, server_hostname=self.host)
+        elif self.scheme == "http":
+            return await asyncio.open_connection(self.host, self.port)
+        raise ValueError("Unsupported scheme {}".format(self.scheme))
+
+    async def acquire(self, timeout=None, connect_timeout=None):
+        """
+        Returns a connection to the host, waiting while max_connections are
+        in use.
+
+        Kwargs:
+            timeout (float): Maximum number of seconds to wait for one of the
+            max_connections. Defaults to None, waiting as long as needed.
+
+            connect_timeout (float): Maximum number of seconds to open a new
+            connection. Defaults to None.
+
+        Return:
+            ((StreamReader, StreamWriter), bool): The connection and whether
+            it was reused.
+        """
+        if timeout is None:
+            await self._slots.acquire()
+        else:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        try:
+            while self._idle:
+                reader, writer = self._idle.pop()
+                if not reader.at_eof() and not writer.is_closing():
+                    return (reader, writer), True
+                writer.close()
+            return await asyncio.wait_for(self._open(), connect_timeout), False
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn, reusable=True):
+        """
+        Returns a connection to the pool. Connections that can not be reused
+        are closed.
+        """
+        if reusable:
+            self._idle.append(conn)
+        else:
+            conn[1].close()
+        self._slots.release()
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    def close(self):
+        while self._idle:
+            self._idle.pop()[1].close()
+
+
+class AsyncioTransport(PodiumTransport):
+    """
+    Transport that runs each request as a task on the running asyncio event
+    loop. Thousands of requests can be in flight at once, they only wait for
+    one of the max_connections_per_host connections to the server.
+
+    **Attributes:**
+        **max_connections_per_host** (int): Maximum number of connections
+        open to a single host.
+
+        **timeout** (float): Maximum number of seconds to connect to the
+        server and to exchange the request and its response. The time spent
+        waiting for a free connection is not counted.
+
+        **pool_timeout** (float): Maximum number of seconds a request waits
+        for one of the max_connections_per_host connections. Defaults to
+        None, waiting as long as needed.
+
+        **chunk_size** (int): Size of the chunks read when reporting progress
+        or decompressing.
+
+        **decompress** (bool): If True compressed responses are asked for
+        with an Accept-Encoding header and decompressed as they are read,
+        see **podium_api.transport.get_accept_encoding**. Defaults to True.
+
+        **stream_payloads** (bool): If True a successful response to a
+        request made with a payload_name is parsed as it is read, see
+        **podium_api.transport.PooledTransport**. Defaults to False.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host=32,
+        timeout=30,
+        chunk_size=8192,
+        ssl_context=None,
+        decompress=True,
+        stream_payloads=False,
+        pool_timeout=None,
+    ):
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.pool_timeout = pool_timeout
+        self.chunk_size = chunk_size
+        self.decompress = decompress
+        self.stream_payloads = stream_payloads
+        self.ssl_context = ssl_context
+        self._pools = {}
+
+    def get_pool(self, scheme, host, port):
+        """
+        Returns the AsyncConnectionPool for the scheme, host and port,
+        creating it if needed.
+        """
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = AsyncConnectionPool(scheme, host, port, self.max_connections_per_host, ssl_context=self.ssl_context)
+            self._pools[key] = pool
+        return pool
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+        payload_name=None,
+    ):
+        loop = asyncio.get_running_loop()
+        req = AsyncioRequest(url, method, body, headers)
+        callbacks = {
+            "success": on_success,
+            "failure": on_failure,
+            "error": on_error,
+            "redirect": on_redirect,
+            "progress": on_progress,
+        }
+        req._task = loop.create_task(self._run(req, callbacks, payload_name))
+        return req
+
+    async def _run(self, req, callbacks, payload_name=None):
+        try:
+            try:
+                status, resp_headers, result = await self._fetch(req, callbacks["progress"], payload_name)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                req._error = e
+                req._is_finished = True
+                if callbacks["error"] is not None:
+                    callbacks["error"](req, e)
+                return
+            req._resp_status = status
+            req._resp_headers = resp_headers
+            req._result = result
+            req._is_finished = True
+            status_class = status // 100
+            if status_class in (1, 2):
+                callback = callbacks["success"]
+            elif status_class == 3:
+                callback = callbacks["redirect"]
+            else:
+                callback = callbacks["failure"]
+            if callback is not None:
+                callback(req, result)
+        finally:
+            req._finished.set()
+
+    async def _fetch(self, req, on_progress, payload_name=None):
+        parts = urlsplit(req.url)
+        path = parts.path or "/"
+        if parts.query:
+            path = "{}?{}".format(path, parts.query)
+        port = parts.port or DEFAULT_PORTS.get(parts.scheme)
+        pool = self.get_pool(parts.scheme, parts.hostname, port)
+        body = req.req_body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        method = req.method or ("GET" if body is None else "POST")
+        host = parts.hostname if parts.port is None else "{}:{}".format(parts.hostname, parts.port)
+        headers = req.req_headers or {}
+        if self.decompress and "Accept-Encoding" not in headers:
+            headers = dict(headers, **{"Accept-Encoding": get_accept_encoding()})
+        request = encode_request(method, path, host, headers, body)
+
+        conn, reused = await pool.acquire(timeout=self.pool_timeout, connect_timeout=self.timeout)
+        try:
+            try:
+                status, headers, keep_alive, result = await asyncio.wait_for(
+                    self._exchange(req, conn, request, body, method, on_progress, payload_name), self.timeout
+                )
+            except (asyncio.IncompleteReadError, ConnectionError):
+                # the server may close a keep-alive connection at any time,
+                # replay idempotent requests once on a fresh connection
+                conn[1].close()
+                if not reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                conn = await asyncio.wait_for(pool._open(), self.timeout)
+                status, headers, keep_alive, result = await asyncio.wait_for(
+                    self._exchange(req, conn, request, body, method, on_progress, payload_name), self.timeout
+                )
+        except BaseException:
+            pool.release(conn, reusable=False)
+            raise
+        pool.release(conn, reusable=keep_alive)
+        if isinstance(result, bytes):
+            content_type = None
+            for key, value in headers.items():
+                if key.lower() == "content-type":
+                    content_type = value
+            result = decode_result(result, content_type)
+        return status, headers, result
+
+    async def _exchange(self, req, conn, request, body, method, on_progress, payload_name=None):
+        reader, writer = conn
+        writer.write(request)
+        await writer.drain()
+        if isinstance(body, StreamedBody):
+            await self._upload(req, writer, body, on_progress)
+            # the progress of a request with a streamed body is the progress
+            # of the upload
+            on_progress = None
+        version, status, headers, lower = await read_response_head(reader)
+
+        keep_alive = version == "HTTP/1.1"
+        connection = lower.get("connection", "").lower()
+        if connection == "close":
+            keep_alive = False
+        elif connection == "keep-alive":
+            keep_alive = True
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            return status, headers, keep_alive, b""
+
+        total_size = int(lower.get("content-length", -1))
+        progress = None
+        if on_progress is not None:
+            on_progress(req, 0, total_size)
+            progress = lambda current: on_progress(req, current, total_size)
+
+        decoder = get_content_decoder(lower.get("content-encoding")) if self.decompress else None
+        stream = None
+        if self.stream_payloads:
+            stream = get_payload_stream(payload_name, status, lower.get("content-type"), decoder)
+            if stream is not None:
+                decoder = stream
+        if "chunked" in lower.get("transfer-encoding", "").lower():
+            result = await read_chunked(reader, progress, decoder)
+        elif total_size >= 0:
+            result = await read_exactly(reader, total_size, self.chunk_size, progress, decoder)
+        else:
+            result = await reader.read()
+            keep_alive = False
+            if progress is not None:
+                progress(len(result))
+            if decoder is not None:
+                result = decoder.decompress(result) + decoder.flush()
+        if stream is not None:
+            result = stream.close()
+        return status, headers, keep_alive, result
+
+    async def _upload(self, req, writer, body, on_progress):
+        total_size = len(body)
+        bytes_so_far = 0
+        if on_progress is not None:
+            on_progress(req, 0, total_size)
+        for chunk in body:
+            writer.write(chunk)
+            await writer.drain()
+            bytes_so_far += len(chunk)
+            if on_progress is not None:
+                on_progress(req, bytes_so_far, total_size)
+
+    def close(self):
+        """
+        Closes all idle connections.
+        """
+        for pool in self._pools.values():
+            pool.close()
+        self._pools = {}
+
+
+def encode_request(method, path, host, headers, body):
+    """
+    Returns the bytes of an HTTP/1.1 request, only its head for a
+    StreamedBody.
+    """
+    lines = ["{} {} HTTP/1.1".format(method, path)]
+    names = set(key.lower() for key in headers)
+    if "host" not in names:
+        lines.append("Host: {}".format(host))
+    for key, value in headers.items():
+        lines.append("{}: {}".format(key, value))
+    if body is not None and "content-length" not in names:
+        lines.append("Content-Length: {}".format(len(body)))
+    elif body is None and method in ("POST", "PUT", "PATCH"):
+        lines.append("Content-Length: 0")
+    head = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    if body is None or isinstance(body, StreamedBody):
+        # streamed bodies are written after the head by the transport
+        return head
+    return head + body
+
+
+async def read_response_head(reader):
+    """
+    Reads the status line and headers of a response.
+
+    Return:
+        (str, int, dict, dict): The HTTP version, status code, headers and
+        the headers keyed by their lowercased names.
+    """
+    status_line = await reader.readuntil(b"\r\n")
+    if not status_line.strip():
+        raise ConnectionError("Connection closed without a response")
+    version, status = status_line.decode("latin-1").split(None, 2)[:2]
+    headers = {}
+    lower = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            break
+        key, _, value = line.decode("latin-1").partition(":")
+        key = key.strip()
+        value = value.strip()
+        headers[key] = value
+        lower[key.lower()] = value
+    return version, int(status), headers, lower
+
+
+async def read_exactly(reader, size, chunk_size, progress=None, decoder=None):
+    """
+    Reads a body of size bytes, decoded by decoder if one is given.
+    """
+    if progress is None and decoder is None:
+        return await reader.readexactly(size)
+    chunks = []
+    read = 0
+    while read < size:
+        chunk = await reader.readexactly(min(chunk_size, size - read))
+        chunks.append(chunk if decoder is None else decoder.decompress(chunk))
+        read += len(chunk)
+        if progress is not None:
+            progress(read)
+    if decoder is not None:
+        chunks.append(decoder.flush())
+    return b"".join(chunks)
+
+
+async def read_chunked(reader, progress=None, decoder=None):
+    """
+    Reads a body sent with the chunked transfer encoding, decoded by decoder
+    if one is given.
+    """
+    chunks = []
+    read = 0
+    while True:
+        size_line = await reader.readuntil(b"\r\n")
+        size = int(size_line.split(b";", 1)[0].strip(), 16)
+        if size == 0:
+            # skip trailers
+            while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                pass
+            if decoder is not None:
+                chunks.append(decoder.flush())
+            return b"".join(chunks)
+        chunk = await reader.readexactly(size)
+        chunks.append(chunk if decoder is None else decoder.decompress(chunk))
+        await reader.readexactly(2)
+        read += size
+        if progress is not None:
+            progress(read)
@@ -165,6 +165,7 @@ def make_alertmessages_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="alertmessages",
     )
 
 
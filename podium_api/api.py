@@ -1,7 +1,5 @@
 from typing import Any, Callable
 
-from kivy.logger import Logger
-
 import podium_api
 from podium_api.account import make_account_get
 from podium_api.alertmessages import (
@@ -36,11 +34,12 @@ from podium_api.friendships import (
     make_friendship_get,
     make_friendships_get,
 )
-from podium_api.laps import make_lap_get, make_laps_get
+from podium_api.laps import make_lap_get, make_laps_get, make_laps_table_get
 from podium_api.logfiles import (
     make_logfile_create,
     make_logfile_get,
     make_logfile_new,
+    make_logfile_upload,
     make_logfiles_get,
 )
 from podium_api.presets import (
@@ -53,6 +52,7 @@ from podium_api.presets import (
 from podium_api.ratings import make_rating_create
 from podium_api.types.account import PodiumAccount
 from podium_api.types.user import PodiumUser
+from podium_api.upload import make_logfile_resumable_upload
 from podium_api.users import make_user_get
 from podium_api.venues import make_venue_get, make_venues_get
 
@@ -91,21 +91,27 @@ class PodiumAPI(object):
 
         **alertmessages** (AlertMessagesAPI: API object for alertmessage requests.
 
+        **identity_map** (IdentityMap): If provided the objects returned by
+        every request are interned in it, so each URI maps to a single
+        object updated in place. See **podium_api.identity.IdentityMap**.
+        Defaults to None.
+
     """
 
-    def __init__(self, token):
+    def __init__(self, token, identity_map=None):
         self.token = token
-        self.account = PodiumAccountAPI(token)
-        self.events = PodiumEventsAPI(token)
-        self.devices = PodiumDevicesAPI(token)
-        self.friendships = PodiumFriendshipsAPI(token)
-        self.users = PodiumUsersAPI(token)
-        self.eventdevices = PodiumEventDevicesAPI(token)
-        self.laps = PodiumLapsAPI(token)
-        self.alertmessages = PodiumAlertMessagesAPI(token)
-        self.presets = PodiumPresetsAPI(token)
-        self.ratings = PodiumRatingsAPI(token)
-        self.logfiles = PodiumLogfilesAPI(token)
+        self.identity_map = identity_map
+        self.account = PodiumAccountAPI(token, identity_map)
+        self.events = PodiumEventsAPI(token, identity_map)
+        self.devices = PodiumDevicesAPI(token, identity_map)
+        self.friendships = PodiumFriendshipsAPI(token, identity_map)
+        self.users = PodiumUsersAPI(token, identity_map)
+        self.eventdevices = PodiumEventDevicesAPI(token, identity_map)
+        self.laps = PodiumLapsAPI(token, identity_map)
+        self.alertmessages = PodiumAlertMessagesAPI(token, identity_map)
+        self.presets = PodiumPresetsAPI(token, identity_map)
+        self.ratings = PodiumRatingsAPI(token, identity_map)
+        self.logfiles = PodiumLogfilesAPI(token, identity_map)
 
         self.podium_account = None
         self.podium_user = None
@@ -121,12 +127,12 @@ class PodiumAPI(object):
         self, success_callback: Callable[[PodiumAccount], None], failure_callback: Callable[[str, str, str], None]
     ) -> None:
         def success(account: PodiumAccount):
-            Logger.info("PodiumAPI: Loaded Account %s", account.username)
+            podium_api.get_logger().info("PodiumAPI: Loaded Account %s", account.username)
             self.podium_account = account
             self._load_user(account, success_callback, failure_callback)
 
         def failure(error_type: str, results: str, data: str) -> None:
-            Logger.error("PodiumAPI: Failed to load account: %s: %s", error_type, results)
+            podium_api.get_logger().error("PodiumAPI: Failed to load account: %s: %s", error_type, results)
             failure_callback(error_type, results, data)
 
         self.account.get(success_callback=success, failure_callback=failure)
@@ -138,12 +144,12 @@ class PodiumAPI(object):
         failure_callback: Callable[[str, str, str], None],
     ) -> None:
         def success(user):
-            Logger.info("PodiumAPI: Loaded User %s", user.username)
+            podium_api.get_logger().info("PodiumAPI: Loaded User %s", user.username)
             self.podium_user = user
             success_callback(account, user)
 
         def failure(error_type: str, results: str, data: str):
-            Logger.error("PodiumAPI: Failed to load user: %s: %s", error_type, results)
+            podium_api.get_logger().error("PodiumAPI: Failed to load user: %s: %s", error_type, results)
             failure_callback(error_type, results, data)
 
         self.users.get(account.user_uri, success_callback=success, failure_callback=failure)
@@ -171,19 +177,40 @@ class PodiumAPI(object):
         return error_msg if error_msg else "Unknown error"
 
 
-class PodiumLapsAPI(object):
+class PodiumSubAPI(object):
     """
-    Object that handles lap requests and keeps track of the
-    authentication token necessary to do so. Usually accessed via
+    Base for the API objects, keeps track of the authentication token and
+    of the identity map the results are interned in. Usually accessed via
     PodiumAPI object.
 
     **Attributes:**
         **token** (PodiumToken): The token for the logged in user.
 
+        **identity_map** (IdentityMap): If not None the objects passed to
+        the success callbacks are interned in it, see
+        **podium_api.identity.IdentityMap**.
     """
 
-    def __init__(self, token):
+    def __init__(self, token, identity_map=None):
         self.token = token
+        self.identity_map = identity_map
+
+    def _call(self, make_func, *args, **kwargs):
+        if self.identity_map is not None and kwargs.get("success_callback") is not None:
+            kwargs["success_callback"] = self.identity_map.wrap(kwargs["success_callback"])
+        return make_func(self.token, *args, **kwargs)
+
+
+class PodiumLapsAPI(PodiumSubAPI):
+    """
+    Object that handles lap requests and keeps track of the
+    authentication token necessary to do so. Usually accessed via
+    PodiumAPI object.
+
+    **Attributes:**
+        **token** (PodiumToken): The token for the logged in user.
+
+    """
 
     def list(self, *args, **kwargs):
         """
@@ -227,7 +254,29 @@ class PodiumLapsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_laps_get(self.token, *args, **kwargs)
+        self._call(make_laps_get, *args, **kwargs)
+
+    def table(self, *args, **kwargs):
+        """
+        Request that returns a page of laps as a LapTable, see
+        **podium_api.laps.make_laps_table_get**.
+
+        Args:
+            endpoint (str): The endpoint to make the request too.
+
+        Kwargs:
+            success_callback (function): Callback for a successful request,
+            will have the signature:
+                on_success(LapTable)
+            Defaults to None.
+
+            The other kwargs are the same as for list.
+
+        Return:
+            UrlRequest: The request being made.
+
+        """
+        self._call(make_laps_table_get, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -268,10 +317,10 @@ class PodiumLapsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_lap_get(self.token, *args, **kwargs)
+        self._call(make_lap_get, *args, **kwargs)
 
 
-class PodiumEventDevicesAPI(object):
+class PodiumEventDevicesAPI(PodiumSubAPI):
     """
     Object that handles event-device requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -282,9 +331,6 @@ class PodiumEventDevicesAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def list(self, *args, **kwargs):
         """
         Request that returns a PodiumPagedRequest of events.
@@ -337,7 +383,7 @@ class PodiumEventDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_eventdevices_get(self.token, *args, **kwargs)
+        self._call(make_eventdevices_get, *args, **kwargs)
 
     def create(self, *args, **kwargs):
         """
@@ -380,7 +426,7 @@ class PodiumEventDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_eventdevice_create(self.token, *args, **kwargs)
+        self._call(make_eventdevice_create, *args, **kwargs)
 
     def update(self, *args, **kwargs):
         """
@@ -418,7 +464,7 @@ class PodiumEventDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_eventdevice_update(self.token, *args, **kwargs)
+        self._call(make_eventdevice_update, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -460,7 +506,7 @@ class PodiumEventDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_eventdevice_get(self.token, *args, **kwargs)
+        self._call(make_eventdevice_get, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
@@ -494,10 +540,10 @@ class PodiumEventDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_eventdevice_delete(self.token, *args, **kwargs)
+        self._call(make_eventdevice_delete, *args, **kwargs)
 
 
-class PodiumUsersAPI(object):
+class PodiumUsersAPI(PodiumSubAPI):
     """
     Object that handles user requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -508,9 +554,6 @@ class PodiumUsersAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def get(self, *args, **kwargs):
         """
         Returns a PodiumUser object found at the uri provided in the endpoint
@@ -547,10 +590,10 @@ class PodiumUsersAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_user_get(self.token, *args, **kwargs)
+        self._call(make_user_get, *args, **kwargs)
 
 
-class PodiumFriendshipsAPI(object):
+class PodiumFriendshipsAPI(PodiumSubAPI):
     """
     Object that handles friendship requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -561,9 +604,6 @@ class PodiumFriendshipsAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def get(self, *args, **kwargs):
         """
         Request that returns a PodiumFriendship that represents a specific
@@ -603,7 +643,7 @@ class PodiumFriendshipsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_friendship_get(self.token, *args, **kwargs)
+        self._call(make_friendship_get, *args, **kwargs)
 
     def list(self, *args, **kwargs):
         """
@@ -647,7 +687,7 @@ class PodiumFriendshipsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_friendships_get(self.token, *args, **kwargs)
+        self._call(make_friendships_get, *args, **kwargs)
 
     def create(self, *args, **kwargs):
         """
@@ -681,7 +721,7 @@ class PodiumFriendshipsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_friendship_create(self.token, *args, **kwargs)
+        self._call(make_friendship_create, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
@@ -715,10 +755,10 @@ class PodiumFriendshipsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_friendship_delete(self.token, *args, **kwargs)
+        self._call(make_friendship_delete, *args, **kwargs)
 
 
-class PodiumAccountAPI(object):
+class PodiumAccountAPI(PodiumSubAPI):
     """
     Object that handles account requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -729,9 +769,6 @@ class PodiumAccountAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def get(self, *args, **kwargs):
         """
         Request that returns the account for the provided authentication token.
@@ -764,10 +801,10 @@ class PodiumAccountAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_account_get(self.token, *args, **kwargs)
+        self._call(make_account_get, *args, **kwargs)
 
 
-class PodiumDevicesAPI(object):
+class PodiumDevicesAPI(PodiumSubAPI):
     """
     Object that handles device requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -778,9 +815,6 @@ class PodiumDevicesAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def create(self, *args, **kwargs):
         """
         Request that creates a new PodiumDevice.
@@ -816,7 +850,7 @@ class PodiumDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_device_create(self.token, *args, **kwargs)
+        self._call(make_device_create, *args, **kwargs)
 
     def update(self, *args, **kwargs):
         """
@@ -852,7 +886,7 @@ class PodiumDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_device_update(self.token, *args, **kwargs)
+        self._call(make_device_update, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -892,7 +926,7 @@ class PodiumDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_device_get(self.token, *args, **kwargs)
+        self._call(make_device_get, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
@@ -926,7 +960,7 @@ class PodiumDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_device_delete(self.token, *args, **kwargs)
+        self._call(make_device_delete, *args, **kwargs)
 
     def list(self, *args, **kwargs):
         """
@@ -973,10 +1007,10 @@ class PodiumDevicesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_devices_get(self.token, *args, **kwargs)
+        self._call(make_devices_get, *args, **kwargs)
 
 
-class PodiumEventsAPI(object):
+class PodiumEventsAPI(PodiumSubAPI):
     """
     Object that handles event requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -987,9 +1021,6 @@ class PodiumEventsAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def list(self, *args, **kwargs):
         """
         Request that returns a PodiumPagedRequest of events.
@@ -1035,7 +1066,7 @@ class PodiumEventsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_events_get(self.token, *args, **kwargs)
+        self._call(make_events_get, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -1075,7 +1106,7 @@ class PodiumEventsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_event_get(self.token, *args, **kwargs)
+        self._call(make_event_get, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
@@ -1109,7 +1140,7 @@ class PodiumEventsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_event_delete(self.token, *args, **kwargs)
+        self._call(make_event_delete, *args, **kwargs)
 
     def create(self, *args, **kwargs):
         """
@@ -1152,7 +1183,7 @@ class PodiumEventsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_event_create(self.token, *args, **kwargs)
+        self._call(make_event_create, *args, **kwargs)
 
     def update(self, *args, **kwargs):
         """
@@ -1197,10 +1228,10 @@ class PodiumEventsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_event_update(self.token, *args, **kwargs)
+        self._call(make_event_update, *args, **kwargs)
 
 
-class PodiumAlertMessagesAPI(object):
+class PodiumAlertMessagesAPI(PodiumSubAPI):
     """
     Object that handles event requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -1211,9 +1242,6 @@ class PodiumAlertMessagesAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def list(self, *args, **kwargs):
         """
         Request that returns a PodiumPagedRequest of events.
@@ -1259,7 +1287,7 @@ class PodiumAlertMessagesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_alertmessages_get(self.token, *args, **kwargs)
+        self._call(make_alertmessages_get, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -1299,7 +1327,7 @@ class PodiumAlertMessagesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_alertmessage_get(self.token, *args, **kwargs)
+        self._call(make_alertmessage_get, *args, **kwargs)
 
     def create(self, *args, **kwargs):
         """
@@ -1341,10 +1369,10 @@ class PodiumAlertMessagesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_alertmessage_create(self.token, *args, **kwargs)
+        self._call(make_alertmessage_create, *args, **kwargs)
 
 
-class PodiumVenuesAPI(object):
+class PodiumVenuesAPI(PodiumSubAPI):
     """
     Object that handles event requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -1355,9 +1383,6 @@ class PodiumVenuesAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def list(self, *args, **kwargs):
         """
         Request that returns a PodiumPagedRequest of events.
@@ -1403,7 +1428,7 @@ class PodiumVenuesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_venues_get(self.token, *args, **kwargs)
+        self._call(make_venues_get, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -1443,10 +1468,10 @@ class PodiumVenuesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_venue_get(self.token, *args, **kwargs)
+        self._call(make_venue_get, *args, **kwargs)
 
 
-class PodiumPresetsAPI(object):
+class PodiumPresetsAPI(PodiumSubAPI):
     """
     Object that handles preset requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -1457,9 +1482,6 @@ class PodiumPresetsAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def list(self, *args, **kwargs):
         """
         Request that returns a PodiumPagedRequest of presets.
@@ -1508,7 +1530,7 @@ class PodiumPresetsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_presets_get(self.token, *args, **kwargs)
+        self._call(make_presets_get, *args, **kwargs)
 
     def list_my(self, *args, **kwargs):
         """
@@ -1558,7 +1580,7 @@ class PodiumPresetsAPI(object):
             UrlRequest: The request being made.
         """
         endpoint = "{}/api/v1/users/me/presets".format(podium_api.PODIUM_APP.podium_url)
-        make_presets_get(self.token, endpoint=endpoint, *args, **kwargs)
+        self._call(make_presets_get, endpoint=endpoint, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -1598,7 +1620,7 @@ class PodiumPresetsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_preset_get(self.token, *args, **kwargs)
+        self._call(make_preset_get, *args, **kwargs)
 
     def delete(self, *args, **kwargs):
         """
@@ -1632,7 +1654,7 @@ class PodiumPresetsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_preset_delete(self.token, *args, **kwargs)
+        self._call(make_preset_delete, *args, **kwargs)
 
     def create(self, *args, **kwargs):
         """
@@ -1677,7 +1699,7 @@ class PodiumPresetsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_preset_create(self.token, *args, **kwargs)
+        self._call(make_preset_create, *args, **kwargs)
 
     def update(self, *args, **kwargs):
         """
@@ -1724,10 +1746,10 @@ class PodiumPresetsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_preset_update(self.token, *args, **kwargs)
+        self._call(make_preset_update, *args, **kwargs)
 
 
-class PodiumRatingsAPI(object):
+class PodiumRatingsAPI(PodiumSubAPI):
     """
     Object that handles ratings requests and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -1738,9 +1760,6 @@ class PodiumRatingsAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def create(self, *args, **kwargs):
         """
         Request that creates or updates a PodiumRating.
@@ -1780,10 +1799,10 @@ class PodiumRatingsAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_rating_create(self.token, *args, **kwargs)
+        self._call(make_rating_create, *args, **kwargs)
 
 
-class PodiumLogfilesAPI(object):
+class PodiumLogfilesAPI(PodiumSubAPI):
     """
     Object that handles Logfiles and keeps track of the
     authentication token necessary to do so. Usually accessed via
@@ -1794,9 +1813,6 @@ class PodiumLogfilesAPI(object):
 
     """
 
-    def __init__(self, token):
-        self.token = token
-
     def new(self, *args, **kwargs):
         """
         Request that prepares a logfile for upload
@@ -1838,7 +1854,7 @@ class PodiumLogfilesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_logfile_new(self.token, *args, **kwargs)
+        self._call(make_logfile_new, *args, **kwargs)
 
     def create(self, *args, **kwargs):
         """
@@ -1877,7 +1893,85 @@ class PodiumLogfilesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_logfile_create(self.token, *args, **kwargs)
+        self._call(make_logfile_create, *args, **kwargs)
+
+    def upload(self, *args, **kwargs):
+        """
+        Uploads a logfile from disk: prepares the upload with new, streams
+        the file to the upload_url and registers it with create. The file is
+        never read into memory as a whole.
+
+        The uri for the newly created logfile will be provided to the
+        redirect_callback if one is provided in the form of a PodiumRedirect.
+
+        Args:
+            device_id (int): ID of the device the logfile will be associated
+            with.
+
+            path (str): Path of the logfile to upload.
+
+            source (str): Source of the logfile.
+
+            source_ver (str): Version of the source of the logfile.
+
+        Kwargs:
+            event_id (int): ID of the event the logfile will be associated
+            with. Defaults to None, an event is selected or created.
+
+            failure_callback (function): Callback for failures and errors of
+            any of the requests. Will have the signature:
+                on_failure(failure_type (string), result (dict), data (dict))
+            Values for failure type are: 'error', 'failure'. Defaults to None.
+
+            redirect_callback (function): Callback for the created logfile,
+            Will have the signature:
+                on_redirect(redirect_object (PodiumRedirect))
+            Defaults to None.
+
+            progress_callback (function): Callback for the progress of the
+            upload of the file, will have the signature:
+                on_progress(current_size (int), total_size (int), data (dict))
+            Defaults to None.
+
+        Return:
+            UrlRequest: The request preparing the upload.
+
+        """
+        self._call(make_logfile_upload, *args, **kwargs)
+
+    def resumable_upload(self, *args, **kwargs):
+        """
+        Uploads a logfile from disk like upload, sending the file again
+        after a network error. Once the file was uploaded it is recorded in
+        a manifest next to the file, so starting the upload again after the
+        logfile could not be created only creates it. See
+        **podium_api.upload.ResumableUpload**.
+
+        Args:
+            device_id (int): ID of the device the logfile will be associated
+            with.
+
+            path (str): Path of the logfile to upload.
+
+            source (str): Source of the logfile.
+
+            source_ver (str): Version of the source of the logfile.
+
+        Kwargs:
+            event_id (int): ID of the event the logfile will be associated
+            with. Defaults to None, an event is selected or created.
+
+            max_attempts (int): Maximum number of times the file is sent.
+            Defaults to 3.
+
+            failure_callback, redirect_callback, progress_callback: See
+            upload.
+
+        Return:
+            ResumableUpload: The upload, its cancel method stops it.
+
+        """
+        return self._call(make_logfile_resumable_upload, *args, **kwargs)
 
     def list(self, *args, **kwargs):
         """
@@ -1924,7 +2018,7 @@ class PodiumLogfilesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_logfiles_get(self.token, *args, **kwargs)
+        self._call(make_logfiles_get, *args, **kwargs)
 
     def get(self, *args, **kwargs):
         """
@@ -1961,4 +2055,4 @@ class PodiumLogfilesAPI(object):
             UrlRequest: The request being made.
 
         """
-        make_logfile_get(self.token, *args, **kwargs)
+        self._call(make_logfile_get, *args, **kwargs)
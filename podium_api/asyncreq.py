@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from kivy.network.urlrequest import UrlRequest
+from contextvars import ContextVar
+from importlib.util import find_spec
 
 import podium_api
 
@@ -9,26 +10,85 @@ try:
 except:
     from urllib import urlencode
 
+from podium_api.encoding import StreamedBody
+from podium_api.transport import PooledTransport, UrlRequestTransport, WrappedTransport
 from podium_api.types.exceptions import PodiumApplicationNotRegistered
 
+"""
+DEFAULT_TRANSPORT is created by the first request made without a registered
+transport. Kivy is only imported at that point, so importing podium_api stays
+cheap on headless servers.
+"""
+DEFAULT_TRANSPORT = None
+
+
+def __getattr__(name):
+    # UrlRequest used to be imported here at module load, keep it available
+    # without importing Kivy until it is actually asked for.
+    if name == "UrlRequest":
+        from kivy.network.urlrequest import UrlRequest
+
+        return UrlRequest
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+def get_default_transport():
+    """
+    Returns the transport used when none is registered: a
+    UrlRequestTransport when Kivy is installed, otherwise a PooledTransport.
+
+    Return:
+        PodiumTransport: The default transport.
+    """
+    global DEFAULT_TRANSPORT
+    if DEFAULT_TRANSPORT is None:
+        if find_spec("kivy") is not None:
+            DEFAULT_TRANSPORT = UrlRequestTransport()
+        else:
+            DEFAULT_TRANSPORT = PooledTransport()
+    return DEFAULT_TRANSPORT
+
+
+"""
+CURRENT_TRANSPORT overrides the registered transport for the current context,
+podium_api.aioapi uses it to route requests to the asyncio transport.
+"""
+CURRENT_TRANSPORT = ContextVar("podium_api_transport", default=None)
+
+
+def get_transport():
+    """
+    Returns the transport requests should be made with: the transport set in
+    CURRENT_TRANSPORT, the transport registered with
+    **podium_api.register_podium_transport** or the default transport.
+
+    Return:
+        PodiumTransport: The transport for new requests.
+    """
+    transport = CURRENT_TRANSPORT.get()
+    if transport is not None:
+        return transport
+    if podium_api.PODIUM_TRANSPORT is not None:
+        return podium_api.PODIUM_TRANSPORT
+    return get_default_transport()
+
 
 def get_json_header_token(token):
     """
-    Returns a header prepared with the app_id and app_secret set to tell
+    Returns a header prepared with the token of the user set to tell
     the server to return json. Content-Type will be
     'application/x-www-form-urlencoded'
 
+    The header is built once per token and is immutable, copy it with
+    dict(header) to change it.
+
     Return:
-        dict: Dict containing the header data for a request.
+        Mapping: Mapping containing the header data for a request.
 
     """
     if podium_api.PODIUM_APP is None:
         raise PodiumApplicationNotRegistered()
-    return {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Authorization": "Bearer {}".format(token.token),
-        "Accept": "application/json",
-    }
+    return token.json_header
 
 
 def get_json_header():
@@ -37,17 +97,17 @@ def get_json_header():
     the server to return json. Content-Type will be
     'application/x-www-form-urlencoded'
 
+    The header is built once per application and is immutable, copy it
+    with dict(header) to change it.
+
     Return:
-        dict: Dict containing the header data for a request.
+        Mapping: Mapping containing the header data for a request.
 
     """
-    if podium_api.PODIUM_APP is None:
+    app = podium_api.PODIUM_APP
+    if app is None:
         raise PodiumApplicationNotRegistered()
-    return {
-        "Content-Type": "application/x-www-form-urlencoded",
-        "Authorization": "Basic {}:{}".format(podium_api.PODIUM_APP.app_id, podium_api.PODIUM_APP.app_secret),
-        "Accept": "application/json",
-    }
+    return app.json_header
 
 
 def make_request(
@@ -62,9 +122,11 @@ def make_request(
     header=None,
     data=None,
     params=None,
+    payload_name=None,
 ):
     """
-    Creates and starts a UrlRequest.
+    Creates and starts a request using the transport returned by
+    **get_transport**, by default a Kivy UrlRequest.
 
     Args:
         endpoint (str): The endpoint the request will go to.
@@ -99,7 +161,8 @@ def make_request(
         Defaults to None.
 
         body (dict): Body of the request, will be encoded using
-        urllib.urlencode. Defaults to None.
+        urllib.urlencode. A str, bytes or StreamedBody body is sent as it
+        is, see **podium_api.encoding**. Defaults to None.
 
         header (dict): The header for the request. Defaults to None.
 
@@ -107,11 +170,16 @@ def make_request(
         to the various callbacks of a request. Each callback will receive the
         data in here. Defaults to empty dict.
 
+        payload_name (str): Name of the paged data of a paged request. A
+        transport that streams payloads, see **PodiumTransport**, parses the
+        page as it is read and succeeds with a PodiumPagedResponse instead of
+        a dict. Defaults to None.
+
     Return:
         UrlRequest: The request being made.
 
     """
-    if body is not None:
+    if body is not None and not isinstance(body, (str, bytes, StreamedBody)):
         body = urlencode(body)
     if params is not None and params != {}:
         params = urlencode(params)
@@ -119,16 +187,21 @@ def make_request(
             endpoint = "{}&{}".format(endpoint, params)
         else:
             endpoint = "{}?{}".format(endpoint, params)
-    return UrlRequest(
+    transport = get_transport()
+    kwargs = {}
+    if payload_name is not None and getattr(transport, "stream_payloads", False):
+        kwargs["payload_name"] = payload_name
+    return transport.request(
         endpoint,
         method=method,
-        req_body=body,
-        req_headers=header,
+        body=body,
+        headers=header,
         on_success=(lambda req, res: on_success(req, res, data)) if on_success is not None else None,
         on_failure=(lambda req, res: on_failure(req, res, data)) if on_failure is not None else None,
         on_redirect=(lambda req, res: on_redirect(req, res, data)) if on_redirect is not None else None,
         on_progress=(lambda req, cur, tot: on_progress(req, cur, tot, data)) if on_progress is not None else None,
         on_error=(lambda req, res: on_error(req, res, data)) if on_error is not None else None,
+        **kwargs
     )
 
 
@@ -175,7 +248,8 @@ def make_request_default(
         Defaults to None.
 
         body (dict): Body of the request, will be encoded using
-        urllib.urlencode. Defaults to None.
+        urllib.urlencode. A str, bytes or StreamedBody body is sent as it
+        is, see **podium_api.encoding**. Defaults to None.
 
         header (dict): The header for the request. Defaults to None.
 
@@ -220,6 +294,7 @@ def make_request_custom_success(
     body=None,
     header=None,
     params=None,
+    payload_name=None,
 ):
     """
     Creates a request with a custom success handler and the default failure
@@ -258,7 +333,8 @@ def make_request_custom_success(
         Defaults to None.
 
         body (dict): Body of the request, will be encoded using
-        urllib.urlencode. Defaults to None.
+        urllib.urlencode. A str, bytes or StreamedBody body is sent as it
+        is, see **podium_api.encoding**. Defaults to None.
 
         header (dict): The header for the request. Defaults to None.
 
@@ -266,6 +342,11 @@ def make_request_custom_success(
         to the various callbacks of a request. Each callback will receive the
         data in here. Defaults to empty dict.
 
+        payload_name (str): Name of the paged data of a paged request. A
+        transport that streams payloads, see **PodiumTransport**, parses the
+        page as it is read and succeeds with a PodiumPagedResponse instead of
+        a dict. Defaults to None.
+
     Return:
         UrlRequest: The request being made.
 
@@ -288,9 +369,54 @@ def make_request_custom_success(
         header=header,
         data=data,
         params=params,
+        payload_name=payload_name,
     )
 
 
+def make_local_response(
+    endpoint,
+    success_handler,
+    result,
+    success_callback=None,
+    failure_callback=None,
+    redirect_callback=None,
+    progress_callback=None,
+    data=None,
+):
+    """
+    Answers a request with a result that is already known, for example one
+    read from disk, instead of making it. The success_handler is called with
+    the result the same way **make_request_custom_success** would call it,
+    through the dispatch of the transport returned by **get_transport**.
+
+    Args:
+        endpoint (str): The endpoint the request would have gone to.
+
+        success_handler (function): Handler called with the result, will
+        have the signature:
+            on_success(request (LocalRequest), result (dict), data (dict))
+
+        result (dict): The result to answer with.
+
+    Kwargs:
+        success_callback, failure_callback, redirect_callback,
+        progress_callback, data: See **make_request_custom_success**.
+
+    Return:
+        LocalRequest: The answered request.
+    """
+    if data is None:
+        data = {}
+    data["success_callback"] = success_callback
+    data["failure_callback"] = failure_callback
+    data["progress_callback"] = progress_callback
+    data["redirect_callback"] = redirect_callback
+    transport = WrappedTransport(get_transport())
+    req = transport.local_request(endpoint)
+    transport.complete_local(req, 200, {}, result, success_handler, result, data)
+    return req
+
+
 def default_redirect(req, results, data):
     """
     Default handler for a redirect callback. Will call the 'redirect_callback'
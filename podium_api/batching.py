@@ -0,0 +1,251 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Batching of racestat updates. Live timing feeds update every car many times
+a second, **RacestatBatcher** only keeps the latest update of each device and
+posts them together through **make_racestats_create**.
+"""
+import threading
+
+from podium_api.racestat import make_racestats_create
+from podium_api.transport import thread_call_later
+
+
+class RacestatBatcher(object):
+    """
+    Collects racestat updates for an event and posts them in batches. Only
+    the latest update of each device_id is kept until the batch is sent, so
+    a field of 60 cars updating every second becomes a single request per
+    flush_interval.
+
+    A batch is sent flush_interval seconds after the first update of the
+    batch, or as soon as max_batch_size devices are waiting. At most
+    max_in_flight batches are posted at once, while they are in flight
+    updates keep being coalesced and are sent when a request finishes.
+    Updates for new devices are refused once max_pending devices are
+    waiting, see **update** and **saturated**.
+
+    **Attributes:**
+        **event_id** (int): The event the racestats are posted to.
+
+        **flush_interval** (float): Maximum seconds an update waits before
+        being sent.
+
+        **max_batch_size** (int): Maximum number of racestats in a request.
+
+        **max_in_flight** (int): Maximum number of requests posted at once.
+
+        **max_pending** (int): Maximum number of devices waiting to be sent.
+
+        **requeue_failed** (bool): If True the racestats of a failed batch are
+        sent again with the next batch, unless a newer update of the device
+        arrived in the meantime.
+
+        **sent_batches** (int): Number of batches posted successfully.
+
+        **coalesced** (int): Number of updates replaced by a newer update of
+        the same device before being sent.
+
+        **success_callback** (function): Called after a batch was posted,
+        will have the signature:
+            on_success(racestats (list))
+
+        **failure_callback** (function): Called after a batch failed, will
+        have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+
+        **call_later** (function): Schedules the flushes, called as
+        call_later(delay, callback) it must return an object with a cancel
+        method. Defaults to **podium_api.transport.thread_call_later**, use
+        loop.call_later on asyncio or a wrapper of Clock.schedule_once on
+        Kivy.
+
+        **tracker** (RacestatTracker): If provided racestats that did not
+        change since they were last sent are left out of the batches, see
+        **podium_api.racestat.RacestatTracker**.
+
+        **changed_only** (bool): If True and a tracker is provided only the
+        changed fields of each racestat are sent.
+    """
+
+    def __init__(
+        self,
+        token,
+        event_id,
+        flush_interval=1.0,
+        max_batch_size=100,
+        max_in_flight=1,
+        max_pending=1000,
+        requeue_failed=True,
+        success_callback=None,
+        failure_callback=None,
+        call_later=None,
+        tracker=None,
+        changed_only=False,
+    ):
+        self.token = token
+        self.event_id = event_id
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        self.requeue_failed = requeue_failed
+        self.success_callback = success_callback
+        self.failure_callback = failure_callback
+        self.call_later = call_later if call_later is not None else thread_call_later
+        self.tracker = tracker
+        self.changed_only = changed_only
+        self.sent_batches = 0
+        self.coalesced = 0
+        self._pending = {}
+        self._in_flight = 0
+        self._timer = None
+        self._flush_waiting = False
+        self._closed = False
+        self._lock = threading.RLock()
+
+    @property
+    def pending_count(self):
+        """
+        Number of devices waiting to be sent.
+        """
+        return len(self._pending)
+
+    @property
+    def in_flight(self):
+        """
+        Number of batches being posted.
+        """
+        return self._in_flight
+
+    @property
+    def saturated(self):
+        """
+        True while max_in_flight batches are being posted, updates are only
+        coalesced until one of them finishes.
+        """
+        return self._in_flight >= self.max_in_flight
+
+    def update(self, racestat):
+        """
+        Adds the racestat of a device, replacing the update of the same
+        device waiting to be sent if there is one.
+
+        Args:
+            racestat (dict): The device_id and the racestat fields, see
+            **make_racestats_create**.
+
+        Return:
+            bool: False if the update was refused because max_pending devices
+            are waiting or the batcher was closed, True otherwise.
+        """
+        device_id = racestat["device_id"]
+        with self._lock:
+            if self._closed:
+                return False
+            if device_id in self._pending:
+                self.coalesced += 1
+            elif len(self._pending) >= self.max_pending:
+                return False
+            self._pending[device_id] = racestat
+            flush_now = len(self._pending) >= self.max_batch_size
+            if not flush_now and self._timer is None:
+                self._timer = self.call_later(self.flush_interval, self._on_timer)
+        if flush_now:
+            self.flush()
+        return True
+
+    def flush(self):
+        """
+        Sends the waiting racestats now. If max_in_flight batches are being
+        posted they are sent as soon as one of them finishes instead.
+
+        Return:
+            int: Number of batches sent.
+        """
+        sent = 0
+        while True:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if not self._pending:
+                    self._flush_waiting = False
+                    return sent
+                if self._in_flight >= self.max_in_flight:
+                    self._flush_waiting = True
+                    return sent
+                device_ids = list(self._pending)[: self.max_batch_size]
+                batch = [self._pending.pop(device_id) for device_id in device_ids]
+                self._in_flight += 1
+            self._send(batch)
+            sent += 1
+
+    def close(self):
+        """
+        Refuses further updates and sends the racestats still waiting.
+        """
+        with self._lock:
+            self._closed = True
+        self.flush()
+
+    def _send(self, batch):
+        try:
+            req = make_racestats_create(
+                self.token,
+                self.event_id,
+                batch,
+                success_callback=lambda results, data: self._on_sent(batch),
+                redirect_callback=lambda redirect: self._on_sent(batch),
+                failure_callback=lambda failure_type, results, data: self._on_failed(
+                    batch, failure_type, results, data
+                ),
+                tracker=self.tracker,
+                changed_only=self.changed_only,
+            )
+        except Exception:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        if req is None:
+            # the tracker found nothing new to send
+            with self._lock:
+                self._in_flight -= 1
+            self._after_request()
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def _on_sent(self, batch):
+        with self._lock:
+            self._in_flight -= 1
+            self.sent_batches += 1
+        if self.success_callback is not None:
+            self.success_callback(batch)
+        self._after_request()
+
+    def _on_failed(self, batch, failure_type, results, data):
+        with self._lock:
+            self._in_flight -= 1
+            if self.requeue_failed:
+                for racestat in batch:
+                    self._pending.setdefault(racestat["device_id"], racestat)
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, results, data)
+        self._after_request(failed=True)
+
+    def _after_request(self, failed=False):
+        with self._lock:
+            if not self._pending:
+                return
+            # after a failure the next batch waits for flush_interval instead
+            # of retrying in a loop
+            flush_now = not failed and (
+                self._flush_waiting or self._closed or len(self._pending) >= self.max_batch_size
+            )
+            if not flush_now and self._timer is None:
+                self._timer = self.call_later(self.flush_interval, self._on_timer)
+        if flush_now:
+            self.flush()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Opt-in HTTP cache for GET requests, wrap the transport used by
+**podium_api.asyncreq.make_request** and register it:
+
+    podium_api.register_podium_transport(CachingTransport(PooledTransport()))
+
+Responses are kept per url and token and reused while Cache-Control allows
+it, stale responses are revalidated with If-None-Match / If-Modified-Since so
+the server can answer with a small 304 instead of the full JSON.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from podium_api.transport import WrappedTransport
+
+try:
+    from urllib.parse import urlsplit, urlunsplit
+except:
+    from urlparse import urlsplit, urlunsplit
+
+
+def get_header(headers, name):
+    """
+    Returns the value of the header called name, ignoring case, or None.
+    """
+    if not headers:
+        return None
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def parse_cache_control(value):
+    """
+    Returns the directives of a Cache-Control header as a dict, directives
+    without a value map to True.
+    """
+    directives = {}
+    if not value:
+        return directives
+    for part in value.split(","):
+        key, _, argument = part.strip().partition("=")
+        if key:
+            directives[key.lower()] = argument.strip('"') if argument else True
+    return directives
+
+
+def strip_query(url):
+    """
+    Returns url without its params.
+    """
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, "", ""))
+
+
+class CacheEntry(object):
+    """
+    A cached response.
+
+    **Attributes:**
+        **result** (object): The decoded result of the response.
+
+        **headers** (dict): The headers of the response.
+
+        **etag** (str): The ETag of the response, None if there was none.
+
+        **last_modified** (str): The Last-Modified of the response, None if
+        there was none.
+
+        **expires** (float): time.time() after which the response must be
+        revalidated.
+    """
+
+    __slots__ = ("result", "headers", "etag", "last_modified", "expires")
+
+    def __init__(self, result, headers, etag, last_modified, expires):
+        self.result = result
+        self.headers = headers
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires = expires
+
+    @property
+    def fresh(self):
+        return time.time() < self.expires
+
+
+def get_freshness(headers, now=None):
+    """
+    Returns the time.time() until which a response with headers can be used
+    without revalidation, or None if it must not be stored.
+    """
+    now = time.time() if now is None else now
+    directives = parse_cache_control(get_header(headers, "Cache-Control"))
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return now
+    max_age = directives.get("max-age")
+    if max_age is not None and max_age is not True:
+        try:
+            return now + max(int(max_age), 0)
+        except ValueError:
+            pass
+    return now
+
+
+class CachingTransport(WrappedTransport):
+    """
+    Transport that caches the responses to GET requests made through its
+    inner transport. Entries are keyed by url, including the params, and by
+    the Authorization header, so tokens never share responses. Requests with
+    other methods pass through and drop the cached responses of their url.
+
+    **Attributes:**
+        **max_entries** (int): Maximum number of responses kept, the least
+        recently used are evicted first.
+
+        **hits** (int): Requests answered from the cache without a request.
+
+        **misses** (int): Requests with nothing cached, or whose stale
+        response was revalidated and replaced by a full response.
+
+        **revalidated** (int): Requests answered with a 304 Not Modified and
+        served from the cache.
+    """
+
+    def __init__(self, inner=None, max_entries=256, dispatch=None):
+        super(CachingTransport, self).__init__(inner, dispatch=dispatch)
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self):
+        """
+        Returns the hits, misses and revalidated counters as a dict.
+        """
+        return {"hits": self.hits, "misses": self.misses, "revalidated": self.revalidated}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        """
+        Drops every cached response.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def invalidate(self, url):
+        """
+        Drops the cached responses of url, for any token and params.
+        """
+        path = strip_query(url)
+        with self._lock:
+            for key in [key for key in self._entries if strip_query(key[0]) == path]:
+                del self._entries[key]
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        if (method or "GET") != "GET":
+            self.invalidate(url)
+            return super(CachingTransport, self).request(
+                url,
+                method=method,
+                body=body,
+                headers=headers,
+                on_success=on_success,
+                on_failure=on_failure,
+                on_error=on_error,
+                on_redirect=on_redirect,
+                on_progress=on_progress,
+            )
+        key = (url, get_header(headers, "Authorization"))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if entry.fresh:
+                    self.hits += 1
+            if entry is None:
+                self.misses += 1
+        if entry is not None and entry.fresh:
+            req = self.local_request(url, method, body, headers)
+            self.complete_local(req, 200, entry.headers, entry.result, on_success, entry.result)
+            return req
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.etag is not None:
+                request_headers["If-None-Match"] = entry.etag
+            if entry.last_modified is not None:
+                request_headers["If-Modified-Since"] = entry.last_modified
+
+        def cached_success(req, result):
+            if entry is not None:
+                with self._lock:
+                    self.misses += 1
+            self._store(key, result, getattr(req, "resp_headers", None))
+            if on_success is not None:
+                on_success(req, result)
+
+        def cached_redirect(req, result):
+            if entry is not None and getattr(req, "resp_status", None) == 304:
+                with self._lock:
+                    self.revalidated += 1
+                self._refresh(key, entry, getattr(req, "resp_headers", None))
+                if on_success is not None:
+                    on_success(req, entry.result)
+            elif on_redirect is not None:
+                on_redirect(req, result)
+
+        return self.inner.request(
+            url,
+            method=method,
+            body=body,
+            headers=request_headers,
+            on_success=cached_success,
+            on_failure=on_failure,
+            on_error=on_error,
+            on_redirect=cached_redirect,
+            on_progress=on_progress,
+        )
+
+    def _store(self, key, result, headers):
+        expires = get_freshness(headers)
+        etag = get_header(headers, "ETag")
+        last_modified = get_header(headers, "Last-Modified")
+        with self._lock:
+            if expires is None or (expires <= time.time() and etag is None and last_modified is None):
+                # nothing that could be reused or revalidated later
+                self._entries.pop(key, None)
+                return
+            self._entries[key] = CacheEntry(result, headers, etag, last_modified, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh(self, key, entry, headers):
+        # a 304 carries the new freshness, the validators may change too
+        expires = get_freshness(headers or entry.headers)
+        with self._lock:
+            if expires is None:
+                self._entries.pop(key, None)
+                return
+            entry.expires = expires
+            entry.etag = get_header(headers, "ETag") or entry.etag
+            entry.last_modified = get_header(headers, "Last-Modified") or entry.last_modified
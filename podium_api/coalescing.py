@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Coalescing of identical GET requests, wrap the transport used by
+**podium_api.asyncreq.make_request** and register it:
+
+    podium_api.register_podium_transport(CoalescingTransport())
+
+Widgets asking for the same user or event within a few milliseconds then
+share a single request, each of them still receives its own callbacks.
+"""
+import threading
+
+from podium_api.transport import WrappedTransport
+
+
+class InFlightRequest(object):
+    """
+    A request made by the inner transport and the callers waiting for it.
+
+    **Attributes:**
+        **request** (object): The request of the inner transport.
+
+        **waiters** (list): (LocalRequest, callbacks) of every caller, the
+        callbacks being a dict of the on_* callbacks keyed by name.
+    """
+
+    __slots__ = ("request", "waiters")
+
+    def __init__(self):
+        self.request = None
+        self.waiters = []
+
+
+class CoalescingTransport(WrappedTransport):
+    """
+    Transport that makes a single request for identical GET requests in
+    flight at the same time. Requests are identical when their url,
+    including the params, and their headers, including the Authorization,
+    are the same. Requests with other methods pass through.
+
+    Every caller receives a LocalRequest answered with the response of the
+    shared request, cancelling it drops the callbacks of that caller. The
+    shared request is cancelled once every caller cancelled.
+
+    **Attributes:**
+        **coalesced** (int): Number of requests that were answered by a
+        request already in flight instead of being made.
+    """
+
+    def __init__(self, inner=None, dispatch=None):
+        super(CoalescingTransport, self).__init__(inner, dispatch=dispatch)
+        self.coalesced = 0
+        self._in_flight = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight_count(self):
+        """
+        Number of shared requests in flight.
+        """
+        return len(self._in_flight)
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        if (method or "GET") != "GET":
+            return super(CoalescingTransport, self).request(
+                url,
+                method=method,
+                body=body,
+                headers=headers,
+                on_success=on_success,
+                on_failure=on_failure,
+                on_error=on_error,
+                on_redirect=on_redirect,
+                on_progress=on_progress,
+            )
+        key = (url, tuple(sorted((headers or {}).items())))
+        req = self.local_request(url, method, body, headers)
+        callbacks = {
+            "on_success": on_success,
+            "on_failure": on_failure,
+            "on_error": on_error,
+            "on_redirect": on_redirect,
+            "on_progress": on_progress,
+        }
+        with self._lock:
+            shared = self._in_flight.get(key)
+            if shared is not None:
+                shared.waiters.append((req, callbacks))
+                req.cancel_callback = lambda req: self._cancel(key, shared)
+                self.coalesced += 1
+                return req
+            shared = InFlightRequest()
+            shared.waiters.append((req, callbacks))
+            self._in_flight[key] = shared
+        req.cancel_callback = lambda req: self._cancel(key, shared)
+        try:
+            shared.request = self.inner.request(
+                url,
+                method=method,
+                body=body,
+                headers=headers,
+                on_success=lambda inner_req, result: self._complete(key, shared, "on_success", inner_req, result),
+                on_failure=lambda inner_req, result: self._complete(key, shared, "on_failure", inner_req, result),
+                on_error=lambda inner_req, error: self._complete(key, shared, "on_error", inner_req, error),
+                on_redirect=lambda inner_req, result: self._complete(key, shared, "on_redirect", inner_req, result),
+                on_progress=lambda inner_req, current, total: self._progress(shared, current, total),
+            )
+        except Exception as e:
+            self._remove(key, shared)
+            # the caller gets the exception, the callers that joined it get
+            # their error callbacks
+            for waiter, waiter_callbacks in shared.waiters[1:]:
+                waiter._error = e
+                self.complete_local(waiter, None, None, e, waiter_callbacks["on_error"], e)
+            raise
+        if all(waiter.cancelled for waiter, waiter_callbacks in shared.waiters):
+            # every caller cancelled while the request was being made
+            shared.request.cancel()
+        return req
+
+    def _remove(self, key, shared):
+        # a request cancelled by all of its callers may have been replaced
+        # by a new one for the same key, which must stay in flight
+        with self._lock:
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+
+    def _complete(self, key, shared, name, inner_req, result):
+        self._remove(key, shared)
+        status = getattr(inner_req, "resp_status", None)
+        headers = getattr(inner_req, "resp_headers", None)
+        for req, callbacks in shared.waiters:
+            if name == "on_error":
+                req._error = result
+            # the callbacks of the inner transport already run where the
+            # callbacks of the waiters must run
+            self.complete_local(req, status, headers, result, callbacks[name], result, now=True)
+
+    def _cancel(self, key, shared):
+        with self._lock:
+            if any(not req.cancelled for req, callbacks in shared.waiters):
+                return
+            if self._in_flight.get(key) is shared:
+                del self._in_flight[key]
+            inner_req = shared.request
+        if inner_req is not None:
+            inner_req.cancel()
+
+    def _progress(self, shared, current, total):
+        for req, callbacks in list(shared.waiters):
+            if callbacks["on_progress"] is not None and not req.cancelled:
+                callbacks["on_progress"](req, current, total)
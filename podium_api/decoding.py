@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Decoding of the json responses of the Podium API. Responses are loaded with
+the fastest json package installed, orjson, then ujson, then the json module
+of the standard library. Register a different decoder with
+**podium_api.register_podium_json_decoder**:
+
+    podium_api.register_podium_json_decoder(json.loads)
+
+Pages can also be parsed incrementally with a **PagedPayloadParser**, each
+element of the paged data is converted as soon as it was read so the page is
+never held as one big dict:
+
+    podium_api.register_podium_transport(PooledTransport(stream_payloads=True))
+"""
+import re
+from importlib import import_module
+from importlib.util import find_spec
+
+import podium_api
+from podium_api.types.paged_response import PAYLOAD_NAME_TO_OBJECT, PodiumPagedResponse
+
+JSON_DECODERS = ("orjson", "ujson", "json")
+
+"""
+DEFAULT_JSON_DECODER is the loads function of the first package of
+JSON_DECODERS installed, found by the first call to **get_json_decoder**.
+"""
+DEFAULT_JSON_DECODER = None
+
+WHITESPACE = re.compile(rb"[ \t\r\n]*")
+# the rest of a string after its opening quote, escaped quotes included
+STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+SCALAR_END = re.compile(rb"[,}\]\s]")
+# everything up to the next bracket outside of a string
+SKIP = re.compile(rb'(?:[^"\[\]{}]+|"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+
+START, KEY, COLON, VALUE, ITEMS, DONE = range(6)
+
+
+def find_json_decoder(names=JSON_DECODERS):
+    """
+    Returns the loads function of the first of the json packages in names
+    that is installed.
+    """
+    for name in names:
+        if find_spec(name) is not None:
+            return import_module(name).loads
+    raise ImportError("none of {} is installed".format(", ".join(names)))
+
+
+def get_json_decoder():
+    """
+    Returns the function json responses are loaded with: the decoder
+    registered with **podium_api.register_podium_json_decoder** or the
+    DEFAULT_JSON_DECODER. It is called with the bytes of the response.
+    """
+    global DEFAULT_JSON_DECODER
+    if podium_api.PODIUM_JSON_DECODER is not None:
+        return podium_api.PODIUM_JSON_DECODER
+    if DEFAULT_JSON_DECODER is None:
+        DEFAULT_JSON_DECODER = find_json_decoder()
+    return DEFAULT_JSON_DECODER
+
+
+class PagedPayloadParser(object):
+    """
+    Incremental parser of a page of the Podium API, fed the body of the
+    response in chunks of any size as they are read. Each element of the
+    array named payload_name is loaded and converted as soon as its last
+    byte was fed, the other values of the page are loaded as they are.
+
+    Only the element being read is buffered. The converted elements are kept
+    in the payload of the page unless keep_items is False, each element is
+    then only passed to item_callback and the memory used does not grow with
+    the size of the page.
+
+    **Attributes:**
+        **payload_name** (str): Name of the paged data, see
+        **get_paged_response_from_json**.
+
+        **converter** (function): Converts each element of the paged data.
+        Defaults to the converter of payload_name in PAYLOAD_NAME_TO_OBJECT.
+
+        **item_callback** (function): Called with each converted element as
+        soon as it was read. Defaults to None.
+
+        **keep_items** (bool): If False the converted elements are not kept
+        in payload, they are only passed to item_callback. Defaults to True.
+
+        **loads** (function): Loads the json of each element. Defaults to
+        **get_json_decoder**().
+
+        **payload** (list): The elements converted so far, empty if
+        keep_items is False.
+
+        **fields** (dict): The other values of the page read so far, such as
+        total and nextURI.
+    """
+
+    def __init__(self, payload_name, converter=None, item_callback=None, loads=None, keep_items=True):
+        self.payload_name = payload_name
+        self.converter = converter if converter is not None else PAYLOAD_NAME_TO_OBJECT[payload_name]
+        self.item_callback = item_callback
+        self.keep_items = keep_items
+        self.loads = loads if loads is not None else get_json_decoder()
+        self.payload = []
+        self.fields = {}
+        self._found = False
+        self._buffer = bytearray()
+        self._pos = 0
+        self._state = START
+        self._key = None
+        # resumable scan of the container value starting at _value_start
+        self._value_start = None
+        self._scan_pos = 0
+        self._depth = 0
+
+    def feed(self, chunk):
+        """
+        Parses the next chunk of the body.
+
+        Raises:
+            ValueError: If the body is not a json object.
+        """
+        if not chunk:
+            return
+        self._buffer += chunk
+        self._parse()
+        # drop what was parsed, keeping the value being scanned
+        keep = self._pos if self._value_start is None else self._value_start
+        if keep:
+            del self._buffer[:keep]
+            self._pos -= keep
+            self._scan_pos -= keep
+            if self._value_start is not None:
+                self._value_start -= keep
+
+    def close(self):
+        """
+        Ends the body.
+
+        Return:
+            PodiumPagedResponse: The page, its payload holds the converted
+            elements if keep_items is True.
+
+        Raises:
+            ValueError: If the body is truncated.
+
+            KeyError: If the page has no payload_name or total.
+        """
+        if self._state != DONE:
+            raise ValueError("truncated json document")
+        if not self._found:
+            raise KeyError(self.payload_name)
+        return PodiumPagedResponse(
+            self.payload,
+            self.fields["total"],
+            self.fields.get("nextURI", None),
+            self.fields.get("prevURI", None),
+            payload_name=self.payload_name,
+        )
+
+    def _parse(self):
+        buf = self._buffer
+        while True:
+            pos = WHITESPACE.match(buf, self._pos).end()
+            self._pos = pos
+            if pos >= len(buf):
+                return
+            char = buf[pos]
+            state = self._state
+            if state == ITEMS:
+                if char == 0x2C:  # ,
+                    self._pos = pos + 1
+                elif char == 0x5D:  # ]
+                    self._pos = pos + 1
+                    self._state = KEY
+                else:
+                    end = self._scan_value(pos)
+                    if end is None:
+                        return
+                    self._add(self.loads(bytes(buf[pos:end])))
+                    self._pos = end
+            elif state == KEY:
+                if char == 0x2C:
+                    self._pos = pos + 1
+                elif char == 0x7D:  # }
+                    self._pos = pos + 1
+                    self._state = DONE
+                elif char == 0x22:  # "
+                    match = STRING_END.match(buf, pos + 1)
+                    if match is None:
+                        return
+                    self._key = self.loads(bytes(buf[pos : match.end()]))
+                    self._pos = match.end()
+                    self._state = COLON
+                else:
+                    raise ValueError("expected a key at {}".format(pos))
+            elif state == COLON:
+                if char != 0x3A:  # :
+                    raise ValueError("expected ':' at {}".format(pos))
+                self._pos = pos + 1
+                self._state = VALUE
+            elif state == VALUE:
+                if self._key == self.payload_name and char == 0x5B:  # [
+                    self._found = True
+                    self._pos = pos + 1
+                    self._state = ITEMS
+                    continue
+                end = self._scan_value(pos)
+                if end is None:
+                    return
+                self.fields[self._key] = self.loads(bytes(buf[pos:end]))
+                self._pos = end
+                self._state = KEY
+            elif state == START:
+                if char != 0x7B:  # {
+                    raise ValueError("expected a json object")
+                self._pos = pos + 1
+                self._state = KEY
+            else:
+                raise ValueError("extra data after the json object at {}".format(pos))
+
+    def _scan_value(self, start):
+        """
+        Returns the end of the value starting at start, None if it was not
+        fed completely yet.
+        """
+        buf = self._buffer
+        char = buf[start]
+        if char == 0x22:
+            match = STRING_END.match(buf, start + 1)
+            return match.end() if match is not None else None
+        if char not in (0x7B, 0x5B):
+            match = SCALAR_END.search(buf, start)
+            return match.start() if match is not None else None
+        if self._value_start != start:
+            self._value_start = start
+            self._scan_pos = start + 1
+            self._depth = 1
+        pos = self._scan_pos
+        length = len(buf)
+        while True:
+            pos = SKIP.match(buf, pos).end()
+            if pos >= length or buf[pos] == 0x22:
+                # a string is only skipped once it was fed completely
+                self._scan_pos = pos
+                return None
+            if buf[pos] in (0x7B, 0x5B):
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._value_start = None
+                    return pos + 1
+            pos += 1
+
+    def _add(self, item):
+        item = self.converter(item)
+        if self.keep_items:
+            self.payload.append(item)
+        if self.item_callback is not None:
+            self.item_callback(item)
@@ -162,6 +162,7 @@ def make_devices_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="devices",
     )
 
 
@@ -0,0 +1,278 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Precompiled encoders for request bodies made of records with a fixed set of
+fields, such as the racestats of **make_racestats_create**. The form encoding
+is byte for byte the same as urlencode of the equivalent dict, but the
+quoted keys are built once per schema instead of once per value.
+
+Large bodies, such as logfiles, are sent as a **StreamedBody**: the
+transports iterate it chunk by chunk instead of holding it in memory.
+"""
+import json
+import mmap
+import os
+import uuid
+
+try:
+    from urllib.parse import quote_plus
+except:
+    from urllib import quote_plus
+
+JSON_CONTENT_TYPE = "application/json"
+STREAM_CHUNK_SIZE = 65536
+
+
+def encode_form_value(value):
+    """
+    Returns the urlencoded bytes of a value, the same as urlencode does.
+    """
+    if isinstance(value, int) or value is None:
+        # digits, '-' and the letters of True/False/None never need quoting
+        return str(value).encode("ascii")
+    if isinstance(value, float):
+        text = str(value)
+        if "+" not in text:
+            return text.encode("ascii")
+    if isinstance(value, bytes):
+        return quote_plus(value).encode("ascii")
+    return quote_plus(str(value)).encode("ascii")
+
+
+class FormSchema(object):
+    """
+    Encoder of records nested under name, for example
+    racestat[0][comp_number]=12&racestat[0][comp_class]=P1 for an indexed
+    schema or racestat[comp_number]=12 for a single record.
+
+    **Attributes:**
+        **name** (str): Name the fields are nested under.
+
+        **fields** (tuple): Names of the fields, in the order they are
+        encoded.
+
+        **indexed** (bool): If True each record is nested under its index.
+    """
+
+    __slots__ = ("name", "fields", "indexed", "_prefix", "_keys")
+
+    def __init__(self, name, fields, indexed=True):
+        self.name = name
+        self.fields = tuple(fields)
+        self.indexed = indexed
+        self._prefix = quote_plus(name + "[").encode("ascii")
+        if indexed:
+            # the index goes between the prefix and the keys: name[0][field]=
+            self._keys = tuple(quote_plus("][{}]".format(field)).encode("ascii") + b"=" for field in self.fields)
+        else:
+            self._keys = tuple(quote_plus("{}]".format(field)).encode("ascii") + b"=" for field in self.fields)
+
+    def encode_into(self, buf, records, partial=False):
+        """
+        Appends the encoded records to the bytearray buf.
+
+        Args:
+            buf (bytearray): The buffer to write to.
+
+            records (list): Dicts holding at least every field of the
+            schema, or a single dict for a schema that is not indexed.
+
+        Kwargs:
+            partial (bool): If True fields missing from a record are left
+            out instead of raising a KeyError. Defaults to False.
+        """
+        prefix = self._prefix
+        if not self.indexed:
+            records = (records,)
+        for index, record in enumerate(records):
+            if self.indexed:
+                record_prefix = prefix + str(index).encode("ascii")
+            else:
+                record_prefix = prefix
+            for field, key in zip(self.fields, self._keys):
+                if partial and field not in record:
+                    continue
+                if buf:
+                    buf += b"&"
+                buf += record_prefix
+                buf += key
+                buf += encode_form_value(record[field])
+        return buf
+
+    def encode(self, records, partial=False):
+        """
+        Returns the records encoded as application/x-www-form-urlencoded,
+        see **encode_into**.
+
+        Return:
+            bytes: The encoded body.
+        """
+        return bytes(self.encode_into(bytearray(), records, partial=partial))
+
+    def encode_json(self, records, partial=False):
+        """
+        Returns the records encoded as a JSON body, the fields of each record
+        nested under name: {"racestat": [{"comp_number": "12", ...}]}.
+
+        Kwargs:
+            partial (bool): If True fields missing from a record are left
+            out instead of raising a KeyError. Defaults to False.
+
+        Return:
+            bytes: The encoded body.
+        """
+        if self.indexed:
+            payload = [self._json_record(record, partial) for record in records]
+        else:
+            payload = self._json_record(records, partial)
+        return json.dumps({self.name: payload}, separators=(",", ":")).encode("utf-8")
+
+    def _json_record(self, record, partial):
+        if partial:
+            return dict((field, record[field]) for field in self.fields if field in record)
+        return dict((field, record[field]) for field in self.fields)
+
+
+class StreamedBody(object):
+    """
+    Base class of the request bodies sent in chunks. Subclasses return the
+    size of the body in bytes from __len__ and yield its chunks as bytes
+    from __iter__, a body may be iterated once per attempt of a request.
+    """
+
+    __slots__ = ()
+
+    def __len__(self):
+        raise NotImplementedError()
+
+    def __iter__(self):
+        raise NotImplementedError()
+
+
+class FileBody(StreamedBody):
+    """
+    Body read from length bytes of a file starting at offset. The file is
+    memory mapped while it is sent, or read chunk by chunk where it cannot
+    be mapped, so only a chunk is held in memory at a time.
+
+    **Attributes:**
+        **path** (str): Path of the file.
+
+        **offset** (int): Position of the first byte sent.
+
+        **length** (int): Number of bytes sent. Defaults to the rest of the
+        file.
+
+        **chunk_size** (int): Size of the chunks yielded.
+    """
+
+    __slots__ = ("path", "offset", "length", "chunk_size")
+
+    def __init__(self, path, offset=0, length=None, chunk_size=STREAM_CHUNK_SIZE):
+        self.path = path
+        self.offset = offset
+        self.length = os.path.getsize(path) - offset if length is None else length
+        self.chunk_size = chunk_size
+
+    def __len__(self):
+        return self.length
+
+    def __iter__(self):
+        end = self.offset + self.length
+        with open(self.path, "rb") as f:
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (ValueError, OSError):
+                # empty files and some file systems cannot be mapped
+                mapped = None
+            if mapped is None:
+                f.seek(self.offset)
+                position = self.offset
+                while position < end:
+                    chunk = f.read(min(self.chunk_size, end - position))
+                    if not chunk:
+                        raise IOError("{} is shorter than expected".format(self.path))
+                    position += len(chunk)
+                    yield chunk
+                return
+            with mapped:
+                if end > len(mapped):
+                    raise IOError("{} is shorter than expected".format(self.path))
+                for start in range(self.offset, end, self.chunk_size):
+                    # slices are copies, the mapping can be closed while the
+                    # transport still holds a chunk
+                    yield mapped[start : min(start + self.chunk_size, end)]
+
+
+class MultipartBody(StreamedBody):
+    """
+    multipart/form-data body whose file parts are streamed, send it with
+    the Content-Type header given by **content_type**.
+
+    **Attributes:**
+        **boundary** (str): Boundary between the parts.
+    """
+
+    __slots__ = ("boundary", "_parts")
+
+    def __init__(self, boundary=None):
+        self.boundary = uuid.uuid4().hex if boundary is None else boundary
+        self._parts = []
+
+    @property
+    def content_type(self):
+        return "multipart/form-data; boundary={}".format(self.boundary)
+
+    def _add_part(self, disposition, content_type, value):
+        head = "--{}\r\nContent-Disposition: form-data; {}\r\n".format(self.boundary, disposition)
+        if content_type is not None:
+            head += "Content-Type: {}\r\n".format(content_type)
+        self._parts.append(head.encode("utf-8") + b"\r\n")
+        self._parts.append(value)
+        self._parts.append(b"\r\n")
+
+    def add_field(self, name, value):
+        """
+        Adds a form field.
+
+        Args:
+            name (str): Name of the field.
+
+            value (str): Value of the field, str or bytes.
+        """
+        if not isinstance(value, bytes):
+            value = str(value).encode("utf-8")
+        self._add_part('name="{}"'.format(name), None, value)
+
+    def add_file(self, name, body, filename, content_type="application/octet-stream"):
+        """
+        Adds a file.
+
+        Args:
+            name (str): Name of the field.
+
+            body (StreamedBody): Content of the file, a StreamedBody such as
+            a **FileBody** or bytes.
+
+            filename (str): Name of the file sent to the server.
+
+        Kwargs:
+            content_type (str): Content type of the file. Defaults to
+            application/octet-stream.
+        """
+        self._add_part('name="{}"; filename="{}"'.format(name, filename), content_type, body)
+
+    def _closing(self):
+        return "--{}--\r\n".format(self.boundary).encode("utf-8")
+
+    def __len__(self):
+        return sum(len(part) for part in self._parts) + len(self._closing())
+
+    def __iter__(self):
+        for part in self._parts:
+            if isinstance(part, StreamedBody):
+                for chunk in part:
+                    yield chunk
+            else:
+                yield part
+        yield self._closing()
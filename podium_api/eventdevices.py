@@ -101,6 +101,7 @@ def make_eventdevices_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="eventdevices",
     )
 
 
@@ -185,6 +186,7 @@ def make_livestreams_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="eventdevices",
     )
 
 
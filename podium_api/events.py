@@ -372,6 +372,7 @@ def make_events_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="events",
     )
 
 
@@ -151,6 +151,7 @@ def make_friendships_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="users",
     )
 
 
@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Identity map of the objects returned by the API. Pass an **IdentityMap** to
+**podium_api.api.PodiumAPI** or **podium_api.aioapi.PodiumAsyncAPI** and
+every user, event, device or other object with a URI is interned: a response
+for a URI already known updates the existing object in place and the
+callback receives that object instead of a copy.
+"""
+import threading
+from collections import OrderedDict
+
+from podium_api.types.paged_response import LazyPayload, PodiumPagedResponse
+
+
+def get_slots(cls):
+    """
+    Returns the names of the slots of cls and of its bases.
+    """
+    names = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(name for name in slots if name not in names)
+    return names
+
+
+class IdentityMap(object):
+    """
+    Keeps a single object per URI. Objects are updated in place when a
+    response with the same or a newer updated timestamp arrives, objects
+    without an updated attribute are always refreshed by newer responses.
+
+    The map holds at most max_entries objects, the least recently returned
+    ones are dropped first. Dropped objects stay valid, the next response
+    for their URI creates a new one.
+
+    **Attributes:**
+        **max_entries** (int): Maximum number of objects kept.
+
+        **hits** (int): Number of responses resolved to a known object.
+
+        **evicted** (int): Number of objects dropped to stay under
+        max_entries.
+    """
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.evicted = 0
+        self._objects = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __contains__(self, uri):
+        return uri in self._objects
+
+    def get(self, uri, default=None):
+        """
+        Returns the object known for uri without making a request.
+        """
+        return self._objects.get(uri, default)
+
+    def discard(self, uri):
+        """
+        Forgets the object known for uri, if any.
+        """
+        with self._lock:
+            self._objects.pop(uri, None)
+
+    def clear(self):
+        """
+        Forgets every object.
+        """
+        with self._lock:
+            self._objects.clear()
+
+    def intern(self, obj):
+        """
+        Returns the object kept for the URI of obj, after updating it with
+        the values of obj if they are not older. Values that are None in obj,
+        as in less expanded responses, do not overwrite the kept ones. obj is
+        kept and returned if its URI was not known. Objects without a URI are
+        returned unchanged.
+        """
+        uri = getattr(obj, "uri", None)
+        if not isinstance(uri, str):
+            return obj
+        with self._lock:
+            known = self._objects.get(uri)
+            if known is None or type(known) is not type(obj):
+                self._objects[uri] = obj
+                self._objects.move_to_end(uri)
+                while len(self._objects) > self.max_entries:
+                    self._objects.popitem(last=False)
+                    self.evicted += 1
+                return obj
+            self.hits += 1
+            self._objects.move_to_end(uri)
+            if not is_older(obj, known):
+                for name in get_slots(type(obj)):
+                    value = getattr(obj, name, None)
+                    if value is not None:
+                        setattr(known, name, value)
+            return known
+
+    def intern_result(self, result):
+        """
+        Interns the result passed to a success callback: a single object or
+        the payload of a PodiumPagedResponse, updated in place. The objects
+        of a LazyPayload are interned when they are built.
+        """
+        if isinstance(result, PodiumPagedResponse):
+            if isinstance(result.payload, LazyPayload):
+                # interned as they are built, so they stay lazy
+                result.payload = result.payload.map(self.intern)
+            else:
+                result.payload = [self.intern(item) for item in result.payload]
+            return result
+        return self.intern(result)
+
+    def wrap(self, callback):
+        """
+        Returns a success callback that interns the result before calling
+        callback with it, None if callback is None.
+        """
+        if callback is None:
+            return None
+
+        def interned_callback(result, *args):
+            return callback(self.intern_result(result), *args)
+
+        return interned_callback
+
+
+def is_older(obj, known):
+    """
+    Returns True if obj holds older data than known, comparing their updated
+    timestamps when both have one.
+    """
+    updated = getattr(obj, "updated", None)
+    known_updated = getattr(known, "updated", None)
+    if updated is None or known_updated is None:
+        return False
+    try:
+        return updated < known_updated
+    except TypeError:
+        return False
@@ -2,6 +2,7 @@
 # -*- coding: utf-8 -*-
 from podium_api.asyncreq import get_json_header_token, make_request_custom_success
 from podium_api.types.lap import get_lap_from_json
+from podium_api.types.laptable import get_laptable_from_json
 from podium_api.types.paged_response import get_paged_response_from_json
 
 
@@ -150,6 +151,87 @@ def make_laps_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="laps",
+    )
+
+
+def make_laps_table_get(
+    token,
+    endpoint,
+    start=None,
+    per_page=None,
+    expand=True,
+    quiet=None,
+    success_callback=None,
+    redirect_callback=None,
+    failure_callback=None,
+    progress_callback=None,
+):
+    """
+    Request that returns a page of laps as a LapTable, with one column per
+    field and per channel aggregate instead of a PodiumLap per lap.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        endpoint (str): The endpoint to make the request too.
+
+    Kwargs:
+        expand (bool): Expand all objects in response output. Defaults to True
+
+        quiet (object): If not None HTML layout will not render endpoint
+        description. Defaults to None.
+
+        success_callback (function): Callback for a successful request,
+        will have the signature:
+            on_success(LapTable)
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'failure'. Defaults to None.
+
+        redirect_callback (function): Callback for redirect,
+        Will have the signature:
+            on_redirect(result (dict), data (dict))
+        Defaults to None.
+
+        progress_callback (function): Callback for progress updates,
+        will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None.
+
+        start (int): Starting index for events list. 0 indexed.
+
+        per_page (int): Number per page of results, max of 100.
+
+    Return:
+        UrlRequest: The request being made.
+
+    """
+    params = {}
+    if expand is not None:
+        params["expand"] = expand
+    if quiet is not None:
+        params["quiet"] = quiet
+    if start is not None:
+        params["start"] = start
+    if per_page is not None:
+        per_page = min(per_page, 100)
+        params["per_page"] = per_page
+
+    header = get_json_header_token(token)
+    return make_request_custom_success(
+        endpoint,
+        laps_table_success_handler,
+        method="GET",
+        success_callback=success_callback,
+        failure_callback=failure_callback,
+        progress_callback=progress_callback,
+        redirect_callback=redirect_callback,
+        params=params,
+        header=header,
     )
 
 
@@ -177,6 +259,30 @@ def laps_success_handler(req, results, data):
         data["success_callback"](get_paged_response_from_json(results, "laps"))
 
 
+def laps_table_success_handler(req, results, data):
+    """
+    Creates and returns a LapTable of the laps in the page to the
+    success_callback found in data if there is one.
+
+    Called automatically by **make_laps_table_get**.
+
+    Args:
+        req (UrlRequest): Instace of the request that was made.
+
+        results (dict): Dict returned by the request.
+
+        data (dict): Wildcard dict for containing data that needs to be passed
+        to the various callbacks of a request. Will contain at least a
+        'success_callback' key.
+
+    Return:
+        None, this function instead calls a callback.
+
+    """
+    if data["success_callback"] is not None:
+        data["success_callback"](get_laptable_from_json(results))
+
+
 def lap_success_handler(req, results, data):
     """
     Creates and returns a PodiumLap.
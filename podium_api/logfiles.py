@@ -1,7 +1,14 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
+
 import podium_api
-from podium_api.asyncreq import get_json_header_token, make_request_custom_success
+from podium_api.asyncreq import (
+    default_success,
+    get_json_header_token,
+    make_request_custom_success,
+)
+from podium_api.encoding import FileBody, MultipartBody, STREAM_CHUNK_SIZE
 from podium_api.types.logfile import get_logfile_from_json
 from podium_api.types.paged_response import get_paged_response_from_json
 from podium_api.types.redirect import get_redirect_from_json
@@ -139,6 +146,7 @@ def make_logfiles_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="logfiles",
     )
 
 
@@ -271,6 +279,158 @@ def make_logfile_create(
     )
 
 
+def make_logfile_file_upload(
+    upload_url,
+    path,
+    field_name="file",
+    chunk_size=STREAM_CHUNK_SIZE,
+    success_callback=None,
+    failure_callback=None,
+    progress_callback=None,
+    redirect_callback=None,
+):
+    """
+    Request that uploads the logfile at path to the presigned upload_url of
+    a PodiumLogfile returned by **make_logfile_new**. The file is POSTed as
+    multipart/form-data streamed from disk, see
+    **podium_api.encoding.FileBody**, so the memory used does not depend on
+    the size of the logfile.
+
+    Args:
+        upload_url (str): The upload_url of the PodiumLogfile.
+
+        path (str): Path of the logfile to upload.
+
+    Kwargs:
+        field_name (str): Name of the form field holding the file. Defaults
+        to 'file'.
+
+        chunk_size (int): Size of the chunks read from the file.
+
+        success_callback (function): Callback for a successful upload,
+        will have the signature:
+            on_success(result (dict), data (dict))
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'failure'. Defaults to None.
+
+        progress_callback (function): Callback for the progress of the
+        upload, will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None. UrlRequestTransport only reports the progress of
+        the response.
+
+    Return:
+        UrlRequest: The request being made.
+
+    """
+    body = MultipartBody()
+    body.add_file(field_name, FileBody(path, chunk_size=chunk_size), os.path.basename(path))
+    # the presigned url carries its own authorization
+    header = {"Content-Type": body.content_type}
+    return make_request_custom_success(
+        upload_url,
+        default_success,
+        method="POST",
+        success_callback=success_callback,
+        failure_callback=failure_callback,
+        progress_callback=progress_callback,
+        redirect_callback=redirect_callback,
+        body=body,
+        header=header,
+    )
+
+
+def make_logfile_upload(
+    token,
+    device_id,
+    path,
+    source,
+    source_ver,
+    event_id=None,
+    success_callback=None,
+    failure_callback=None,
+    progress_callback=None,
+    redirect_callback=None,
+):
+    """
+    Uploads the logfile at path: prepares the upload with
+    **make_logfile_new**, streams the file to the upload_url with
+    **make_logfile_file_upload** and registers it with
+    **make_logfile_create**, each request being made once the previous one
+    succeeded.
+
+    The uri for the newly created logfile will be provided to the
+    redirect_callback if one is provided in the form of a PodiumRedirect.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        device_id (int): The ID of the device associated with this logfile.
+
+        path (str): Path of the logfile to upload.
+
+        source (str): Source of the logfile, see **make_logfile_create**.
+
+        source_ver (str): Version of the source of the logfile.
+
+    Kwargs:
+        event_id (int): The ID of the event to associate with this logfile.
+        Defaults to None. If None, an event will be auto-selected or
+        auto-created as needed
+
+        success_callback (function): Callback for a create answered without a
+        redirect, will have the signature:
+            on_success(result (dict), data (dict))
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors of any
+        of the requests. Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'failure'. Defaults to None.
+
+        progress_callback (function): Callback for the progress of the
+        upload of the file, will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None.
+
+        redirect_callback (function): Callback for the created logfile,
+        Will have the signature:
+            on_redirect(redirect_object (PodiumRedirect))
+        Defaults to None.
+
+    Return:
+        UrlRequest: The request preparing the upload.
+
+    """
+
+    def on_new(logfile):
+        make_logfile_file_upload(
+            logfile.upload_url,
+            path,
+            success_callback=lambda result, data: on_uploaded(logfile),
+            failure_callback=failure_callback,
+            progress_callback=progress_callback,
+        )
+
+    def on_uploaded(logfile):
+        make_logfile_create(
+            token,
+            logfile.file_key,
+            logfile.eventdevice_id,
+            source,
+            source_ver,
+            success_callback=success_callback,
+            failure_callback=failure_callback,
+            redirect_callback=redirect_callback,
+        )
+
+    return make_logfile_new(token, device_id, event_id, success_callback=on_new, failure_callback=failure_callback)
+
+
 def logfile_success_handler(req, results, data):
     """
     Creates and returns a PodiumLogfile.
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Watching of the import status of uploaded logfiles. A
+**LogfileStatusWatcher** tracks any number of logfiles and refreshes their
+statuses from the pages of **make_logfiles_get**, so a scan of the first
+pages of the account updates every logfile found on them:
+
+    watcher = LogfileStatusWatcher(token, transition_callback=on_status)
+    watcher.watch(redirect.location)
+
+Each status is polled at its own interval, backing off while it does not
+change, and logfiles stop being watched once they are completed or failed.
+"""
+import threading
+import time
+
+from podium_api.logfiles import make_logfile_get, make_logfiles_get
+from podium_api.pagination import make_paged_get
+from podium_api.transport import thread_call_later
+from podium_api.types.logfile import (
+    STATUS_COMPLETED,
+    STATUS_ERROR,
+    STATUS_PROCESSING,
+    STATUS_QUEUED,
+    STATUS_UNQUEUED,
+)
+
+"""
+Seconds between the polls of a logfile in each status, before any backoff.
+Unknown statuses use the interval of STATUS_QUEUED.
+"""
+STATUS_INTERVALS = {STATUS_UNQUEUED: 10.0, STATUS_QUEUED: 10.0, STATUS_PROCESSING: 3.0}
+FINAL_STATUSES = frozenset((STATUS_COMPLETED, STATUS_ERROR))
+
+
+class WatchedLogfile(object):
+    """
+    A logfile tracked by a **LogfileStatusWatcher**.
+
+    **Attributes:**
+        **uri** (str): URI of the logfile.
+
+        **status** (int): Last status seen, None until the first poll.
+
+        **interval** (float): Seconds until the next poll.
+
+        **due** (float): Time of the next poll.
+    """
+
+    __slots__ = ("uri", "status", "interval", "due")
+
+    def __init__(self, uri, status, interval, due):
+        self.uri = uri
+        self.status = status
+        self.interval = interval
+        self.due = due
+
+
+class LogfileStatusWatcher(object):
+    """
+    Polls the status of many logfiles with as few requests as possible.
+    When a logfile is due the logfiles of the account are listed page by
+    page, every watched logfile found on a page is refreshed, and the scan
+    stops as soon as every due logfile was found or after max_pages pages.
+    Due logfiles that were not found are then fetched one by one with
+    **make_logfile_get**.
+
+    A logfile is polled every intervals[status] seconds, the interval is
+    multiplied by backoff after each poll that found the same status, up to
+    max_interval, and reset when the status changes.
+
+    **Attributes:**
+        **token** (PodiumToken): The authentication token for this session.
+
+        **transition_callback** (function): Called when the status of a
+        logfile changes, including its first status, will have the
+        signature:
+            on_transition(uri (str), old_status (int), new_status (int),
+                          logfile (PodiumLogfile))
+
+        **failure_callback** (function): Called when a poll fails, will have
+        the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+
+        **intervals** (dict): Poll interval by status. Defaults to
+        STATUS_INTERVALS.
+
+        **backoff** (float): Growth of the interval of an unchanged status.
+        Defaults to 1.5.
+
+        **max_interval** (float): Maximum poll interval. Defaults to 120.
+
+        **per_page** (int): Size of the pages scanned, max of 100.
+
+        **max_pages** (int): Maximum number of pages scanned per poll.
+        Defaults to 5.
+
+        **call_later** (function): Schedules the polls, called as
+        call_later(delay, callback) it must return an object with a cancel
+        method. Defaults to **podium_api.transport.thread_call_later**.
+
+        **requests** (int): Number of requests made.
+    """
+
+    def __init__(
+        self,
+        token,
+        transition_callback=None,
+        failure_callback=None,
+        intervals=None,
+        backoff=1.5,
+        max_interval=120.0,
+        per_page=100,
+        max_pages=5,
+        call_later=None,
+        clock=None,
+    ):
+        self.token = token
+        self.transition_callback = transition_callback
+        self.failure_callback = failure_callback
+        self.intervals = intervals if intervals is not None else STATUS_INTERVALS
+        self.backoff = backoff
+        self.max_interval = max_interval
+        self.per_page = per_page
+        self.max_pages = max_pages
+        self.call_later = call_later if call_later is not None else thread_call_later
+        self.clock = clock if clock is not None else time.monotonic
+        self.requests = 0
+        self._watched = {}
+        self._scanning = False
+        self._outstanding = 0
+        self._timer = None
+        self._timer_due = None
+        self._closed = False
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._watched)
+
+    def __contains__(self, uri):
+        return uri in self._watched
+
+    @property
+    def scanning(self):
+        """
+        True while a poll is being made.
+        """
+        return self._scanning
+
+    def get_interval(self, status):
+        """
+        Returns the initial poll interval of a logfile in status.
+        """
+        return self.intervals.get(status, self.intervals.get(STATUS_QUEUED, 10.0))
+
+    def watch(self, uri, status=None):
+        """
+        Starts watching the logfile at uri. A logfile with an unknown status
+        is polled right away.
+
+        Args:
+            uri (str): URI of the logfile, such as the location of the
+            PodiumRedirect of **make_logfile_create**.
+
+        Kwargs:
+            status (int): The current status of the logfile, if known.
+            Defaults to None.
+        """
+        now = self.clock()
+        with self._lock:
+            if uri in self._watched:
+                return
+            interval = self.get_interval(status)
+            due = now if status is None else now + interval
+            self._watched[uri] = WatchedLogfile(uri, status, interval, due)
+        self._schedule()
+
+    def unwatch(self, uri):
+        """
+        Stops watching the logfile at uri.
+        """
+        with self._lock:
+            self._watched.pop(uri, None)
+
+    def poll(self):
+        """
+        Polls every watched logfile now.
+        """
+        now = self.clock()
+        with self._lock:
+            for watched in self._watched.values():
+                watched.due = min(watched.due, now)
+        self._scan()
+
+    def stop(self):
+        """
+        Stops the polls, a poll being made finishes.
+        """
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule(self):
+        with self._lock:
+            if self._closed or self._scanning or not self._watched:
+                return
+            due = min(watched.due for watched in self._watched.values())
+            if self._timer is not None:
+                if self._timer_due <= due:
+                    return
+                self._timer.cancel()
+            self._timer_due = due
+            self._timer = self.call_later(max(due - self.clock(), 0), self._on_timer)
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self._scan()
+
+    def _scan(self):
+        now = self.clock()
+        with self._lock:
+            if self._closed or self._scanning:
+                return
+            due = set(uri for uri, watched in self._watched.items() if watched.due <= now)
+            if not due:
+                self._schedule()
+                return
+            self._scanning = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self.requests += 1
+        make_logfiles_get(
+            self.token,
+            start=0,
+            per_page=self.per_page,
+            success_callback=lambda page: self._on_page(page, 1, due),
+            failure_callback=self._on_failure,
+        )
+
+    def _on_page(self, page, pages, due):
+        for logfile in page.payload:
+            self._update(logfile.URI, logfile)
+            due.discard(logfile.URI)
+        with self._lock:
+            due.intersection_update(self._watched)
+            if due and page.next_uri is not None and pages < self.max_pages:
+                self.requests += 1
+                next_page = True
+            else:
+                next_page = False
+                self._outstanding = len(due)
+                self.requests += len(due)
+        if next_page:
+            make_paged_get(
+                self.token,
+                page.next_uri,
+                "logfiles",
+                success_callback=lambda page: self._on_page(page, pages + 1, due),
+                failure_callback=self._on_failure,
+            )
+            return
+        if not due:
+            self._finish()
+            return
+        # logfiles beyond the pages scanned are fetched on their own
+        for uri in due:
+            make_logfile_get(
+                self.token,
+                uri,
+                success_callback=lambda logfile, uri=uri: self._on_logfile(uri, logfile),
+                failure_callback=self._on_logfile_failure,
+            )
+
+    def _on_logfile(self, uri, logfile):
+        self._update(uri, logfile)
+        self._logfile_done()
+
+    def _on_logfile_failure(self, failure_type, result, data):
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, result, data)
+        self._logfile_done()
+
+    def _logfile_done(self):
+        with self._lock:
+            self._outstanding -= 1
+            finished = self._outstanding == 0
+        if finished:
+            self._finish()
+
+    def _on_failure(self, failure_type, result, data):
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, result, data)
+        self._finish()
+
+    def _finish(self):
+        now = self.clock()
+        with self._lock:
+            # logfiles the poll did not refresh wait for their next interval
+            for watched in self._watched.values():
+                if watched.due <= now:
+                    watched.due = now + watched.interval
+            self._scanning = False
+        self._schedule()
+
+    def _update(self, uri, logfile):
+        now = self.clock()
+        with self._lock:
+            watched = self._watched.get(uri)
+            if watched is None:
+                return
+            old_status = watched.status
+            changed = logfile.status != old_status
+            if changed:
+                watched.status = logfile.status
+                watched.interval = self.get_interval(logfile.status)
+                if logfile.status in FINAL_STATUSES:
+                    del self._watched[uri]
+            elif watched.due <= now:
+                watched.interval = min(watched.interval * self.backoff, self.max_interval)
+            else:
+                # refreshed early by a page scanned for other logfiles
+                return
+            watched.due = now + watched.interval
+        if changed and self.transition_callback is not None:
+            self.transition_callback(uri, old_status, logfile.status, logfile)
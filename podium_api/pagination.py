@@ -0,0 +1,525 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import asyncio
+import threading
+from collections import deque
+
+from podium_api.asyncreq import get_json_header_token, make_request_custom_success
+from podium_api.types.paged_response import get_paged_response_from_json
+
+
+def make_paged_get(
+    token,
+    endpoint,
+    payload_name,
+    success_callback=None,
+    failure_callback=None,
+    progress_callback=None,
+    redirect_callback=None,
+):
+    """
+    Request that returns a PodiumPagedResponse for any paged endpoint, such
+    as the next_uri of a PodiumPagedResponse.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        endpoint (str): The URI of the page.
+
+        payload_name (str): Name of the paged data in the response, see
+        **get_paged_response_from_json**.
+
+    Kwargs:
+        success_callback (function): Callback for a successful request,
+        will have the signature:
+            on_success(PodiumPagedResponse)
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'failure'. Defaults to None.
+
+        redirect_callback (function): Callback for redirect,
+        Will have the signature:
+            on_redirect(result (dict), data (dict))
+        Defaults to None.
+
+        progress_callback (function): Callback for progress updates,
+        will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None.
+
+    Return:
+        UrlRequest: The request being made.
+
+    """
+    header = get_json_header_token(token)
+    return make_request_custom_success(
+        endpoint,
+        paged_success_handler,
+        method="GET",
+        success_callback=success_callback,
+        failure_callback=failure_callback,
+        progress_callback=progress_callback,
+        redirect_callback=redirect_callback,
+        header=header,
+        data={"payload_name": payload_name},
+        payload_name=payload_name,
+    )
+
+
+def paged_success_handler(req, results, data):
+    """
+    Creates and returns a PodiumPagedResponse with the payload named by the
+    'payload_name' key of data to the success_callback found in data if
+    there is one.
+
+    Called automatically by **make_paged_get**.
+
+    Args:
+        req (UrlRequest): Instace of the request that was made.
+
+        results (dict): Dict returned by the request.
+
+        data (dict): Wildcard dict for containing data that needs to be passed
+        to the various callbacks of a request. Will contain at least a
+        'success_callback' and a 'payload_name' key.
+
+    Return:
+        None, this function instead calls a callback.
+
+    """
+    if data["success_callback"] is not None:
+        data["success_callback"](get_paged_response_from_json(results, data["payload_name"]))
+
+
+class PagedStream(object):
+    """
+    Walks every page of a paged request by following next_uri, handing the
+    pages to the callbacks one at a time and in order. Created by
+    **make_pages_get**.
+
+    While a page is handed to the callbacks the request for the next page is
+    already in flight, so at most two pages are held in memory at once.
+
+    **Attributes:**
+        **pages** (int): Number of pages delivered so far.
+
+        **items** (int): Number of items delivered so far.
+
+        **finished** (bool): True once the last page was delivered, the
+        stream failed or was cancelled.
+    """
+
+    def __init__(
+        self,
+        token,
+        page_callback=None,
+        item_callback=None,
+        complete_callback=None,
+        failure_callback=None,
+        prefetch=True,
+    ):
+        self.token = token
+        self.page_callback = page_callback
+        self.item_callback = item_callback
+        self.complete_callback = complete_callback
+        self.failure_callback = failure_callback
+        self.prefetch = prefetch
+        self.pages = 0
+        self.items = 0
+        self.finished = False
+        self._cancelled = False
+        self._request = None
+        self._ready = deque()
+        self._delivering = False
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Stops the stream, no more pages will be requested or delivered.
+        """
+        self._cancelled = True
+        self.finished = True
+        if self._request is not None and hasattr(self._request, "cancel"):
+            self._request.cancel()
+
+    def _request_next(self, page):
+        if page.next_uri is None or self._cancelled:
+            return
+        self._request = make_paged_get(
+            self.token,
+            page.next_uri,
+            page.payload_name,
+            success_callback=self._on_page,
+            failure_callback=self._on_failure,
+        )
+
+    def _on_page(self, page):
+        with self._lock:
+            self._ready.append(page)
+            if self._delivering:
+                # the page being delivered hands this one over when done
+                return
+            self._delivering = True
+        while True:
+            with self._lock:
+                if not self._ready or self._cancelled:
+                    self._delivering = False
+                    return
+                page = self._ready.popleft()
+            if self.prefetch:
+                self._request_next(page)
+            self._deliver(page)
+            if not self.prefetch:
+                self._request_next(page)
+            if page.next_uri is None and not self._cancelled:
+                self.finished = True
+                if self.complete_callback is not None:
+                    self.complete_callback(self.pages, self.items)
+
+    def _deliver(self, page):
+        self.pages += 1
+        self.items += len(page.payload)
+        if self.page_callback is not None:
+            self.page_callback(page)
+        if self.item_callback is not None:
+            for item in page.payload:
+                if self._cancelled:
+                    return
+                self.item_callback(item)
+
+    def _on_failure(self, failure_type, results, data):
+        if self._cancelled:
+            return
+        self.finished = True
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, results, data)
+
+
+def make_pages_get(
+    token,
+    list_func,
+    *args,
+    page_callback=None,
+    item_callback=None,
+    complete_callback=None,
+    failure_callback=None,
+    prefetch=True,
+    **kwargs
+):
+    """
+    Requests every page of a paged list, following the next_uri of each
+    PodiumPagedResponse until the last page.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        list_func (function): The make_*_get function for the first page, for
+        example make_laps_get. Any other args and kwargs are passed to it.
+
+    Kwargs:
+        page_callback (function): Called with each page, in order:
+            on_page(PodiumPagedResponse)
+        Defaults to None.
+
+        item_callback (function): Called with each item of each page, in
+        order:
+            on_item(item)
+        Defaults to None.
+
+        complete_callback (function): Called once after the last page:
+            on_complete(pages (int), items (int))
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors, the
+        stream stops after a failure. Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Defaults to None.
+
+        prefetch (bool): Request the next page before the current one is
+        handed to the callbacks. Defaults to True.
+
+    Return:
+        PagedStream: The stream, can be used to cancel it.
+
+    """
+    stream = PagedStream(
+        token,
+        page_callback=page_callback,
+        item_callback=item_callback,
+        complete_callback=complete_callback,
+        failure_callback=failure_callback,
+        prefetch=prefetch,
+    )
+    stream._request = list_func(
+        token, *args, success_callback=stream._on_page, failure_callback=stream._on_failure, **kwargs
+    )
+    return stream
+
+
+async def follow_pages(page, fetch_page, prefetch=True):
+    """
+    Async generator yielding page and every page after it by following
+    next_uri.
+
+    Args:
+        page (PodiumPagedResponse): The first page.
+
+        fetch_page (function): Coroutine function called as
+        fetch_page(uri, payload_name) returning the PodiumPagedResponse at uri.
+
+    Kwargs:
+        prefetch (bool): Start fetching the next page before yielding the
+        current one. Defaults to True.
+    """
+    next_page = None
+    try:
+        while page is not None:
+            if page.next_uri is not None and prefetch:
+                next_page = asyncio.ensure_future(fetch_page(page.next_uri, page.payload_name))
+            yield page
+            if page.next_uri is None:
+                return
+            if next_page is None:
+                next_page = asyncio.ensure_future(fetch_page(page.next_uri, page.payload_name))
+            page = await next_page
+            next_page = None
+    finally:
+        if next_page is not None and not next_page.done():
+            next_page.cancel()
+
+
+class BulkFetch(object):
+    """
+    Fetches a whole paged list by splitting it into start/per_page windows
+    once the first page reports the total, and requesting the remaining
+    windows concurrently. Pages are handed to the callbacks in order.
+    Created by **make_bulk_get**.
+
+    **Attributes:**
+        **total** (int): Total reported by the first page, None until it
+        arrived.
+
+        **items** (list): Every item fetched so far, in order.
+
+        **finished** (bool): True once every page was delivered, the fetch
+        failed or was cancelled.
+    """
+
+    def __init__(
+        self,
+        token,
+        list_func,
+        args,
+        kwargs,
+        start=0,
+        per_page=100,
+        concurrency=4,
+        page_callback=None,
+        success_callback=None,
+        failure_callback=None,
+    ):
+        self.token = token
+        self.list_func = list_func
+        self.args = args
+        self.kwargs = kwargs
+        self.start = start
+        self.per_page = min(per_page, 100)
+        self.concurrency = max(concurrency, 1)
+        self.page_callback = page_callback
+        self.success_callback = success_callback
+        self.failure_callback = failure_callback
+        self.total = None
+        self.items = []
+        self.finished = False
+        self._cancelled = False
+        self._windows = deque()
+        self._requests = {}
+        self._pages = {}
+        self._next_delivery = start
+        self._delivering = False
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """
+        Stops the fetch and cancels the requests in flight.
+        """
+        self._cancelled = True
+        self.finished = True
+        with self._lock:
+            requests = list(self._requests.values())
+            self._requests = {}
+        for req in requests:
+            if hasattr(req, "cancel"):
+                req.cancel()
+
+    def _request_window(self, window_start):
+        req = self.list_func(
+            self.token,
+            *self.args,
+            start=window_start,
+            per_page=self.per_page,
+            success_callback=lambda page: self._on_page(window_start, page),
+            failure_callback=self._on_failure,
+            **self.kwargs
+        )
+        with self._lock:
+            # the page may already have arrived when dispatched inline
+            if window_start in self._requests:
+                self._requests[window_start] = req
+
+    def _on_page(self, window_start, page):
+        if self._cancelled:
+            return
+        with self._lock:
+            self._requests.pop(window_start, None)
+            self._pages[window_start] = page
+            if self.total is None:
+                self.total = page.total
+                self._windows.extend(range(self.start + self.per_page, page.total, self.per_page))
+            to_request = []
+            while self._windows and len(self._requests) + len(to_request) < self.concurrency:
+                to_request.append(self._windows.popleft())
+            # reserve the slots before the requests exist
+            for next_start in to_request:
+                self._requests[next_start] = None
+        for next_start in to_request:
+            self._request_window(next_start)
+        self._deliver()
+
+    def _deliver(self):
+        with self._lock:
+            if self._delivering:
+                return
+            self._delivering = True
+        while True:
+            with self._lock:
+                page = self._pages.pop(self._next_delivery, None)
+                if page is None or self._cancelled:
+                    self._delivering = False
+                    done = self._next_delivery >= self.total and not self.finished
+                    if done:
+                        self.finished = True
+                    break
+                self._next_delivery += self.per_page
+            self.items.extend(page.payload)
+            if self.page_callback is not None:
+                self.page_callback(page)
+        if done:
+            if self.success_callback is not None:
+                self.success_callback(self.items)
+
+    def _on_failure(self, failure_type, results, data):
+        if self._cancelled:
+            return
+        self.cancel()
+        if self.failure_callback is not None:
+            self.failure_callback(failure_type, results, data)
+
+
+def make_bulk_get(
+    token,
+    list_func,
+    *args,
+    start=0,
+    per_page=100,
+    concurrency=4,
+    page_callback=None,
+    success_callback=None,
+    failure_callback=None,
+    **kwargs
+):
+    """
+    Requests every item of a paged list. The first page tells the total,
+    the remaining start/per_page windows are then requested concurrently,
+    at most concurrency at a time, instead of one after the other.
+
+    Args:
+        token (PodiumToken): The authentication token for this session.
+
+        list_func (function): The make_*_get function of the list, it must
+        accept start and per_page kwargs, for example make_laps_get. Any
+        other args and kwargs are passed to it.
+
+    Kwargs:
+        start (int): Index of the first item. Defaults to 0.
+
+        per_page (int): Size of the windows, max of 100. Defaults to 100.
+
+        concurrency (int): Maximum number of windows requested at once.
+        Defaults to 4.
+
+        page_callback (function): Called with each page, in order:
+            on_page(PodiumPagedResponse)
+        Defaults to None.
+
+        success_callback (function): Called once with every item, in order:
+            on_success(items (list))
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors, the
+        remaining requests are cancelled after a failure. Will have the
+        signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Defaults to None.
+
+    Return:
+        BulkFetch: The fetch, can be used to cancel it.
+
+    """
+    fetch = BulkFetch(
+        token,
+        list_func,
+        args,
+        kwargs,
+        start=start,
+        per_page=per_page,
+        concurrency=concurrency,
+        page_callback=page_callback,
+        success_callback=success_callback,
+        failure_callback=failure_callback,
+    )
+    fetch._requests[start] = None
+    fetch._request_window(start)
+    return fetch
+
+
+async def gather_windows(fetch_window, start=0, per_page=100, concurrency=4):
+    """
+    Fetches every page of a paged list with the asyncio API: the first
+    window tells the total, the remaining windows are fetched concurrently,
+    at most concurrency at a time.
+
+    Args:
+        fetch_window (function): Coroutine function called as
+        fetch_window(start, per_page) returning a PodiumPagedResponse.
+
+    Kwargs:
+        start (int): Index of the first item. Defaults to 0.
+
+        per_page (int): Size of the windows, max of 100. Defaults to 100.
+
+        concurrency (int): Maximum number of windows fetched at once.
+        Defaults to 4.
+
+    Return:
+        list: The PodiumPagedResponse of every window, in order.
+    """
+    per_page = min(per_page, 100)
+    first = await fetch_window(start, per_page)
+    semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+    async def fetch(window_start):
+        async with semaphore:
+            return await fetch_window(window_start, per_page)
+
+    tasks = [asyncio.ensure_future(fetch(s)) for s in range(start + per_page, first.total, per_page)]
+    try:
+        rest = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    return [first] + list(rest)
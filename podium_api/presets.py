@@ -389,6 +389,7 @@ def make_presets_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        payload_name="presets",
     )
 
 
@@ -1,10 +1,152 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import threading
+
 import podium_api
-from podium_api.asyncreq import get_json_header_token, make_request_custom_success
+from podium_api.asyncreq import (
+    default_success,
+    get_json_header_token,
+    make_request_custom_success,
+)
+from podium_api.encoding import FormSchema, JSON_CONTENT_TYPE
 from podium_api.types.racestat import get_racestat_from_json
 from podium_api.types.redirect import get_redirect_from_json
 
+RACESTATS_SCHEMA = FormSchema(
+    "racestat",
+    (
+        "device_id",
+        "comp_number",
+        "comp_class",
+        "total_laps",
+        "last_lap_time",
+        "position_overall",
+        "position_in_class",
+        "comp_number_ahead",
+        "comp_number_behind",
+        "gap_to_ahead",
+        "gap_to_behind",
+        "laps_to_ahead",
+        "laps_to_behind",
+        "fc_flag",
+        "comp_flag",
+    ),
+)
+
+RACESTAT_FIELDS = RACESTATS_SCHEMA.fields[1:]
+
+
+class RacestatTracker(object):
+    """
+    Remembers the racestat fields last sent for each (event_id, device_id),
+    so uploads that change nothing can be skipped and, optionally, only the
+    changed fields sent. Pass it as the tracker kwarg of
+    **make_racestat_create**, **make_racestats_create** or
+    **podium_api.batching.RacestatBatcher**.
+
+    A racestat counts as sent as soon as its request is made, if the request
+    fails its fields are forgotten so the next update sends them again.
+
+    **Attributes:**
+        **suppressed** (int): Number of racestats skipped because none of
+        their fields changed.
+    """
+
+    def __init__(self):
+        self.suppressed = 0
+        self._sent = {}
+        self._lock = threading.Lock()
+
+    def changed_fields(self, event_id, racestat):
+        """
+        Returns the fields of racestat that differ from the ones last sent
+        for its device.
+
+        Args:
+            event_id (int): The id of the event.
+
+            racestat (dict): The device_id and the racestat fields.
+
+        Return:
+            dict: The changed fields and their values, empty if nothing
+            changed.
+        """
+        previous = self._sent.get((event_id, racestat["device_id"]), {})
+        return dict(
+            (field, racestat[field])
+            for field in RACESTAT_FIELDS
+            if field in racestat and (field not in previous or previous[field] != racestat[field])
+        )
+
+    def prepare(self, event_id, racestat, changed_only=False):
+        """
+        Returns what to send for racestat and records it as sent.
+
+        Args:
+            event_id (int): The id of the event.
+
+            racestat (dict): The device_id and the racestat fields.
+
+        Kwargs:
+            changed_only (bool): If True only the device_id and the changed
+            fields are returned. Defaults to False.
+
+        Return:
+            dict: The racestat to send, None if nothing changed.
+        """
+        key = (event_id, racestat["device_id"])
+        with self._lock:
+            changed = self.changed_fields(event_id, racestat)
+            if not changed:
+                self.suppressed += 1
+                return None
+            state = self._sent.setdefault(key, {})
+            state.update(changed)
+        if changed_only:
+            changed["device_id"] = racestat["device_id"]
+            return changed
+        return racestat
+
+    def revert(self, event_id, racestat):
+        """
+        Forgets the fields of a racestat whose upload failed, unless a newer
+        value was sent since.
+        """
+        with self._lock:
+            state = self._sent.get((event_id, racestat["device_id"]))
+            if state is None:
+                return
+            for field in RACESTAT_FIELDS:
+                if field in racestat and field in state and state[field] == racestat[field]:
+                    del state[field]
+
+    def forget(self, event_id, device_id=None):
+        """
+        Forgets what was sent for a device of the event, or for every device
+        of the event if device_id is None.
+        """
+        with self._lock:
+            if device_id is not None:
+                self._sent.pop((event_id, device_id), None)
+            else:
+                for key in [key for key in self._sent if key[0] == event_id]:
+                    del self._sent[key]
+
+
+def revert_on_failure(tracker, event_id, racestats, failure_callback):
+    """
+    Returns a failure callback that reverts racestats in tracker and then
+    calls failure_callback.
+    """
+
+    def on_failure(failure_type, results, data):
+        for racestat in racestats:
+            tracker.revert(event_id, racestat)
+        if failure_callback is not None:
+            failure_callback(failure_type, results, data)
+
+    return on_failure
+
 
 def make_racestat_get(
     token,
@@ -80,6 +222,9 @@ def make_racestats_create(
     failure_callback=None,
     progress_callback=None,
     redirect_callback=None,
+    json_body=False,
+    tracker=None,
+    changed_only=False,
 ):
     """
     add a collection of racestats to the specified event id
@@ -87,33 +232,62 @@ def make_racestats_create(
         token (PodiumToken): The authentication token for this session
 
         event_id: The id of the event to apply racestats
+
+        racestats (list): Dicts with the device_id and the racestat fields
+        of each device, see **make_racestat_create**.
+
+    Kwargs:
+        success_callback (function): Callback for a successful request,
+        will have the signature:
+            on_success(result (dict), data (dict))
+        Defaults to None.
+
+        failure_callback (function): Callback for failures and errors.
+        Will have the signature:
+            on_failure(failure_type (string), result (dict), data (dict))
+        Values for failure type are: 'error', 'failure'. Defaults to None.
+
+        redirect_callback (function): Callback for redirect,
+        Will have the signature:
+            on_redirect(redirect_object (PodiumRedirect))
+        Defaults to None.
+
+        progress_callback (function): Callback for progress updates,
+        will have the signature:
+            on_progress(current_size (int), total_size (int), data (dict))
+        Defaults to None.
+
+        json_body (bool): If True the racestats are posted as a JSON body
+        instead of a form. Defaults to False.
+
+        tracker (RacestatTracker): If provided racestats that did not change
+        since they were last sent are left out. Defaults to None.
+
+        changed_only (bool): If True and a tracker is provided only the
+        changed fields of each racestat are sent. Defaults to False.
+
+    Return:
+        UrlRequest: The request being made, None if a tracker is provided
+        and no racestat changed.
     """
     endpoint = "{}/api/v1/events/{}/racestats".format(podium_api.PODIUM_APP.podium_url, event_id)
 
-    index = 0
-    body = {}
-    for racestat in racestats:
-        body[f"racestat[{index}][device_id]"] = racestat["device_id"]
-        body[f"racestat[{index}][comp_number]"] = racestat["comp_number"]
-        body[f"racestat[{index}][comp_class]"] = racestat["comp_class"]
-        body[f"racestat[{index}][total_laps]"] = racestat["total_laps"]
-        body[f"racestat[{index}][last_lap_time]"] = racestat["last_lap_time"]
-        body[f"racestat[{index}][position_overall]"] = racestat["position_overall"]
-        body[f"racestat[{index}][position_in_class]"] = racestat["position_in_class"]
-        body[f"racestat[{index}][comp_number_ahead]"] = racestat["comp_number_ahead"]
-        body[f"racestat[{index}][comp_number_behind]"] = racestat["comp_number_behind"]
-        body[f"racestat[{index}][gap_to_ahead]"] = racestat["gap_to_ahead"]
-        body[f"racestat[{index}][gap_to_behind]"] = racestat["gap_to_behind"]
-        body[f"racestat[{index}][laps_to_ahead]"] = racestat["laps_to_ahead"]
-        body[f"racestat[{index}][laps_to_behind]"] = racestat["laps_to_behind"]
-        body[f"racestat[{index}][fc_flag]"] = racestat["fc_flag"]
-        body[f"racestat[{index}][comp_flag]"] = racestat["comp_flag"]
-        index += 1
-
     header = get_json_header_token(token)
+    if tracker is not None:
+        racestats = [tracker.prepare(event_id, racestat, changed_only) for racestat in racestats]
+        racestats = [racestat for racestat in racestats if racestat is not None]
+        if not racestats:
+            return None
+        failure_callback = revert_on_failure(tracker, event_id, racestats, failure_callback)
+    partial = tracker is not None and changed_only
+    if json_body:
+        body = RACESTATS_SCHEMA.encode_json(racestats, partial=partial)
+        header = dict(header, **{"Content-Type": JSON_CONTENT_TYPE})
+    else:
+        body = RACESTATS_SCHEMA.encode(racestats, partial=partial)
     return make_request_custom_success(
         endpoint,
-        None,
+        default_success,
         method="POST",
         success_callback=success_callback,
         redirect_callback=create_racestat_redirect_handler,
@@ -147,6 +321,8 @@ def make_racestat_create(
     failure_callback=None,
     progress_callback=None,
     redirect_callback=None,
+    tracker=None,
+    changed_only=False,
 ):
     """
     add a racestat for the specified event_id / device_id
@@ -178,28 +354,43 @@ def make_racestat_create(
             on_progress(current_size (int), total_size (int), data (dict))
         Defaults to None.
 
+        tracker (RacestatTracker): If provided no request is made when no
+        field changed since the racestat of the device was last sent.
+        Defaults to None.
+
+        changed_only (bool): If True and a tracker is provided only the
+        changed fields are sent. Defaults to False.
+
     Return:
-        UrlRequest: The request being made.
+        UrlRequest: The request being made, None if a tracker is provided
+        and nothing changed.
 
     """
 
     endpoint = "{}/api/v1/events/{}/devices/{}/racestat".format(podium_api.PODIUM_APP.podium_url, event_id, device_id)
-    body = {
-        "racestat[comp_number]": comp_number,
-        "racestat[comp_class]": comp_class,
-        "racestat[total_laps]": total_laps,
-        "racestat[last_lap_time]": last_lap_time,
-        "racestat[position_overall]": position_overall,
-        "racestat[position_in_class]": position_in_class,
-        "racestat[comp_number_ahead]": comp_number_ahead,
-        "racestat[comp_number_behind]": comp_number_behind,
-        "racestat[gap_to_ahead]": gap_to_ahead,
-        "racestat[gap_to_behind]": gap_to_behind,
-        "racestat[laps_to_ahead]": laps_to_ahead,
-        "racestat[laps_to_behind]": laps_to_behind,
-        "racestat[fc_flag]": fc_flag,
-        "racestat[comp_flag]": comp_flag,
+    racestat = {
+        "device_id": device_id,
+        "comp_number": comp_number,
+        "comp_class": comp_class,
+        "total_laps": total_laps,
+        "last_lap_time": last_lap_time,
+        "position_overall": position_overall,
+        "position_in_class": position_in_class,
+        "comp_number_ahead": comp_number_ahead,
+        "comp_number_behind": comp_number_behind,
+        "gap_to_ahead": gap_to_ahead,
+        "gap_to_behind": gap_to_behind,
+        "laps_to_ahead": laps_to_ahead,
+        "laps_to_behind": laps_to_behind,
+        "fc_flag": fc_flag,
+        "comp_flag": comp_flag,
     }
+    if tracker is not None:
+        racestat = tracker.prepare(event_id, racestat, changed_only)
+        if racestat is None:
+            return None
+        failure_callback = revert_on_failure(tracker, event_id, [racestat], failure_callback)
+    body = dict(("racestat[{}]".format(field), racestat[field]) for field in RACESTAT_FIELDS if field in racestat)
     header = get_json_header_token(token)
     return make_request_custom_success(
         endpoint,
@@ -0,0 +1,269 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Refresh of the OAuth2 token of a session, wrap the transport used by
+**podium_api.asyncreq.make_request** and register it:
+
+    podium_api.register_podium_transport(TokenRefreshTransport(token))
+
+The token is refreshed with its refresh_token shortly before it expires,
+and requests answered with a 401 Unauthorized are replayed once with the
+refreshed token instead of failing.
+"""
+import threading
+import time
+from collections import deque
+
+from podium_api.asyncreq import CURRENT_TRANSPORT
+from podium_api.login import make_token_refresh_post
+from podium_api.transport import WrappedTransport
+
+CALLBACK_NAMES = ("on_success", "on_failure", "on_error", "on_redirect", "on_progress")
+
+
+class PendingRequest(object):
+    """
+    A request made through a **TokenRefreshTransport**, kept until it is
+    answered with something else than a 401.
+
+    **Attributes:**
+        **req** (LocalRequest): The request returned to the caller.
+
+        **callbacks** (dict): The on_* callbacks of the caller keyed by name.
+
+        **replayed** (bool): True once the request was replayed after a 401,
+        it is not replayed twice.
+
+        **unauthorized** (tuple): (request, result) of the 401 answer, given
+        to the failure callback if the token cannot be refreshed.
+    """
+
+    __slots__ = ("req", "url", "method", "body", "headers", "callbacks", "replayed", "unauthorized")
+
+    def __init__(self, req, url, method, body, headers, callbacks):
+        self.req = req
+        self.url = url
+        self.method = method
+        self.body = body
+        self.headers = headers
+        self.callbacks = callbacks
+        self.replayed = False
+        self.unauthorized = None
+
+
+class TokenRefreshTransport(WrappedTransport):
+    """
+    Transport that keeps the PodiumToken of a session valid. Requests
+    authorized with the token are handled as follows:
+
+    * once the token is within refresh_margin seconds of its expiry it is
+      refreshed in the background, requests keep using it meanwhile;
+    * once the token expired, or a request was answered with a 401,
+      requests wait for the refresh and are then sent with the new token;
+    * a request answered with a 401 is replayed once with the new token.
+
+    After a failed refresh no other refresh is made before the token expires
+    or a request is answered with a 401.
+
+    A single refresh is made at a time, shared by every waiting request.
+    The token object is updated in place, so requests made afterwards by
+    the callers holding it use the new token. Requests authorized
+    otherwise, such as the login, pass through.
+
+    Every caller receives a LocalRequest answered with the response of the
+    last attempt of its request.
+
+    **Attributes:**
+        **token** (PodiumToken): The token to keep valid.
+
+        **refresh_margin** (float): Seconds before the expiry the token is
+        refreshed at. Defaults to 60.
+
+        **refreshes** (int): Number of refreshes made.
+
+        **replayed** (int): Number of requests replayed after a 401.
+
+        **clock** (function): Returns the current time, time.time by
+        default.
+    """
+
+    def __init__(self, token, inner=None, refresh_margin=60, dispatch=None, clock=None):
+        super(TokenRefreshTransport, self).__init__(inner, dispatch=dispatch)
+        self.token = token
+        self.refresh_margin = refresh_margin
+        self.clock = clock if clock is not None else time.time
+        self.refreshes = 0
+        self.replayed = 0
+        self._refreshing = False
+        # True while requests must wait for the refresh to be sent
+        self._blocking = False
+        self._waiting = []
+        # True after a failed refresh, until a refresh succeeds
+        self._refresh_failed = False
+        # values of the token before its last refreshes, requests built with
+        # them are still ours
+        self._previous_tokens = deque(maxlen=2)
+        self._lock = threading.Lock()
+
+    def _owns(self, headers):
+        authorization = (headers or {}).get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            return False
+        value = authorization[7:]
+        return value == self.token.token or value in self._previous_tokens
+
+    def _expires_in(self):
+        expires_at = self.token.expires_at
+        if expires_at is None or self.token.refresh_token is None:
+            return None
+        return expires_at - self.clock()
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        if not self._owns(headers):
+            return super(TokenRefreshTransport, self).request(
+                url,
+                method=method,
+                body=body,
+                headers=headers,
+                on_success=on_success,
+                on_failure=on_failure,
+                on_error=on_error,
+                on_redirect=on_redirect,
+                on_progress=on_progress,
+            )
+        callbacks = dict(zip(CALLBACK_NAMES, (on_success, on_failure, on_error, on_redirect, on_progress)))
+        pending = PendingRequest(self.local_request(url, method, body, headers), url, method, body, headers, callbacks)
+        expires_in = self._expires_in()
+        with self._lock:
+            if expires_in is not None and expires_in <= 0:
+                self._blocking = True
+            wait = self._blocking
+            if wait:
+                self._waiting.append(pending)
+            start = (
+                not self._refreshing
+                and expires_in is not None
+                and (expires_in <= 0 or (expires_in <= self.refresh_margin and not self._refresh_failed))
+            )
+            if start:
+                self._refreshing = True
+        if not wait:
+            self._send(pending)
+        if start:
+            self._refresh()
+        return pending.req
+
+    def _send(self, pending):
+        headers = pending.headers
+        authorization = self.token.json_header["Authorization"]
+        if headers.get("Authorization") != authorization:
+            headers = dict(headers)
+            headers["Authorization"] = authorization
+        sent_token = self.token.token
+        self.inner.request(
+            pending.url,
+            method=pending.method,
+            body=pending.body,
+            headers=headers,
+            on_success=lambda req, result: self._complete(pending, "on_success", req, result),
+            on_failure=lambda req, result: self._on_failure(pending, sent_token, req, result),
+            on_error=lambda req, error: self._complete(pending, "on_error", req, error),
+            on_redirect=lambda req, result: self._complete(pending, "on_redirect", req, result),
+            on_progress=lambda req, current, total: self._progress(pending, current, total),
+        )
+
+    def _complete(self, pending, name, inner_req, result):
+        if name == "on_error":
+            pending.req._error = result
+        self.complete_local(
+            pending.req,
+            getattr(inner_req, "resp_status", None),
+            getattr(inner_req, "resp_headers", None),
+            result,
+            pending.callbacks[name],
+            result,
+            now=True,
+        )
+
+    def _progress(self, pending, current, total):
+        on_progress = pending.callbacks["on_progress"]
+        if on_progress is not None and not pending.req.cancelled:
+            on_progress(pending.req, current, total)
+
+    def _on_failure(self, pending, sent_token, inner_req, result):
+        if (
+            getattr(inner_req, "resp_status", None) != 401
+            or pending.replayed
+            or self.token.refresh_token is None
+            or pending.req.cancelled
+        ):
+            self._complete(pending, "on_failure", inner_req, result)
+            return
+        pending.replayed = True
+        pending.unauthorized = (inner_req, result)
+        with self._lock:
+            self.replayed += 1
+            refreshed = sent_token != self.token.token
+            if not refreshed:
+                # requests made from now on wait for the new token
+                self._blocking = True
+                self._waiting.append(pending)
+                start = not self._refreshing
+                self._refreshing = True
+        if refreshed:
+            self._send(pending)
+        elif start:
+            self._refresh()
+
+    def _refresh(self):
+        self.refreshes += 1
+        # the refresh goes straight to the inner transport, whatever the
+        # transport of the current context is
+        context_token = CURRENT_TRANSPORT.set(self.inner)
+        try:
+            make_token_refresh_post(
+                self.token,
+                success_callback=self._on_refreshed,
+                failure_callback=self._on_refresh_failed,
+                redirect_callback=lambda *args: self._on_refresh_failed("redirect", None, None),
+            )
+        except Exception as error:
+            self._on_refresh_failed("error", error, None)
+        finally:
+            CURRENT_TRANSPORT.reset(context_token)
+
+    def _take_waiting(self, failed):
+        with self._lock:
+            self._refresh_failed = failed
+            waiting = self._waiting
+            self._waiting = []
+            self._refreshing = False
+            self._blocking = False
+        return waiting
+
+    def _on_refreshed(self, token):
+        with self._lock:
+            self._previous_tokens.append(self.token.token)
+            self.token.update(token)
+        for pending in self._take_waiting(False):
+            self._send(pending)
+
+    def _on_refresh_failed(self, failure_type, result, data):
+        for pending in self._take_waiting(True):
+            if pending.unauthorized is not None:
+                self._complete(pending, "on_failure", *pending.unauthorized)
+            elif failure_type == "error":
+                self._complete(pending, "on_error", None, result)
+            else:
+                self._complete(pending, "on_failure", None, result)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Retries of failed requests, wrap the transport used by
+**podium_api.asyncreq.make_request** and register it:
+
+    podium_api.register_podium_transport(RetryTransport(policy=RetryPolicy(max_retries=5)))
+
+Idempotent requests that fail with a connection error or a status such as
+503 are sent again after an exponential, jittered backoff. A
+**RetryBudget** shared by every request bounds the retries to a fraction of
+the requests, so retries cannot multiply the load on a server that is down.
+"""
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+from podium_api.transport import (
+    AsyncLocalRequest,
+    IDEMPOTENT_METHODS,
+    thread_call_later,
+    WrappedTransport,
+)
+
+RETRY_STATUSES = frozenset((408, 425, 429, 500, 502, 503, 504))
+
+
+def parse_retry_after(value, now=None):
+    """
+    Returns the seconds to wait given by a Retry-After header, either a
+    number of seconds or an HTTP date, None if value is missing or invalid.
+    """
+    if value is None:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date is None:
+        return None
+    now = time.time() if now is None else now
+    return max(date.timestamp() - now, 0.0)
+
+
+class RetryPolicy(object):
+    """
+    Decides which requests are retried and how long to wait before each
+    retry. The n-th retry waits a random time between 0 and
+    min(max_backoff, backoff * 2 ** (n - 1)) seconds ("full jitter"), or
+    the time asked for by a Retry-After header.
+
+    **Attributes:**
+        **max_retries** (int): Maximum number of retries of a request.
+        Defaults to 3.
+
+        **backoff** (float): Base delay in seconds. Defaults to 0.5.
+
+        **max_backoff** (float): Maximum delay in seconds, a Retry-After
+        asking for longer stops the retries. Defaults to 30.
+
+        **jitter** (bool): If False the full delay is waited every time.
+        Defaults to True.
+
+        **methods** (frozenset): Methods that are retried. Defaults to the
+        idempotent methods, other methods could be applied twice.
+
+        **statuses** (frozenset): Response statuses that are retried.
+        Defaults to 408, 425, 429, 500, 502, 503 and 504.
+
+        **retry_errors** (bool): If True connection errors are retried.
+        Defaults to True.
+
+        **random** (function): Returns a float in [0, 1) for the jitter.
+        Defaults to random.random.
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff=0.5,
+        max_backoff=30.0,
+        jitter=True,
+        methods=IDEMPOTENT_METHODS,
+        statuses=RETRY_STATUSES,
+        retry_errors=True,
+        random=random.random,
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.methods = frozenset(methods)
+        self.statuses = frozenset(statuses)
+        self.retry_errors = retry_errors
+        self.random = random
+
+    def should_retry(self, method, status, retries):
+        """
+        Returns True if a request with method that failed with status, None
+        for a connection error, after retries retries can be retried.
+        """
+        if retries >= self.max_retries or (method or "GET") not in self.methods:
+            return False
+        if status is None:
+            return self.retry_errors
+        return status in self.statuses
+
+    def get_delay(self, retries, retry_after=None):
+        """
+        Returns the seconds to wait before retry number retries + 1, None if
+        the Retry-After asks for longer than max_backoff.
+        """
+        if retry_after is not None:
+            return retry_after if retry_after <= self.max_backoff else None
+        delay = min(self.max_backoff, self.backoff * (2**retries))
+        return delay * self.random() if self.jitter else delay
+
+
+class RetryBudget(object):
+    """
+    Token bucket limiting retries to a fraction of the requests. Every
+    request adds ratio tokens, up to max_tokens, and every retry takes one.
+    Once empty, failures are returned to the callers until enough requests
+    went through, so an outage does not turn every request into
+    max_retries + 1 requests.
+
+    **Attributes:**
+        **ratio** (float): Retries allowed per request. Defaults to 0.1.
+
+        **max_tokens** (float): Maximum number of retries saved up, also the
+        initial number. Defaults to 10.
+    """
+
+    def __init__(self, ratio=0.1, max_tokens=10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = float(max_tokens)
+        self._lock = threading.Lock()
+
+    @property
+    def tokens(self):
+        return self._tokens
+
+    def deposit(self):
+        """
+        Records a request.
+        """
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self):
+        """
+        Takes a token for a retry.
+
+        Return:
+            bool: False if the budget is exhausted.
+        """
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+class RetryRequest(object):
+    """
+    A request made through a **RetryTransport** and the state of its
+    attempts.
+    """
+
+    __slots__ = ("req", "url", "method", "body", "headers", "callbacks", "retries")
+
+    def __init__(self, req, url, method, body, headers, callbacks):
+        self.req = req
+        self.url = url
+        self.method = method
+        self.body = body
+        self.headers = headers
+        self.callbacks = callbacks
+        self.retries = 0
+
+
+class RetryTransport(WrappedTransport):
+    """
+    Transport that retries the requests failing with a connection error or
+    a retryable status, as decided by its **RetryPolicy** and allowed by its
+    **RetryBudget**. The callbacks of the caller only see the last attempt:
+    a success, or the failure that could not be retried.
+
+    Every caller receives a LocalRequest answered with the response of the
+    last attempt, cancelling it stops the retries.
+
+    **Attributes:**
+        **policy** (RetryPolicy): Defaults to RetryPolicy().
+
+        **budget** (RetryBudget): Shared by every request of the transport,
+        pass the same budget to several transports to share it. Defaults to
+        RetryBudget().
+
+        **call_later** (function): Schedules the retries, called as
+        call_later(delay, callback) it must return an object with a cancel
+        method. Defaults to **podium_api.transport.thread_call_later**,
+        requests made from an asyncio event loop are retried on the loop.
+
+        **retries** (int): Number of retries made.
+
+        **exhausted** (int): Number of failures returned because the budget
+        was exhausted.
+    """
+
+    def __init__(self, inner=None, policy=None, budget=None, call_later=None, dispatch=None):
+        super(RetryTransport, self).__init__(inner, dispatch=dispatch)
+        self.policy = policy if policy is not None else RetryPolicy()
+        self.budget = budget if budget is not None else RetryBudget()
+        self.call_later = call_later if call_later is not None else thread_call_later
+        self.retries = 0
+        self.exhausted = 0
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        callbacks = {
+            "on_success": on_success,
+            "on_failure": on_failure,
+            "on_error": on_error,
+            "on_redirect": on_redirect,
+            "on_progress": on_progress,
+        }
+        attempt = RetryRequest(self.local_request(url, method, body, headers), url, method, body, headers, callbacks)
+        self.budget.deposit()
+        self._send(attempt)
+        return attempt.req
+
+    def _send(self, attempt):
+        if attempt.req.cancelled:
+            return
+        try:
+            self.inner.request(
+                attempt.url,
+                method=attempt.method,
+                body=attempt.body,
+                headers=attempt.headers,
+                on_success=lambda req, result: self._complete(attempt, "on_success", req, result),
+                on_failure=lambda req, result: self._on_failure(attempt, "on_failure", req, result),
+                on_error=lambda req, error: self._on_failure(attempt, "on_error", req, error),
+                on_redirect=lambda req, result: self._complete(attempt, "on_redirect", req, result),
+                on_progress=lambda req, current, total: self._progress(attempt, current, total),
+            )
+        except Exception as error:
+            if attempt.retries == 0:
+                raise
+            # a retry runs outside of the caller, report it like any error
+            self._complete(attempt, "on_error", None, error)
+
+    def _complete(self, attempt, name, inner_req, result):
+        if name == "on_error":
+            attempt.req._error = result
+        self.complete_local(
+            attempt.req,
+            getattr(inner_req, "resp_status", None),
+            getattr(inner_req, "resp_headers", None),
+            result,
+            attempt.callbacks[name],
+            result,
+            now=True,
+        )
+
+    def _progress(self, attempt, current, total):
+        on_progress = attempt.callbacks["on_progress"]
+        if on_progress is not None and not attempt.req.cancelled:
+            on_progress(attempt.req, current, total)
+
+    def _on_failure(self, attempt, name, inner_req, result):
+        status = getattr(inner_req, "resp_status", None) if name == "on_failure" else None
+        delay = None
+        if not attempt.req.cancelled and self.policy.should_retry(attempt.method, status, attempt.retries):
+            headers = getattr(inner_req, "resp_headers", None) or {}
+            retry_after = None
+            for key, value in headers.items():
+                if key.lower() == "retry-after":
+                    retry_after = parse_retry_after(value)
+            delay = self.policy.get_delay(attempt.retries, retry_after)
+        if delay is not None and not self.budget.withdraw():
+            self.exhausted += 1
+            delay = None
+        if delay is None:
+            self._complete(attempt, name, inner_req, result)
+            return
+        attempt.retries += 1
+        self.retries += 1
+        if isinstance(attempt.req, AsyncLocalRequest):
+            loop = attempt.req._loop
+            loop.call_soon_threadsafe(lambda: loop.call_later(delay, self._send, attempt))
+        else:
+            self.call_later(delay, lambda: self._send(attempt))
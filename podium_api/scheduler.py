@@ -0,0 +1,311 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Client side scheduling of requests, wrap the transport used by
+**podium_api.asyncreq.make_request** and register it:
+
+    podium_api.register_podium_transport(SchedulingTransport(rate=10, max_concurrency=6))
+
+Requests beyond the rate or the concurrency are queued by priority, so
+interactive requests such as alert messages and racestat uploads are sent
+before background fetches such as lap history. Set the priority of the
+requests made in a block with **request_priority**:
+
+    with request_priority(BACKGROUND):
+        api.laps.list(uri, success_callback=on_laps)
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from podium_api.transport import (
+    AsyncLocalRequest,
+    get_running_loop,
+    thread_call_later,
+    WrappedTransport,
+)
+
+try:
+    from urllib.parse import urlsplit
+except:
+    from urlparse import urlsplit
+
+INTERACTIVE = 0
+NORMAL = 1
+BACKGROUND = 2
+
+"""
+CURRENT_PRIORITY overrides the priority the classifier of a
+**SchedulingTransport** gives to the requests made in the current context,
+see **request_priority**.
+"""
+CURRENT_PRIORITY = ContextVar("podium_api_priority", default=None)
+
+INTERACTIVE_RESOURCES = frozenset(("alertmessages", "racestats"))
+BACKGROUND_RESOURCES = frozenset(("laps", "logfiles"))
+
+
+@contextmanager
+def request_priority(priority):
+    """
+    Context manager giving priority to the requests made inside it.
+    """
+    context_token = CURRENT_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        CURRENT_PRIORITY.reset(context_token)
+
+
+def default_classify(url, method):
+    """
+    Returns the priority of a request from its url: alert messages and
+    racestats are INTERACTIVE, GETs of laps and logfiles are BACKGROUND and
+    everything else is NORMAL.
+    """
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    if INTERACTIVE_RESOURCES.intersection(segments):
+        return INTERACTIVE
+    if (method or "GET") == "GET" and BACKGROUND_RESOURCES.intersection(segments):
+        return BACKGROUND
+    return NORMAL
+
+
+class TokenBucket(object):
+    """
+    Token bucket allowing rate requests per second on average and bursts
+    of burst requests.
+
+    **Attributes:**
+        **rate** (float): Tokens added per second.
+
+        **burst** (float): Maximum number of tokens, also the initial number.
+    """
+
+    def __init__(self, rate, burst=None, clock=None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1)
+        self.clock = clock if clock is not None else time.monotonic
+        self._tokens = float(self.burst)
+        self._updated = self.clock()
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self):
+        """
+        Takes a token.
+
+        Return:
+            float: 0 if a token was taken, otherwise the seconds until one is
+            available.
+        """
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+
+class ScheduledRequest(object):
+    """
+    A request waiting in or started by a **SchedulingTransport**.
+    """
+
+    __slots__ = ("req", "priority", "url", "method", "body", "headers", "callbacks")
+
+    def __init__(self, req, priority, url, method, body, headers, callbacks):
+        self.req = req
+        self.priority = priority
+        self.url = url
+        self.method = method
+        self.body = body
+        self.headers = headers
+        self.callbacks = callbacks
+
+
+class SchedulingTransport(WrappedTransport):
+    """
+    Transport that limits the requests sent through its inner transport to
+    rate per second and max_concurrency at once. Requests over the limits
+    wait in a queue ordered by priority, then by arrival.
+
+    Every caller receives a LocalRequest answered with the response of its
+    request, cancelling it while it is queued removes it from the queue.
+
+    **Attributes:**
+        **rate** (float): Requests started per second, bursts of burst
+        requests are allowed. None for no rate limit. Defaults to None.
+
+        **burst** (int): See rate. Defaults to rate.
+
+        **max_concurrency** (int): Maximum number of requests in flight.
+        Defaults to 6.
+
+        **classify** (function): Returns the priority of a request made
+        outside of **request_priority**, called as classify(url, method).
+        Defaults to **default_classify**.
+
+        **call_later** (function): Schedules the next start when the rate is
+        exceeded, called as call_later(delay, callback) it must return an
+        object with a cancel method. Defaults to
+        **podium_api.transport.thread_call_later**.
+
+        **started** (int): Number of requests started.
+    """
+
+    def __init__(
+        self,
+        inner=None,
+        rate=None,
+        burst=None,
+        max_concurrency=6,
+        classify=None,
+        call_later=None,
+        dispatch=None,
+    ):
+        super(SchedulingTransport, self).__init__(inner, dispatch=dispatch)
+        self.bucket = TokenBucket(rate, burst) if rate is not None else None
+        self.max_concurrency = max_concurrency
+        self.classify = classify if classify is not None else default_classify
+        self.call_later = call_later if call_later is not None else thread_call_later
+        self.started = 0
+        self._queue = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._timer = None
+        self._lock = threading.Lock()
+
+    @property
+    def queued_count(self):
+        """
+        Number of requests waiting, cancelled ones included until they reach
+        the front of the queue.
+        """
+        return len(self._queue)
+
+    @property
+    def in_flight(self):
+        """
+        Number of requests started and not answered yet.
+        """
+        return self._in_flight
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        priority = CURRENT_PRIORITY.get()
+        if priority is None:
+            priority = self.classify(url, method)
+        callbacks = {
+            "on_success": on_success,
+            "on_failure": on_failure,
+            "on_error": on_error,
+            "on_redirect": on_redirect,
+            "on_progress": on_progress,
+        }
+        entry = ScheduledRequest(
+            self.local_request(url, method, body, headers), priority, url, method, body, headers, callbacks
+        )
+        with self._lock:
+            heapq.heappush(self._queue, (priority, next(self._sequence), entry))
+        self._pump()
+        return entry.req
+
+    def cancel_queued(self, priority=None):
+        """
+        Cancels the requests still waiting, for example when the screen that
+        made them is dismissed.
+
+        Kwargs:
+            priority (int): If provided only the requests of this priority
+            are cancelled. Defaults to None, every waiting request.
+
+        Return:
+            int: Number of requests cancelled.
+        """
+        with self._lock:
+            cancelled = [entry for entry_priority, _, entry in self._queue if priority in (None, entry_priority)]
+            self._queue = [item for item in self._queue if priority not in (None, item[0])]
+            heapq.heapify(self._queue)
+        for entry in cancelled:
+            entry.req.cancel()
+        return len(cancelled)
+
+    def _pump(self):
+        while True:
+            with self._lock:
+                while self._queue and self._queue[0][2].req.cancelled:
+                    heapq.heappop(self._queue)
+                if not self._queue or self._in_flight >= self.max_concurrency:
+                    return
+                delay = self.bucket.take() if self.bucket is not None else 0
+                if delay > 0:
+                    if self._timer is None:
+                        self._timer = self.call_later(delay, self._on_timer)
+                    return
+                entry = heapq.heappop(self._queue)[2]
+                self._in_flight += 1
+                self.started += 1
+            self._start(entry)
+
+    def _on_timer(self):
+        with self._lock:
+            self._timer = None
+        self._pump()
+
+    def _start(self, entry):
+        req = entry.req
+        if isinstance(req, AsyncLocalRequest) and get_running_loop() is not req._loop:
+            # requests made from an event loop are started on it
+            req._loop.call_soon_threadsafe(self._start, entry)
+            return
+        try:
+            self.inner.request(
+                entry.url,
+                method=entry.method,
+                body=entry.body,
+                headers=entry.headers,
+                on_success=lambda inner_req, result: self._complete(entry, "on_success", inner_req, result),
+                on_failure=lambda inner_req, result: self._complete(entry, "on_failure", inner_req, result),
+                on_error=lambda inner_req, error: self._complete(entry, "on_error", inner_req, error),
+                on_redirect=lambda inner_req, result: self._complete(entry, "on_redirect", inner_req, result),
+                on_progress=lambda inner_req, current, total: self._progress(entry, current, total),
+            )
+        except Exception as error:
+            self._complete(entry, "on_error", None, error)
+
+    def _complete(self, entry, name, inner_req, result):
+        with self._lock:
+            self._in_flight -= 1
+        if name == "on_error":
+            entry.req._error = result
+        self.complete_local(
+            entry.req,
+            getattr(inner_req, "resp_status", None),
+            getattr(inner_req, "resp_headers", None),
+            result,
+            entry.callbacks[name],
+            result,
+            now=True,
+        )
+        self._pump()
+
+    def _progress(self, entry, current, total):
+        on_progress = entry.callbacks["on_progress"]
+        if on_progress is not None and not entry.req.cancelled:
+            on_progress(entry.req, current, total)
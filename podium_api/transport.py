@@ -0,0 +1,915 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Transports are the objects that actually put a request on the wire for
+**podium_api.asyncreq.make_request**. A transport receives the fully prepared
+url, method, body and headers along with the UrlRequest style callbacks:
+
+    on_success(request, result)
+    on_failure(request, result)
+    on_error(request, error)
+    on_redirect(request, result)
+    on_progress(request, current_size, total_size)
+
+and returns a request object describing the request being made. The default
+transport is **UrlRequestTransport**, which uses Kivy's UrlRequest. Register a
+different transport with **podium_api.register_podium_transport**.
+"""
+import select
+import sys
+import threading
+import zlib
+from collections import deque
+
+from podium_api.decoding import get_json_decoder, PagedPayloadParser
+from podium_api.encoding import StreamedBody
+
+try:
+    from urllib.parse import urlsplit
+except:
+    from urlparse import urlsplit
+
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+ACCEPT_ENCODING = None
+
+
+class PodiumTransport(object):
+    """
+    Base class for the transports used by **make_request**. Subclasses must
+    implement **request**.
+
+    **Attributes:**
+        **stream_payloads** (bool): True if the transport parses pages as
+        they are read, its request method then takes a payload_name kwarg,
+        see **PooledTransport**. False by default.
+    """
+
+    stream_payloads = False
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        """
+        Starts a request.
+
+        Args:
+            url (str): The complete url of the request, including params.
+
+        Kwargs:
+            method (str): The type of request being made. Defaults to 'GET'
+
+            body (str): Encoded body of the request. Defaults to None.
+
+            headers (dict): The header for the request. Defaults to None.
+
+            on_success, on_failure, on_error, on_redirect, on_progress
+            (function): Callbacks with the UrlRequest signatures.
+
+        Return:
+            object: The request being made.
+        """
+        raise NotImplementedError()
+
+    def close(self):
+        """
+        Releases any resources held by the transport.
+        """
+        pass
+
+
+class UrlRequestTransport(PodiumTransport):
+    """
+    Transport that creates one Kivy UrlRequest per request. Each request runs
+    in its own thread with its own connection and callbacks are dispatched on
+    the Kivy main thread.
+    """
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        from kivy.network.urlrequest import UrlRequest
+
+        # UrlRequest adds its User-Agent and cookies to the headers it is
+        # given, the shared headers of podium_api are immutable
+        headers = dict(headers) if headers is not None else None
+        if isinstance(body, StreamedBody):
+            # http.client sends iterable bodies chunk by chunk, without a
+            # length it would use a chunked transfer encoding
+            headers = dict(headers or {}, **{"Content-Length": str(len(body))})
+        return UrlRequest(
+            url,
+            method=method,
+            req_body=body,
+            req_headers=headers,
+            on_success=on_success,
+            on_failure=on_failure,
+            on_redirect=on_redirect,
+            on_progress=on_progress,
+            on_error=on_error,
+        )
+
+
+def kivy_dispatch(callback, *args):
+    """
+    Dispatcher for **PooledTransport** that runs the callback on the Kivy
+    main thread, matching the behavior of UrlRequest.
+    """
+    from kivy.clock import Clock
+
+    Clock.schedule_once(lambda dt: callback(*args), 0)
+
+
+def inline_dispatch(callback, *args):
+    """
+    Dispatcher for **PooledTransport** that runs the callback directly on the
+    worker thread that completed the request.
+    """
+    callback(*args)
+
+
+def thread_call_later(delay, callback):
+    """
+    Calls callback after delay seconds on a daemon thread.
+
+    Return:
+        threading.Timer: The timer, its cancel method stops the call.
+    """
+    timer = threading.Timer(delay, callback)
+    timer.daemon = True
+    timer.start()
+    return timer
+
+
+class PooledRequest(object):
+    """
+    Object that represents a request made through a **PooledTransport**. It
+    mirrors the parts of UrlRequest used by podium_api callbacks.
+
+    **Attributes:**
+        **url** (str): Url of the request.
+
+        **req_body** (str): Body of the request.
+
+        **req_headers** (dict): Headers of the request.
+    """
+
+    def __init__(self, url, method, body, headers):
+        self.url = url
+        self.req_body = body
+        self.req_headers = headers
+        self._method = method
+        self._result = None
+        self._error = None
+        self._resp_status = None
+        self._resp_headers = None
+        self._is_finished = False
+        self._cancelled = False
+        self._finished_event = threading.Event()
+        self._future = None
+
+    @property
+    def method(self):
+        return self._method
+
+    @property
+    def result(self):
+        return self._result
+
+    @property
+    def error(self):
+        return self._error
+
+    @property
+    def resp_status(self):
+        return self._resp_status
+
+    @property
+    def resp_headers(self):
+        return self._resp_headers
+
+    @property
+    def is_finished(self):
+        return self._is_finished
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        """
+        Cancels the request. A request that has not started yet will never be
+        sent, a request in progress will not dispatch any further callbacks.
+        """
+        self._cancelled = True
+        if self._future is not None:
+            self._future.cancel()
+        self._finished_event.set()
+
+    def wait(self, timeout=None):
+        """
+        Blocks until the request has finished or was cancelled.
+
+        Kwargs:
+            timeout (float): Maximum number of seconds to wait. Defaults to
+            None, wait forever.
+
+        Return:
+            bool: True if the request finished.
+        """
+        return self._finished_event.wait(timeout)
+
+
+class LocalRequest(PooledRequest):
+    """
+    Request answered by a **WrappedTransport** without going to the network,
+    for example from a cache. Its callbacks are dispatched like those of the
+    wrapped transport.
+
+    **Attributes:**
+        **cancel_callback** (function): Called with the request when it is
+        cancelled, by transports that must know about it. Defaults to None.
+    """
+
+    def __init__(self, url, method, body, headers):
+        super(LocalRequest, self).__init__(url, method, body, headers)
+        self.cancel_callback = None
+
+    def _set_finished(self):
+        self._finished_event.set()
+
+    def cancel(self):
+        super(LocalRequest, self).cancel()
+        if self.cancel_callback is not None:
+            self.cancel_callback(self)
+
+
+class AsyncLocalRequest(LocalRequest):
+    """
+    **LocalRequest** made from a running asyncio event loop, its wait method
+    is a coroutine like the one of **AsyncioRequest**.
+    """
+
+    def __init__(self, url, method, body, headers):
+        super(AsyncLocalRequest, self).__init__(url, method, body, headers)
+        import asyncio
+
+        self._loop = asyncio.get_running_loop()
+        self._finished = asyncio.Event()
+
+    def _set_finished(self):
+        self._finished.set()
+
+    def cancel(self):
+        self._cancelled = True
+        self._finished.set()
+        if self.cancel_callback is not None:
+            self.cancel_callback(self)
+
+    async def wait(self):
+        """
+        Waits until the callbacks of the request have run.
+        """
+        await self._finished.wait()
+
+
+def get_running_loop():
+    """
+    Returns the asyncio event loop running in this thread, None if there is
+    none. asyncio is not imported if the program did not import it.
+    """
+    asyncio = sys.modules.get("asyncio")
+    if asyncio is None:
+        return None
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class WrappedTransport(PodiumTransport):
+    """
+    Base class for transports that add behavior around another transport,
+    such as caching or retrying requests. Requests are passed through to the
+    inner transport unless a subclass decides otherwise.
+
+    **Attributes:**
+        **inner** (PodiumTransport): The transport that makes the requests.
+        Defaults to the transport returned by
+        **podium_api.asyncreq.get_default_transport**.
+
+        **dispatch** (function): Called as dispatch(callback, \\*args) to run
+        the callbacks of requests answered without the inner transport.
+        Defaults to the dispatch of the inner transport, **kivy_dispatch**
+        for **UrlRequestTransport**. Requests made from a running asyncio
+        event loop are answered on the loop.
+    """
+
+    def __init__(self, inner=None, dispatch=None):
+        self._inner = inner
+        self._dispatch = dispatch
+
+    @property
+    def inner(self):
+        if self._inner is None:
+            from podium_api.asyncreq import get_default_transport
+
+            return get_default_transport()
+        return self._inner
+
+    @property
+    def dispatch(self):
+        if self._dispatch is not None:
+            return self._dispatch
+        inner = self.inner
+        if isinstance(inner, UrlRequestTransport):
+            return kivy_dispatch
+        return getattr(inner, "dispatch", inline_dispatch)
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+    ):
+        return self.inner.request(
+            url,
+            method=method,
+            body=body,
+            headers=headers,
+            on_success=on_success,
+            on_failure=on_failure,
+            on_error=on_error,
+            on_redirect=on_redirect,
+            on_progress=on_progress,
+        )
+
+    def local_request(self, url, method="GET", body=None, headers=None):
+        """
+        Returns a request that will be answered by **complete_local**
+        instead of the inner transport.
+        """
+        if get_running_loop() is not None:
+            return AsyncLocalRequest(url, method, body, headers)
+        return LocalRequest(url, method, body, headers)
+
+    def complete_local(self, req, status, headers, result, callback, *args, now=False):
+        """
+        Answers a request made with **local_request**: sets its response and
+        dispatches callback(req, \\*args).
+
+        Args:
+            req (LocalRequest): The request to answer.
+
+            status (int): The status code of the response.
+
+            headers (dict): The headers of the response.
+
+            result (object): The decoded result of the response.
+
+            callback (function): The callback to call, can be None.
+
+        Kwargs:
+            now (bool): If True the callback is called right away instead of
+            being dispatched, for callers already running where the
+            callbacks of the inner transport run. Defaults to False.
+        """
+        req._resp_status = status
+        req._resp_headers = headers
+        req._result = result
+        req._is_finished = True
+
+        def run():
+            try:
+                if callback is not None and not req.cancelled:
+                    callback(req, *args)
+            finally:
+                req._set_finished()
+
+        if isinstance(req, AsyncLocalRequest):
+            if now and get_running_loop() is req._loop:
+                run()
+            else:
+                req._loop.call_soon_threadsafe(run)
+        elif now:
+            run()
+        else:
+            self.dispatch(run)
+
+    def close(self):
+        """
+        Closes the inner transport if one was provided.
+        """
+        if self._inner is not None:
+            self._inner.close()
+
+
+class HostConnectionPool(object):
+    """
+    Bounded pool of keep-alive connections to a single host.
+
+    **Attributes:**
+        **max_connections** (int): Maximum number of connections open to the
+        host at the same time.
+    """
+
+    def __init__(self, scheme, host, port, max_connections, timeout=None, ssl_context=None):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.ssl_context = ssl_context
+        self._idle = deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_connections)
+
+    def _new_connection(self):
+        from http.client import HTTPConnection, HTTPSConnection
+
+        if self.scheme == "https":
+            return HTTPSConnection(self.host, self.port, timeout=self.timeout, context=self.ssl_context)
+        elif self.scheme == "http":
+            return HTTPConnection(self.host, self.port, timeout=self.timeout)
+        raise ValueError("Unsupported scheme {}".format(self.scheme))
+
+    def acquire(self):
+        """
+        Returns a connection to the host, blocking while max_connections are
+        in use.
+
+        Return:
+            (HTTPConnection, bool): The connection and whether it was reused.
+        """
+        self._slots.acquire()
+        try:
+            while True:
+                with self._lock:
+                    conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    return self._new_connection(), False
+                if not connection_dropped(conn):
+                    return conn, True
+                conn.close()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn, reusable=True):
+        """
+        Returns a connection to the pool. Connections that can not be reused
+        are closed.
+        """
+        if reusable:
+            with self._lock:
+                self._idle.append(conn)
+        else:
+            conn.close()
+        self._slots.release()
+
+    @property
+    def idle_count(self):
+        return len(self._idle)
+
+    def close(self):
+        with self._lock:
+            while self._idle:
+                self._idle.pop().close()
+
+
+def connection_dropped(conn):
+    """
+    Returns True if an idle keep-alive connection was closed by the server.
+    """
+    sock = conn.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    # an idle connection should have nothing to read, readable means EOF
+    return bool(readable)
+
+
+class PooledTransport(PodiumTransport):
+    """
+    Transport that runs requests on a fixed pool of worker threads over
+    per-host pools of keep-alive connections, so repeated requests to the
+    Podium server skip the TCP and TLS handshakes.
+
+    **Attributes:**
+        **max_workers** (int): Number of worker threads.
+
+        **max_connections_per_host** (int): Maximum number of connections
+        open to a single host.
+
+        **timeout** (float): Socket timeout in seconds.
+
+        **chunk_size** (int): Size of the chunks read when reporting progress
+        or decompressing.
+
+        **decompress** (bool): If True compressed responses are asked for
+        with an Accept-Encoding header and decompressed as they are read,
+        see **get_accept_encoding**. Progress is reported in bytes received.
+        Defaults to True.
+
+        **dispatch** (function): Called as dispatch(callback, \\*args) to run
+        each callback. Defaults to **inline_dispatch**, use **kivy_dispatch**
+        to receive callbacks on the Kivy main thread.
+
+        **stream_payloads** (bool): If True a successful response to a
+        request made with a payload_name is parsed by a
+        **podium_api.decoding.PagedPayloadParser** as it is read, the
+        request succeeds with the PodiumPagedResponse instead of a dict.
+        Defaults to False.
+    """
+
+    def __init__(
+        self,
+        max_workers=4,
+        max_connections_per_host=4,
+        timeout=30,
+        chunk_size=8192,
+        ssl_context=None,
+        dispatch=None,
+        decompress=True,
+        stream_payloads=False,
+    ):
+        self.max_workers = max_workers
+        self.max_connections_per_host = max_connections_per_host
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self.decompress = decompress
+        self.stream_payloads = stream_payloads
+        self.ssl_context = ssl_context
+        self.dispatch = inline_dispatch if dispatch is None else dispatch
+        # http.client and concurrent.futures are imported lazily, they are
+        # a large part of the import time of podium_api on headless servers
+        from concurrent.futures import ThreadPoolExecutor
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="podium-transport")
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+    def get_pool(self, scheme, host, port):
+        """
+        Returns the HostConnectionPool for the scheme, host and port, creating
+        it if needed.
+        """
+        key = (scheme, host, port)
+        with self._pools_lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                pool = HostConnectionPool(
+                    scheme,
+                    host,
+                    port,
+                    self.max_connections_per_host,
+                    timeout=self.timeout,
+                    ssl_context=self.ssl_context,
+                )
+                self._pools[key] = pool
+            return pool
+
+    def request(
+        self,
+        url,
+        method="GET",
+        body=None,
+        headers=None,
+        on_success=None,
+        on_failure=None,
+        on_error=None,
+        on_redirect=None,
+        on_progress=None,
+        payload_name=None,
+    ):
+        req = PooledRequest(url, method, body, headers)
+        callbacks = {
+            "success": on_success,
+            "failure": on_failure,
+            "error": on_error,
+            "redirect": on_redirect,
+            "progress": on_progress,
+        }
+        req._future = self._executor.submit(self._run, req, callbacks, payload_name)
+        return req
+
+    def _dispatch(self, req, callback, *args):
+        if callback is None or req.cancelled:
+            return
+        self.dispatch(callback, req, *args)
+
+    def _run(self, req, callbacks, payload_name=None):
+        if req.cancelled:
+            return
+        try:
+            try:
+                status, resp_headers, result = self._fetch(req, callbacks["progress"], payload_name)
+            except Exception as e:
+                req._error = e
+                req._is_finished = True
+                self._dispatch(req, callbacks["error"], e)
+                return
+            req._resp_status = status
+            req._resp_headers = resp_headers
+            req._result = result
+            req._is_finished = True
+            status_class = status // 100
+            if status_class in (1, 2):
+                self._dispatch(req, callbacks["success"], result)
+            elif status_class == 3:
+                self._dispatch(req, callbacks["redirect"], result)
+            else:
+                self._dispatch(req, callbacks["failure"], result)
+        finally:
+            req._finished_event.set()
+
+    def _fetch(self, req, on_progress, payload_name=None):
+        from http.client import HTTPException
+
+        parts = urlsplit(req.url)
+        path = parts.path or "/"
+        if parts.query:
+            path = "{}?{}".format(path, parts.query)
+        pool = self.get_pool(parts.scheme, parts.hostname, parts.port)
+        body = req.req_body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        method = req.method or ("GET" if body is None else "POST")
+        headers = req.req_headers or {}
+        streamed = isinstance(body, StreamedBody)
+        if streamed:
+            headers = dict(headers, **{"Content-Length": str(len(body))})
+        if self.decompress and "Accept-Encoding" not in headers:
+            headers = dict(headers, **{"Accept-Encoding": get_accept_encoding()})
+
+        def send(conn):
+            # a streamed body is read again from its start for each attempt
+            conn.request(method, path, self._upload(req, body, on_progress) if streamed else body, headers)
+            return conn.getresponse()
+
+        conn, reused = pool.acquire()
+        try:
+            try:
+                resp = send(conn)
+            except (HTTPException, ConnectionError):
+                # the server may close a keep-alive connection at any time,
+                # replay idempotent requests once on a fresh connection
+                conn.close()
+                if not reused or method not in IDEMPOTENT_METHODS:
+                    raise
+                conn = pool._new_connection()
+                resp = send(conn)
+            # the progress of a request with a streamed body is the progress
+            # of the upload
+            result = self._read(req, resp, None if streamed else on_progress, payload_name)
+        except Exception:
+            pool.release(conn, reusable=False)
+            raise
+        pool.release(conn, reusable=not resp.will_close)
+        if isinstance(result, bytes):
+            result = decode_result(result, resp.getheader("Content-Type"))
+        return resp.status, dict(resp.getheaders()), result
+
+    def _upload(self, req, body, on_progress):
+        total_size = len(body)
+        bytes_so_far = 0
+        if on_progress is not None:
+            self._dispatch(req, on_progress, 0, total_size)
+        for chunk in body:
+            if req.cancelled:
+                raise OSError("upload cancelled")
+            yield chunk
+            bytes_so_far += len(chunk)
+            if on_progress is not None:
+                self._dispatch(req, on_progress, bytes_so_far, total_size)
+
+    def _read(self, req, resp, on_progress, payload_name=None):
+        decoder = get_content_decoder(resp.getheader("Content-Encoding")) if self.decompress else None
+        stream = None
+        if self.stream_payloads:
+            stream = get_payload_stream(payload_name, resp.status, resp.getheader("Content-Type"), decoder)
+            if stream is not None:
+                decoder = stream
+        if on_progress is None and decoder is None:
+            return resp.read()
+        total_size = int(resp.getheader("Content-Length", -1))
+        if on_progress is not None:
+            self._dispatch(req, on_progress, 0, total_size)
+        chunks = []
+        bytes_so_far = 0
+        while True:
+            chunk = resp.read(self.chunk_size)
+            if not chunk:
+                break
+            chunks.append(chunk if decoder is None else decoder.decompress(chunk))
+            bytes_so_far += len(chunk)
+            if on_progress is not None:
+                self._dispatch(req, on_progress, bytes_so_far, total_size)
+        if decoder is not None:
+            chunks.append(decoder.flush())
+        if stream is not None:
+            return stream.close()
+        return b"".join(chunks)
+
+    def close(self):
+        """
+        Stops the worker threads and closes all idle connections.
+        """
+        self._executor.shutdown(wait=False)
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools = {}
+
+
+def get_accept_encoding():
+    """
+    Returns the Accept-Encoding header sent by the transports: gzip and
+    deflate, and br when the brotli package is installed.
+    """
+    global ACCEPT_ENCODING
+    if ACCEPT_ENCODING is None:
+        from importlib.util import find_spec
+
+        ACCEPT_ENCODING = "gzip, deflate, br" if find_spec("brotli") is not None else "gzip, deflate"
+    return ACCEPT_ENCODING
+
+
+class ContentDecoder(object):
+    """
+    Incremental decoder of a compressed response body, fed the chunks as
+    they are read so the compressed body is never held as a whole.
+
+    A deflate body is decoded whether it has the zlib header the RFC asks
+    for or is raw deflate, as some servers send it.
+
+    **Attributes:**
+        **encoding** (str): The Content-Encoding decoded, 'gzip', 'deflate'
+        or 'br'.
+    """
+
+    __slots__ = ("encoding", "_decoder", "_head")
+
+    def __init__(self, encoding):
+        self.encoding = encoding
+        # the first bytes of a deflate body, until they tell its format
+        self._head = None
+        if encoding == "br":
+            import brotli
+
+            self._decoder = brotli.Decompressor()
+        elif encoding == "deflate":
+            self._decoder = zlib.decompressobj()
+            self._head = b""
+        else:
+            self._decoder = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, chunk):
+        """
+        Returns the decoded bytes of the next chunk of the body.
+        """
+        if self.encoding == "br":
+            return self._decoder.process(chunk)
+        if self._head is not None:
+            chunk = self._head + chunk
+            if len(chunk) < 2:
+                self._head = chunk
+                return b""
+            self._head = None
+            if not is_zlib_header(chunk):
+                self._decoder = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._decoder.decompress(chunk)
+
+    def flush(self):
+        """
+        Returns the decoded bytes still buffered once the body was read.
+        """
+        if self.encoding == "br":
+            return b""
+        if self._head:
+            return self._decoder.decompress(self._head) + self._decoder.flush()
+        return self._decoder.flush()
+
+
+def is_zlib_header(data):
+    """
+    Returns True if data starts with a zlib header: the deflate method and a
+    check of the first two bytes that is a multiple of 31.
+    """
+    return data[0] & 0x0F == 8 and ((data[0] << 8) | data[1]) % 31 == 0
+
+
+def get_content_decoder(content_encoding):
+    """
+    Returns a ContentDecoder for the value of a Content-Encoding header,
+    None if the body is not compressed or uses an encoding that is not
+    supported, it is then returned as it is.
+    """
+    if not content_encoding:
+        return None
+    encoding = content_encoding.strip().lower()
+    if encoding in ("gzip", "x-gzip"):
+        return ContentDecoder("gzip")
+    if encoding == "deflate" or (encoding == "br" and "br" in get_accept_encoding()):
+        return ContentDecoder(encoding)
+    return None
+
+
+class PayloadStream(object):
+    """
+    Feeds the body of a page to a **PagedPayloadParser** as it is read,
+    through the ContentDecoder of the response if it is compressed. It has
+    the methods of a ContentDecoder so the transports read through it, the
+    bytes go to the parser instead of being returned.
+    """
+
+    __slots__ = ("parser", "decoder")
+
+    def __init__(self, parser, decoder=None):
+        self.parser = parser
+        self.decoder = decoder
+
+    def decompress(self, chunk):
+        self.parser.feed(chunk if self.decoder is None else self.decoder.decompress(chunk))
+        return b""
+
+    def flush(self):
+        if self.decoder is not None:
+            self.parser.feed(self.decoder.flush())
+        return b""
+
+    def close(self):
+        """
+        Returns the PodiumPagedResponse parsed.
+        """
+        return self.parser.close()
+
+
+def get_payload_stream(payload_name, status, content_type, decoder=None):
+    """
+    Returns a PayloadStream parsing the body of a response to a request made
+    with a payload_name, None if there is no payload_name or the response is
+    not a successful json response.
+    """
+    if payload_name is None or not 200 <= status < 300 or not is_json(content_type):
+        return None
+    return PayloadStream(PagedPayloadParser(payload_name), decoder)
+
+
+def is_json(content_type):
+    """
+    Returns True if the value of a Content-Type header is application/json.
+    """
+    return content_type is not None and content_type.split(";")[0].strip() == "application/json"
+
+
+def decode_result(result, content_type):
+    """
+    Decodes a response body the same way UrlRequest does: json responses
+    are loaded into python objects with **podium_api.decoding.get_json_decoder**,
+    everything else is returned as a str when it is valid utf-8.
+
+    Args:
+        result (bytes): The raw response body.
+
+        content_type (str): Value of the Content-Type header.
+
+    Return:
+        object: The decoded result.
+    """
+    if is_json(content_type):
+        try:
+            return get_json_decoder()(result)
+        except Exception:
+            pass
+    try:
+        return result.decode("utf-8")
+    except UnicodeDecodeError:
+        return result
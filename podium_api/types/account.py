@@ -28,6 +28,20 @@ class PodiumAccount(object):
         **exports_uri** (str): URI to account's telemetry exports
     """
 
+    __slots__ = (
+        "account_id",
+        "username",
+        "email",
+        "account_type",
+        "features",
+        "_features_dict",
+        "devices_uri",
+        "exports_uri",
+        "streams_uri",
+        "user_uri",
+        "events_uri",
+    )
+
     def __init__(
         self,
         account_id,
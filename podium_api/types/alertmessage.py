@@ -25,6 +25,19 @@ class PodiumAlertMessage(object):
         **user_uri** (str): URI of the user this alertmessage belongs to
     """
 
+    __slots__ = (
+        "alertmessage_id",
+        "uri",
+        "send_time",
+        "ack_time",
+        "message",
+        "priority",
+        "sender_id",
+        "eventdevice_uri",
+        "device_uri",
+        "user_uri",
+    )
+
     def __init__(
         self,
         alertmessage_id,
@@ -1,9 +1,42 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from base64 import b64encode
+from types import MappingProxyType
+
+
+def make_json_header(authorization):
+    """
+    Returns the immutable header of a request sending a form and expecting
+    json, authorized with authorization.
+    """
+    return MappingProxyType(
+        {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Authorization": authorization,
+            "Accept": "application/json",
+        }
+    )
 
 
 class PodiumApplication:
+    __slots__ = ("app_id", "app_secret", "podium_url", "_json_header")
+
     def __init__(self, app_id, app_secret, podium_url=None):
         self.app_id = app_id
         self.app_secret = app_secret
         self.podium_url = "https://podium.live" if podium_url is None else podium_url
+        self._json_header = None
+
+    @property
+    def json_header(self):
+        """
+        The header of requests authorized with the app_id and app_secret,
+        built once as an immutable mapping with the Basic credential base64
+        encoded.
+        """
+        cached = self._json_header
+        if cached is None or cached[0] != (self.app_id, self.app_secret):
+            credential = "{}:{}".format(self.app_id, self.app_secret).encode("utf-8")
+            header = make_json_header("Basic {}".format(b64encode(credential).decode("ascii")))
+            cached = self._json_header = ((self.app_id, self.app_secret), header)
+        return cached[1]
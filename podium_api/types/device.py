@@ -17,6 +17,8 @@ class PodiumDevice(object):
         **private** (bool): Is the event only viewable to creator?
     """
 
+    __slots__ = ("device_id", "uri", "serial", "name", "private", "avatar_url")
+
     def __init__(self, device_id, uri, serial, name, private, avatar_url):
         self.device_id = device_id
         self.uri = uri
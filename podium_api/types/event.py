@@ -27,6 +27,20 @@ class PodiumEvent(object):
         **user_avatar_url** (str): URL for user avatar
     """
 
+    __slots__ = (
+        "event_id",
+        "uri",
+        "devices_uri",
+        "title",
+        "start_time",
+        "end_time",
+        "venue_uri",
+        "venue_id",
+        "private",
+        "user_uri",
+        "user_avatar_url",
+    )
+
     def __init__(
         self,
         event_id,
@@ -27,6 +27,23 @@ class PodiumEventDevice(object):
 
     """
 
+    __slots__ = (
+        "eventdevice_id",
+        "uri",
+        "channels",
+        "name",
+        "comp_number",
+        "device_uri",
+        "laps_uri",
+        "user_uri",
+        "event_uri",
+        "avatar_url",
+        "user_avatar_url",
+        "event_title",
+        "device_id",
+        "event_id",
+    )
+
     def __init__(
         self,
         eventdevice_id,
@@ -15,3 +15,21 @@ class NoEndpointOrIdsProvided(Exception):
     """
 
     pass
+
+
+class PodiumRequestFailed(Exception):
+    """This exception is raised by podium_api.aioapi when a request fails
+    or errors.
+
+    **Attributes:**
+        **failure_type** (str): 'failure' when the server answered with an
+        error status, 'error' when the request could not be made.
+
+        **results** (object): The decoded response, or the exception raised
+        while making the request.
+    """
+
+    def __init__(self, failure_type, results):
+        super(PodiumRequestFailed, self).__init__(failure_type, results)
+        self.failure_type = failure_type
+        self.results = results
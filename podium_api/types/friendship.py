@@ -18,6 +18,8 @@ class PodiumFriendship(object):
 
     """
 
+    __slots__ = ("friendship_id", "user_id", "user_uri", "friend_id", "friend_uri")
+
     def __init__(self, friendship_id, user_id, user_uri, friend_id, friend_uri):
         self.friendship_id = friendship_id
         self.user_id = user_id
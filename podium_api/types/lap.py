@@ -19,6 +19,8 @@ class PodiumLap(object):
 
     """
 
+    __slots__ = ("uri", "raw_data_uri", "lap_number", "end_time", "aggregates", "lap_time")
+
     def __init__(self, uri, raw_data_uri, lap_number, end_time, aggregates, lap_time):
         self.uri = uri
         self.raw_data_uri = raw_data_uri
@@ -0,0 +1,355 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import math
+from array import array
+
+AGGREGATE_CHANNEL_KEYS = ("channel", "name")
+
+_numpy = None
+
+
+def get_numpy():
+    """
+    Returns the numpy module, or None if it is not installed. numpy is only
+    imported the first time a LapTable needs it.
+    """
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+class LapTable(object):
+    """
+    Columnar table of laps. Every column is a contiguous array with one value
+    per lap, numeric columns are float64 and NaN where a lap has no value.
+    Columns are returned as numpy arrays when numpy is installed and as
+    array.array otherwise, the queries use numpy when it is available.
+
+    **Attributes:**
+        **uri** (list): Endpoint for accessing each lap.
+
+        **end_time** (list): Time each lap ended.
+
+        **lap_number** (array): Number of each lap, as a float.
+
+        **lap_time** (array): Lap time of each lap in minutes.
+
+        **channels** (dict): Aggregate columns keyed by (channel, stat),
+        for example ("Speed", "max").
+
+        **total** (int): Total number of laps reported by the paged response
+        the table was built from.
+
+        **next_uri** (str): The URI for next page of results if available
+
+        **prev_uri** (str): The URI for previous page of results if available
+    """
+
+    __slots__ = ("uri", "end_time", "_lap_number", "_lap_time", "_channels", "total", "next_uri", "prev_uri", "_views")
+
+    def __init__(self, uri, end_time, lap_number, lap_time, channels, total=None, next_uri=None, prev_uri=None):
+        self.uri = uri
+        self.end_time = end_time
+        self._lap_number = lap_number
+        self._lap_time = lap_time
+        self._channels = channels
+        self.total = total
+        self.next_uri = next_uri
+        self.prev_uri = prev_uri
+        self._views = {}
+
+    def __len__(self):
+        return len(self.uri)
+
+    def _view(self, key, values):
+        np = get_numpy()
+        if np is None:
+            return values
+        view = self._views.get(key)
+        if view is None:
+            view = np.frombuffer(values, dtype=np.float64)
+            view.flags.writeable = False
+            self._views[key] = view
+        return view
+
+    @property
+    def lap_number(self):
+        return self._view("lap_number", self._lap_number)
+
+    @property
+    def lap_time(self):
+        return self._view("lap_time", self._lap_time)
+
+    @property
+    def channels(self):
+        return dict((key, self._view(key, values)) for key, values in self._channels.items())
+
+    def channel(self, channel, stat="avg"):
+        """
+        Returns the column of an aggregate of a channel.
+
+        Args:
+            channel (str): Name of the channel.
+
+        Kwargs:
+            stat (str): Name of the aggregate, such as min, max or avg.
+            Defaults to avg.
+
+        Return:
+            array: One value per lap, NaN for laps without the aggregate.
+        """
+        key = (channel, stat)
+        if key not in self._channels:
+            raise KeyError("No aggregate {} for channel {}".format(stat, channel))
+        return self._view(key, self._channels[key])
+
+    def column(self, name):
+        """
+        Returns the numeric column called name: lap_number, lap_time, or a
+        (channel, stat) tuple for an aggregate column.
+        """
+        if isinstance(name, tuple):
+            return self.channel(*name)
+        if name in ("lap_number", "lap_time"):
+            return getattr(self, name)
+        raise KeyError("No column {}".format(name))
+
+    def best_lap(self, column="lap_time"):
+        """
+        Returns the row with the lowest value in column, laps without a value
+        are ignored.
+
+        Kwargs:
+            column (str): Column to compare. Defaults to lap_time.
+
+        Return:
+            int: Index of the best lap, None if no lap has a value.
+        """
+        values = self.column(column)
+        np = get_numpy()
+        if np is not None:
+            if len(values) == 0 or np.isnan(values).all():
+                return None
+            return int(np.nanargmin(values))
+        best = None
+        for index, value in enumerate(values):
+            if not math.isnan(value) and (best is None or value < values[best]):
+                best = index
+        return best
+
+    def rolling_average(self, window, column="lap_time"):
+        """
+        Returns the average of every window consecutive laps.
+
+        Args:
+            window (int): Number of laps in each average.
+
+        Kwargs:
+            column (str): Column to average. Defaults to lap_time.
+
+        Return:
+            array: len(table) - window + 1 averages, the first one is the
+            average of the first window laps. Windows containing a lap
+            without a value are NaN.
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        values = self.column(column)
+        np = get_numpy()
+        if np is not None:
+            if len(values) < window:
+                return np.empty(0)
+            return np.convolve(values, np.ones(window), "valid") / window
+        return array("d", (math.fsum(values[i : i + window]) / window for i in range(len(values) - window + 1)))
+
+    def percentile(self, q, column="lap_time"):
+        """
+        Returns the q-th percentile of column, interpolating linearly between
+        laps. Laps without a value are ignored.
+
+        Args:
+            q (float): Percentile between 0 and 100.
+
+        Kwargs:
+            column (str): Column to compute the percentile of. Defaults to
+            lap_time.
+
+        Return:
+            float: The percentile, NaN if no lap has a value.
+        """
+        if not 0 <= q <= 100:
+            raise ValueError("q must be between 0 and 100")
+        values = self.column(column)
+        np = get_numpy()
+        if np is not None:
+            values = values[~np.isnan(values)]
+            if len(values) == 0:
+                return float("nan")
+            return float(np.percentile(values, q))
+        values = sorted(value for value in values if not math.isnan(value))
+        if not values:
+            return float("nan")
+        position = (len(values) - 1) * q / 100.0
+        lower = int(math.floor(position))
+        upper = min(lower + 1, len(values) - 1)
+        return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+    @classmethod
+    def concat(cls, tables):
+        """
+        Returns a LapTable with the rows of every table, in order.
+        """
+        builder = LapTableBuilder()
+        for table in tables:
+            builder.add_table(table)
+        return builder.build()
+
+
+class LapTableBuilder(object):
+    """
+    Appends laps to the columns of a LapTable without creating PodiumLap
+    objects.
+    """
+
+    def __init__(self):
+        self.uri = []
+        self.end_time = []
+        self.lap_number = array("d")
+        self.lap_time = array("d")
+        self.channels = {}
+        self.total = None
+        self.next_uri = None
+        self.prev_uri = None
+
+    def _channel_column(self, key, rows):
+        column = self.channels.get(key)
+        if column is None:
+            # laps before the first one with this aggregate have no value
+            column = array("d", [float("nan")]) * rows
+            self.channels[key] = column
+        return column
+
+    def add_lap_json(self, json):
+        """
+        Appends the lap in the json dict received from podium api.
+        """
+        self.uri.append(json["URI"])
+        self.end_time.append(json["end_time"])
+        self.lap_number.append(to_float(json["lap_number"]))
+        self.lap_time.append(to_float(json["lap_time"]))
+        row = len(self.uri)
+        for channel, stats in iter_aggregates(json.get("aggregates", None)):
+            for stat, value in stats.items():
+                # json true and false are not aggregate values
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                column = self._channel_column((channel, stat), row - 1)
+                if len(column) < row:
+                    column.append(value)
+        for column in self.channels.values():
+            if len(column) < row:
+                column.append(float("nan"))
+
+    def add_page_json(self, json):
+        """
+        Appends the laps of a page in the json dict received from podium api.
+        """
+        if not self.uri:
+            self.prev_uri = json.get("prevURI", None)
+        for lap in json["laps"]:
+            self.add_lap_json(lap)
+        self.total = json.get("total", None)
+        self.next_uri = json.get("nextURI", None)
+
+    def add_table(self, table):
+        """
+        Appends the rows of a LapTable.
+        """
+        rows = len(self.uri)
+        if not rows:
+            self.prev_uri = table.prev_uri
+        self.uri.extend(table.uri)
+        self.end_time.extend(table.end_time)
+        self.lap_number.extend(table._lap_number)
+        self.lap_time.extend(table._lap_time)
+        for key, values in table._channels.items():
+            self._channel_column(key, rows).extend(values)
+        for column in self.channels.values():
+            if len(column) < len(self.uri):
+                column.extend(array("d", [float("nan")]) * (len(self.uri) - len(column)))
+        self.total = table.total
+        self.next_uri = table.next_uri
+
+    def build(self):
+        """
+        Returns the LapTable of the laps appended so far.
+        """
+        return LapTable(
+            self.uri,
+            self.end_time,
+            self.lap_number,
+            self.lap_time,
+            self.channels,
+            total=self.total,
+            next_uri=self.next_uri,
+            prev_uri=self.prev_uri,
+        )
+
+
+def to_float(value):
+    if value is None:
+        return float("nan")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def iter_aggregates(aggregates):
+    """
+    Yields (channel, stats) for the aggregates of a lap. The aggregates can be
+    a dict of stats keyed by channel name, or a list of dicts holding the
+    channel name under "channel" or "name" and the stats under the other
+    keys, such as {"channel": "Speed", "min": 0, "max": 120, "avg": 80}.
+    """
+    if not aggregates:
+        return
+    if isinstance(aggregates, dict):
+        for channel, stats in aggregates.items():
+            if isinstance(stats, dict):
+                yield channel, stats
+        return
+    for aggregate in aggregates:
+        if not isinstance(aggregate, dict):
+            continue
+        channel = None
+        for key in AGGREGATE_CHANNEL_KEYS:
+            if key in aggregate:
+                channel = aggregate[key]
+                break
+        if channel is None:
+            continue
+        yield channel, dict((key, value) for key, value in aggregate.items() if key not in AGGREGATE_CHANNEL_KEYS)
+
+
+def get_laptable_from_json(json):
+    """
+    Returns a LapTable from the json dict of a laps page received from podium
+    api, or from a list of such pages. No PodiumLap objects are created.
+
+    Args:
+        json (dict or list): Dict of data from REST api, or a list of them.
+
+    Return:
+        LapTable: The LapTable of the laps, in order.
+    """
+    builder = LapTableBuilder()
+    pages = [json] if isinstance(json, dict) else json
+    for page in pages:
+        builder.add_page_json(page)
+    return builder.build()
@@ -1,5 +1,12 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+STATUS_UNQUEUED = -1
+STATUS_ERROR = 0
+STATUS_QUEUED = 1
+STATUS_PROCESSING = 2
+STATUS_COMPLETED = 3
+
+
 class PodiumLogfile(object):
     """
     Object that represents a Logfile
@@ -20,6 +27,22 @@ class PodiumLogfile(object):
           STATUS_COMPLETED = 3
     """
 
+    __slots__ = (
+        "file_key",
+        "eventdevice_id",
+        "status",
+        "id",
+        "URI",
+        "upload_url",
+        "event_id",
+        "event_url",
+        "event_title",
+        "device_id",
+        "device_url",
+        "device_name",
+        "created",
+    )
+
     def __init__(
         self,
         file_key,
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from collections.abc import MutableSequence, Sequence
+
 from podium_api.types.alertmessage import get_alertmessage_from_json
 from podium_api.types.device import get_device_from_json
 from podium_api.types.event import get_event_from_json
@@ -11,13 +13,130 @@ from podium_api.types.preset import get_preset_from_json
 from podium_api.types.user import get_user_from_json
 from podium_api.types.venue import get_venue_from_json
 
+_MISSING = object()
+
+
+class LazyPayload(MutableSequence):
+    """
+    List of the objects of a page that converts the json of each object the
+    first time it is accessed, by index or iteration, and keeps the object
+    it built in place of the json. A screen showing the first rows of a page
+    only pays for the rows it shows.
+
+    It can be used like a list: it can be concatenated with +, appended to,
+    sorted and copied. Sorting, and assigning a slice, build every object.
+
+    As the objects are built on access, the json of a malformed object
+    raises, usually a KeyError, where the object is first read, for example
+    in the code showing the page, rather than in the success handler of the
+    request.
+    """
+
+    __slots__ = ("_items", "_objects", "_converter")
+
+    def __init__(self, items, converter):
+        # a copy, the json of an object is dropped once it is built
+        self._items = list(items)
+        self._objects = [_MISSING] * len(self._items)
+        self._converter = converter
+
+    def __len__(self):
+        return len(self._objects)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self._objects)))]
+        obj = self._objects[index]
+        if obj is _MISSING:
+            obj = self._converter(self._items[index])
+            self._objects[index] = obj
+            self._items[index] = None
+        return obj
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._build_all()
+            self._objects[index] = value
+            self._items = [None] * len(self._objects)
+        else:
+            self._objects[index] = value
+            self._items[index] = None
+
+    def __delitem__(self, index):
+        del self._objects[index]
+        del self._items[index]
+
+    def __iter__(self):
+        for index in range(len(self._objects)):
+            yield self[index]
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence) or isinstance(other, (str, bytes)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        return "LazyPayload({} objects, {} built)".format(len(self._objects), self.built_count)
+
+    def insert(self, index, value):
+        self._objects.insert(index, value)
+        self._items.insert(index, None)
+
+    def sort(self, key=None, reverse=False):
+        """
+        Sorts the objects in place like list.sort, building all of them.
+        """
+        self._build_all()
+        self._objects.sort(key=key, reverse=reverse)
+
+    def copy(self):
+        """
+        Returns a list of the objects, building all of them.
+        """
+        return list(self)
+
+    @property
+    def built_count(self):
+        """
+        Number of objects built so far.
+        """
+        return sum(1 for obj in self._objects if obj is not _MISSING)
+
+    def map(self, func):
+        """
+        Returns a LazyPayload of func(obj) for each object, still built on
+        access. The objects already built are passed to func now.
+        """
+        mapped = LazyPayload(range(len(self._objects)), lambda index: func(self[index]))
+        for index, obj in enumerate(self._objects):
+            if obj is not _MISSING:
+                mapped[index]
+        return mapped
+
+    def _build_all(self):
+        for index in range(len(self._objects)):
+            self[index]
+        self._items = [None] * len(self._objects)
+
 
 class PodiumPagedResponse(object):
     """
     Object that represents data returned from a paged request.
 
     **Attributes:**
-        **payload** (list): The data returned for this page.
+        **payload** (list): The data returned for this page. Pages made by
+        **get_paged_response_from_json** hold a LazyPayload, converting each
+        object on its first access.
 
         **total** (int): The total number of events found.
 
@@ -30,6 +149,8 @@ class PodiumPagedResponse(object):
         mirror the web api.
     """
 
+    __slots__ = ("payload", "total", "next_uri", "prev_uri", "payload_name")
+
     def __init__(self, payload, total, next_uri, prev_uri, payload_name=None):
         self.payload = payload
         self.total = total
@@ -64,7 +185,9 @@ def get_paged_response_from_json(json, payload_name):
     podium api.
 
     Args:
-        json (dict): Dict of data from REST api
+        json (dict): Dict of data from REST api. A PodiumPagedResponse
+        already parsed by a transport streaming payloads is returned as it
+        is.
 
         payload_name (str): Name of the actual paged data in the json dict.
         Will be used to determine the object the data gets converted into.
@@ -73,8 +196,9 @@ def get_paged_response_from_json(json, payload_name):
     Return:
         PodiumPagedResponse: The PodiumPagedResponse object for the data.
     """
-    conversion_func = PAYLOAD_NAME_TO_OBJECT[payload_name]
-    data = [conversion_func(x) for x in json[payload_name]]
+    if isinstance(json, PodiumPagedResponse):
+        return json
+    data = LazyPayload(json[payload_name], PAYLOAD_NAME_TO_OBJECT[payload_name])
     return PodiumPagedResponse(
         data, json["total"], json.get("nextURI", None), json.get("prevURI", None), payload_name=payload_name
     )
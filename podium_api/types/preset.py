@@ -38,6 +38,22 @@ class PodiumPreset(object):
     MAPPING_TYPE_DIGITAL_GAUGE = "digital_gauge"
     MAPPING_TYPE_LINEAR_GAUGE = "linear_gauge"
 
+    __slots__ = (
+        "preset_id",
+        "uri",
+        "name",
+        "notes",
+        "preset_data",
+        "type",
+        "private",
+        "rating",
+        "rating_count",
+        "user_uri",
+        "preview_image_url",
+        "updated",
+        "created",
+    )
+
     def __init__(
         self,
         preset_id,
@@ -44,6 +44,28 @@ class Racestat(object):
         **user_uri** (str): URI of the user this racestat belongs to
     """
 
+    __slots__ = (
+        "racestat_id",
+        "uri",
+        "comp_number",
+        "comp_class",
+        "total_laps",
+        "last_lap_time",
+        "position_overall",
+        "position_in_class",
+        "comp_number_ahead",
+        "comp_number_behind",
+        "gap_to_ahead",
+        "gap_to_behind",
+        "laps_to_ahead",
+        "laps_to_behind",
+        "fc_flag",
+        "comp_flag",
+        "eventdevice_uri",
+        "device_uri",
+        "user_uri",
+    )
+
     def __init__(
         self,
         racestat_id,
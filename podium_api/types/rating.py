@@ -24,6 +24,8 @@ class PodiumRating(object):
         **created** (str): Date preset was created. ISO 8601 format.
     """
 
+    __slots__ = ("rating",)
+
     def __init__(self, user_id, rating):
         self.rating = rating
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+from podium_api.types.application import make_json_header
 
 
 class PodiumToken(object):
@@ -12,12 +13,55 @@ class PodiumToken(object):
         **token_type** (string): The type of token issued.
 
         **created** (int): The time created.register_podium_application.
+
+        **refresh_token** (string): The OAuth2 refresh token, None if the
+        server did not issue one.
+
+        **expires_in** (int): Seconds the token is valid for after created,
+        None if it does not expire.
     """
 
-    def __init__(self, token, token_type, created):
+    __slots__ = ("token", "token_type", "created", "refresh_token", "expires_in", "_json_header")
+
+    def __init__(self, token, token_type, created, refresh_token=None, expires_in=None):
         self.token = token
         self.token_type = token_type
         self.created = created
+        self.refresh_token = refresh_token
+        self.expires_in = expires_in
+        self._json_header = None
+
+    @property
+    def expires_at(self):
+        """
+        The time.time() the token expires at, None if it does not expire.
+        """
+        if self.expires_in is None or self.created is None:
+            return None
+        return self.created + self.expires_in
+
+    def update(self, token):
+        """
+        Replaces the values of this token with those of a refreshed token, so
+        every holder of this object uses the new token.
+        """
+        self.token = token.token
+        self.token_type = token.token_type
+        self.created = token.created
+        if token.refresh_token is not None:
+            self.refresh_token = token.refresh_token
+        self.expires_in = token.expires_in
+
+    @property
+    def json_header(self):
+        """
+        The header of requests authorized with this token, built once as an
+        immutable mapping and rebuilt only if the token changes.
+        """
+        cached = self._json_header
+        if cached is None or cached[0] is not self.token:
+            cached = self._json_header = (self.token, make_json_header("Bearer {}".format(self.token)))
+        return cached[1]
 
 
 def get_token_from_json(json):
@@ -30,4 +74,10 @@ def get_token_from_json(json):
     Return:
         PodiumToken: The PodiumToken object for the data.
     """
-    return PodiumToken(json["access_token"], json["token_type"], json["created_at"])
+    return PodiumToken(
+        json["access_token"],
+        json["token_type"],
+        json["created_at"],
+        refresh_token=json.get("refresh_token", None),
+        expires_in=json.get("expires_in", None),
+    )
@@ -37,6 +37,23 @@ class PodiumUser(object):
         None.
     """
 
+    __slots__ = (
+        "user_id",
+        "uri",
+        "username",
+        "name",
+        "description",
+        "avatar_url",
+        "profile_image_url",
+        "permalink",
+        "links",
+        "friendships_uri",
+        "followers_uri",
+        "friendship_uri",
+        "events_uri",
+        "venues_uri",
+    )
+
     def __init__(
         self,
         user_id,
@@ -14,6 +14,23 @@ class PodiumVenue(object):
         **name** (string): The Venue's name.
     """
 
+    __slots__ = (
+        "venue_id",
+        "uri",
+        "events_uri",
+        "updated",
+        "created",
+        "name",
+        "centerpoint",
+        "country_code",
+        "configuration",
+        "track_map_array",
+        "start_finish",
+        "finish",
+        "sector_points",
+        "length",
+    )
+
     def __init__(
         self,
         venue_id,
@@ -0,0 +1,286 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Resumable uploads of large logfiles. The presigned upload_url of a logfile
+takes the whole file in a single POST, it can not be sent in parts, so
+**ResumableUpload** makes sure a step that succeeded is not repeated: once
+the file was sent with **make_logfile_file_upload** the logfile is recorded
+in a manifest next to the file, and starting the upload again only
+registers it with **make_logfile_create**:
+
+    upload = make_logfile_resumable_upload(token, device_id, path, "rcp", "3.4.5")
+
+A file upload interrupted by a network error is sent again as a whole, up to
+max_attempts times.
+"""
+import json
+import os
+import threading
+
+from podium_api.logfiles import (
+    make_logfile_create,
+    make_logfile_file_upload,
+    make_logfile_new,
+)
+
+
+class UploadManifest(object):
+    """
+    The state of a logfile that was uploaded but not registered yet, saved
+    as json so it survives the application. A manifest only applies to the
+    file it was made for, it is ignored once the size or the modification
+    time of the file changed.
+
+    **Attributes:**
+        **path** (str): Path of the file uploaded.
+
+        **manifest_path** (str): Path of the manifest.
+
+        **size** (int): Size of the file.
+
+        **mtime** (float): Modification time of the file.
+
+        **file_key** (str): The file_key of the PodiumLogfile.
+
+        **eventdevice_id** (int): The eventdevice_id of the PodiumLogfile.
+    """
+
+    def __init__(self, path, manifest_path, file_key, eventdevice_id):
+        stat = os.stat(path)
+        self.path = path
+        self.manifest_path = manifest_path
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime
+        self.file_key = file_key
+        self.eventdevice_id = eventdevice_id
+
+    def save(self):
+        """
+        Writes the manifest, replacing the previous one at once so an
+        interruption never leaves a partial manifest.
+        """
+        state = {
+            "path": os.path.abspath(self.path),
+            "size": self.size,
+            "mtime": self.mtime,
+            "file_key": self.file_key,
+            "eventdevice_id": self.eventdevice_id,
+        }
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.manifest_path)
+
+    def remove(self):
+        """
+        Deletes the manifest, if it was saved.
+        """
+        try:
+            os.remove(self.manifest_path)
+        except FileNotFoundError:
+            pass
+
+    @classmethod
+    def load(cls, path, manifest_path):
+        """
+        Returns the manifest saved at manifest_path for the file at path,
+        None if there is none or if the file changed since it was saved.
+        """
+        try:
+            with open(manifest_path) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        manifest = cls(path, manifest_path, state["file_key"], state["eventdevice_id"])
+        if state["path"] != os.path.abspath(path) or state["size"] != manifest.size or state["mtime"] != manifest.mtime:
+            return None
+        return manifest
+
+
+class ResumableUpload(object):
+    """
+    Uploads a logfile like **make_logfile_upload**: prepares the upload with
+    **make_logfile_new**, sends the file to the upload_url then registers it
+    with **make_logfile_create**.
+
+    A file upload that ends with an error, such as a dropped connection, is
+    sent again to the same upload_url until max_attempts were made. Once
+    the file was uploaded an **UploadManifest** is saved at manifest_path,
+    if the logfile can not be registered starting an upload of the same file
+    again only registers it. The manifest is removed once the logfile is
+    created.
+
+    **Attributes:**
+        **token** (PodiumToken): The authentication token for this session.
+
+        **device_id** (int): The ID of the device associated with this
+        logfile.
+
+        **path** (str): Path of the logfile.
+
+        **source** (str): Source of the logfile, see **make_logfile_create**.
+
+        **source_ver** (str): Version of the source of the logfile.
+
+        **event_id** (int): The ID of the event to associate with this
+        logfile, None to let the server select it.
+
+        **max_attempts** (int): Maximum number of times the file is sent.
+        Defaults to 3.
+
+        **manifest_path** (str): Path of the manifest. Defaults to path
+        followed by '.upload'.
+
+        **manifest** (UploadManifest): The uploaded logfile, None until the
+        file was uploaded.
+
+        **attempts** (int): Number of times the file was sent.
+
+        **success_callback**, **failure_callback**, **progress_callback**,
+        **redirect_callback** (function): See **make_logfile_upload**.
+    """
+
+    def __init__(
+        self,
+        token,
+        device_id,
+        path,
+        source,
+        source_ver,
+        event_id=None,
+        max_attempts=3,
+        manifest_path=None,
+        success_callback=None,
+        failure_callback=None,
+        progress_callback=None,
+        redirect_callback=None,
+    ):
+        self.token = token
+        self.device_id = device_id
+        self.path = path
+        self.source = source
+        self.source_ver = source_ver
+        self.event_id = event_id
+        self.max_attempts = max_attempts
+        self.manifest_path = manifest_path if manifest_path is not None else path + ".upload"
+        self.success_callback = success_callback
+        self.failure_callback = failure_callback
+        self.progress_callback = progress_callback
+        self.redirect_callback = redirect_callback
+        self.manifest = None
+        self.attempts = 0
+        self._logfile = None
+        self._request = None
+        self._cancelled = False
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the upload, only registering the logfile if a manifest was
+        saved for the file.
+        """
+        manifest = UploadManifest.load(self.path, self.manifest_path)
+        if manifest is not None:
+            self.manifest = manifest
+            self._create()
+            return
+        self._track(
+            make_logfile_new(
+                self.token,
+                self.device_id,
+                self.event_id,
+                success_callback=self._on_new,
+                failure_callback=self._on_failure,
+            )
+        )
+
+    def cancel(self):
+        """
+        Stops the upload. A manifest already saved is kept.
+        """
+        with self._lock:
+            self._cancelled = True
+            req = self._request
+        if req is not None:
+            req.cancel()
+
+    def _track(self, req):
+        with self._lock:
+            self._request = req
+            cancelled = self._cancelled
+        if cancelled:
+            req.cancel()
+
+    def _on_failure(self, failure_type, result, data):
+        if not self._cancelled and self.failure_callback is not None:
+            self.failure_callback(failure_type, result, data)
+
+    def _on_new(self, logfile):
+        if self._cancelled:
+            return
+        self._logfile = logfile
+        self._send()
+
+    def _send(self):
+        self.attempts += 1
+        self._track(
+            make_logfile_file_upload(
+                self._logfile.upload_url,
+                self.path,
+                success_callback=self._on_uploaded,
+                failure_callback=self._on_upload_failed,
+                progress_callback=self.progress_callback,
+            )
+        )
+
+    def _on_upload_failed(self, failure_type, result, data):
+        if failure_type == "error" and self.attempts < self.max_attempts and not self._cancelled:
+            # the file is sent again as a whole
+            self._send()
+            return
+        self._on_failure(failure_type, result, data)
+
+    def _on_uploaded(self, result, data):
+        if self._cancelled:
+            return
+        manifest = UploadManifest(self.path, self.manifest_path, self._logfile.file_key, self._logfile.eventdevice_id)
+        manifest.save()
+        self.manifest = manifest
+        self._create()
+
+    def _create(self):
+        def on_redirect(redirect):
+            self.manifest.remove()
+            if self.redirect_callback is not None:
+                self.redirect_callback(redirect)
+
+        def on_success(result, data):
+            self.manifest.remove()
+            if self.success_callback is not None:
+                self.success_callback(result, data)
+
+        self._track(
+            make_logfile_create(
+                self.token,
+                self.manifest.file_key,
+                self.manifest.eventdevice_id,
+                self.source,
+                self.source_ver,
+                success_callback=on_success,
+                failure_callback=self._on_failure,
+                redirect_callback=on_redirect,
+            )
+        )
+
+
+def make_logfile_resumable_upload(token, device_id, path, source, source_ver, **kwargs):
+    """
+    Creates and starts a **ResumableUpload** of the logfile at path, kwargs
+    are passed to it.
+
+    Return:
+        ResumableUpload: The upload, its cancel method stops it.
+    """
+    upload = ResumableUpload(token, device_id, path, source, source_ver, **kwargs)
+    upload.start()
+    return upload
@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
-from podium_api.asyncreq import get_json_header_token, make_request_custom_success
+from podium_api.asyncreq import (
+    get_json_header_token,
+    make_local_response,
+    make_request_custom_success,
+)
 from podium_api.types.paged_response import get_paged_response_from_json
 from podium_api.types.venue import get_venue_from_json
 
@@ -14,6 +18,8 @@ def make_venue_get(
     redirect_callback=None,
     failure_callback=None,
     progress_callback=None,
+    store=None,
+    updated=None,
 ):
 
     """
@@ -51,8 +57,19 @@ def make_venue_get(
             on_progress(current_size (int), total_size (int), data (dict))
         Defaults to None.
 
+        store (VenueStore): If provided the venue is read from the store
+        when it is there instead of being requested, and stored once it is
+        received otherwise. See **podium_api.venuestore.VenueStore**.
+        Defaults to None.
+
+        updated (str): The updated timestamp of the venue if known, for
+        example from a list of venues. A stored venue with another timestamp
+        is requested again. Defaults to None, a stored venue is used until
+        it is older than the max_age of the store.
+
     Return:
-        UrlRequest: The request being made.
+        UrlRequest: The request being made, a LocalRequest if the venue was
+        read from the store.
 
     """
     params = {}
@@ -61,6 +78,20 @@ def make_venue_get(
     if quiet is not None:
         params["quiet"] = quiet
     header = get_json_header_token(token)
+    data = None
+    if store is not None:
+        venue_json = store.get(endpoint, updated=updated)
+        if venue_json is not None:
+            return make_local_response(
+                endpoint,
+                venue_success_handler,
+                {"venue": venue_json},
+                success_callback=success_callback,
+                failure_callback=failure_callback,
+                progress_callback=progress_callback,
+                redirect_callback=redirect_callback,
+            )
+        data = {"venue_store": store, "venue_uri": endpoint}
     return make_request_custom_success(
         endpoint,
         venue_success_handler,
@@ -71,6 +102,7 @@ def make_venue_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        data=data,
     )
 
 
@@ -85,6 +117,7 @@ def make_venues_get(
     redirect_callback=None,
     failure_callback=None,
     progress_callback=None,
+    store=None,
 ):
     """
     Request that returns a PodiumPagedRequest of venues.
@@ -124,6 +157,9 @@ def make_venues_get(
 
         per_page (int): Number per page of results, max of 100.
 
+        store (VenueStore): If provided the venues received are written to
+        the store, see **make_venue_get**. Defaults to None.
+
     Return:
         UrlRequest: The request being made.
 
@@ -140,6 +176,12 @@ def make_venues_get(
         params["per_page"] = per_page
 
     header = get_json_header_token(token)
+    data = None
+    payload_name = "venues"
+    if store is not None:
+        data = {"venue_store": store}
+        # the store needs the json of the venues
+        payload_name = None
     return make_request_custom_success(
         endpoint,
         venues_success_handler,
@@ -150,6 +192,8 @@ def make_venues_get(
         redirect_callback=redirect_callback,
         params=params,
         header=header,
+        data=data,
+        payload_name=payload_name,
     )
 
 
@@ -173,6 +217,9 @@ def venues_success_handler(req, results, data):
         None, this function instead calls a callback.
 
     """
+    store = data.get("venue_store", None)
+    if store is not None:
+        store.put_many(results["venues"])
     if data["success_callback"] is not None:
         data["success_callback"](get_paged_response_from_json(results, "venues"))
 
@@ -195,5 +242,8 @@ def venue_success_handler(req, results, data):
         None, this function instead calls a callback.
 
     """
+    store = data.get("venue_store", None)
+    if store is not None:
+        store.put(results["venue"], uri=data.get("venue_uri", None))
     if data["success_callback"] is not None:
         data["success_callback"](get_venue_from_json(results["venue"]))
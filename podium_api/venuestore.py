@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+Persistent store for venue payloads. Venues carry large geometry that rarely
+changes, such as the track map and the sector points, a **VenueStore** keeps
+the venues received from podium api in a SQLite file so **make_venue_get**
+can answer from disk on the next start. A venue looked up without its updated
+timestamp is only answered from disk for max_age seconds after it was stored,
+then it is requested again:
+
+    store = VenueStore("venues.sqlite")
+    make_venue_get(token, event.venue_uri, store=store, success_callback=...)
+"""
+import json
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS venues (
+    venue_id TEXT PRIMARY KEY,
+    uri TEXT NOT NULL,
+    updated TEXT,
+    stored REAL NOT NULL,
+    json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS venues_uri ON venues (uri);
+"""
+
+# a day, venues rarely change but a lookup without the updated timestamp of
+# the venue must pick up a change eventually
+DEFAULT_MAX_AGE = 24 * 60 * 60
+
+
+class VenueStore(object):
+    """
+    SQLite store of the json dicts of venues, keyed by venue_id and also
+    found by URI. A stored venue is replaced when a venue with a different
+    updated timestamp is put, and is not returned by **get** when the caller
+    knows of a different updated timestamp, or, when the caller does not
+    know the updated timestamp, when it was stored more than max_age seconds
+    ago.
+
+    The store can be shared by the threads of a transport.
+
+    **Attributes:**
+        **path** (str): Path of the SQLite file, ":memory:" keeps the venues
+        in memory only. Defaults to ":memory:".
+
+        **max_age** (float): Number of seconds a venue is returned by **get**
+        without an updated timestamp after it was stored or put again.
+        None returns it forever. Defaults to DEFAULT_MAX_AGE.
+    """
+
+    def __init__(self, path=":memory:", max_age=DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM venues").fetchone()[0]
+
+    def get(self, key, updated=None):
+        """
+        Returns the json dict of a stored venue.
+
+        Args:
+            key (str): The venue_id or the URI of the venue.
+
+        Kwargs:
+            updated (str): If provided the venue is only returned if it was
+            stored with this updated timestamp. Defaults to None, any stored
+            version is returned if it was stored less than max_age seconds
+            ago.
+
+        Return:
+            dict: The json dict of the venue, None if it is not stored or is
+            outdated.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT updated, stored, json FROM venues WHERE venue_id = ? OR uri = ? LIMIT 1", (str(key), str(key))
+            ).fetchone()
+        if row is None:
+            return None
+        if updated is not None:
+            if row[0] != updated:
+                return None
+        elif self.max_age is not None and time.time() - row[1] > self.max_age:
+            return None
+        return json.loads(row[2])
+
+    def put(self, venue_json, uri=None):
+        """
+        Stores the json dict of a venue received from podium api. If the same
+        version is already stored only its age is reset.
+
+        Kwargs:
+            uri (str): The URI the venue is found by. Defaults to None, the
+            URI in the json dict.
+
+        Return:
+            bool: True if the venue was written.
+        """
+        with self._lock, self._conn:
+            return self._write(venue_json, uri if uri is not None else venue_json["URI"])
+
+    def put_many(self, venue_jsons):
+        """
+        Stores the json dicts of several venues in one transaction, see
+        **put**.
+
+        Return:
+            int: Number of venues written.
+        """
+        with self._lock, self._conn:
+            return sum(1 for venue_json in venue_jsons if self._write(venue_json, venue_json["URI"]))
+
+    def _write(self, venue_json, uri):
+        venue_id = str(venue_json["id"])
+        updated = venue_json.get("updated", None)
+        row = self._conn.execute("SELECT uri, updated FROM venues WHERE venue_id = ?", (venue_id,)).fetchone()
+        if row is not None and updated is not None and row == (uri, updated):
+            self._conn.execute("UPDATE venues SET stored = ? WHERE venue_id = ?", (time.time(), venue_id))
+            return False
+        self._conn.execute(
+            "INSERT OR REPLACE INTO venues (venue_id, uri, updated, stored, json) VALUES (?, ?, ?, ?, ?)",
+            (venue_id, uri, updated, time.time(), json.dumps(venue_json, separators=(",", ":"))),
+        )
+        return True
+
+    def remove(self, key):
+        """
+        Removes a venue by venue_id or URI.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM venues WHERE venue_id = ? OR uri = ?", (str(key), str(key)))
+
+    def clear(self):
+        """
+        Removes every stored venue.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM venues")
+
+    def close(self):
+        """
+        Closes the SQLite connection.
+        """
+        with self._lock:
+            self._conn.close()
@@ -29,6 +29,11 @@ APP_ID = "YOUR_ID_HERE"
 APP_SECRET = "YOUR_SECRET_HERE"
 
 
+def fields(obj):
+    # podium_api types use __slots__ and have no __dict__
+    return {name: getattr(obj, name, None) for name in type(obj).__slots__}
+
+
 class NoStoredToken(Exception):
     pass
 
@@ -60,8 +65,8 @@ class PodiumApp(App):
     def create_eventdevice_for_event(self):
         event = self.events[0]
         device = self.devices[1]
-        print(event.__dict__)
-        print(device.__dict__)
+        print(fields(event))
+        print(fields(device))
         self.podium.eventdevices.create(
             event.event_id,
             device.device_id,
@@ -73,21 +78,21 @@ class PodiumApp(App):
         # podium.eventdevices.create()
 
     def eventdevices_success(self, redirect):
-        print("event device created", redirect.__dict__)
+        print("event device created", fields(redirect))
 
     def user_success(self, user):
-        print(user.__dict__)
+        print(fields(user))
         self.user = user
         # self.podium.events.get(endpoint=user.events_uri)
         # make_friendships_get(self.token, user.friendships_uri,
         #                      success_callback=self.friendship_success)
 
     def friendship_success2(self, paged_response):
-        print(paged_response.__dict__)
+        print(fields(paged_response))
 
     def devices_success(self, paged_response):
         print("devices")
-        print(paged_response.__dict__)
+        print(fields(paged_response))
         self.devices += paged_response.devices
         if paged_response.next_uri is not None:
             self.podium.devices.list(paged_response.next_uri, success_callback=self.devices_success)
@@ -95,7 +100,7 @@ class PodiumApp(App):
             self.create_eventdevice_for_event()
 
     def friendship_success(self, paged_response):
-        print(paged_response.__dict__)
+        print(fields(paged_response))
         # make_friendship_delete(self.token,
         #                        paged_response.users[0].friendship_uri)
         # make_friendships_get(self.token, self.user.friendships_uri,
@@ -131,7 +136,7 @@ class PodiumApp(App):
         )
 
     def device_success(self, device):
-        print(device, device.__dict__)
+        print(device, fields(device))
         self.podium.devices.update(
             device.uri,
             name="new name",
@@ -154,7 +159,7 @@ class PodiumApp(App):
         )
 
     def create_success(self, redirect_object):
-        print("redirect after create", redirect_object.__dict__)
+        print("redirect after create", fields(redirect_object))
         self.podium.events.update(
             redirect_object.location,
             title="new_title",
@@ -214,7 +219,7 @@ class PodiumApp(App):
             self.podium.devices.list(self.account.devices_uri, success_callback=self.devices_success)
 
     def users_success(self, user):
-        print(user, user.__dict__)
+        print(user, fields(user))
 
     def success(self, result):
         print(result)
@@ -0,0 +1,145 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer
+
+import podium_api
+from podium_api.aioapi import PodiumAsyncAPI
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.types.exceptions import PodiumRequestFailed
+from podium_api.types.paged_response import get_paged_response_from_json
+from podium_api.types.token import PodiumToken
+from tests.test_laps import make_lap_json
+from tests.test_transport import RecordingHandler
+
+LAPS_PAGE = {"total": 2, "laps": [make_lap_json(1), make_lap_json(2)], "nextURI": "/laps?start=2"}
+
+
+class AsyncHandler(RecordingHandler):
+    def do_GET(self):
+        if self.path.startswith("/paged/laps"):
+            self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+            self._send(200, LAPS_PAGE)
+        elif self.path.startswith("/slow"):
+            self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+            time.sleep(0.2)
+            self._send(200, {"lap": make_lap_json(9)})
+        elif self.path.startswith("/gzip"):
+            self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+            body = gzip.compress(json.dumps({"lap": make_lap_json(8)}).encode("utf-8"))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 10):
+                chunk = body[i : i + 10]
+                self.wfile.write("{:x}\r\n".format(len(chunk)).encode("ascii") + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path.startswith("/chunked"):
+            self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+            body = json.dumps({"lap": make_lap_json(7)}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for i in range(0, len(body), 10):
+                chunk = body[i : i + 10]
+                self.wfile.write("{:x}\r\n".format(len(chunk)).encode("ascii") + chunk + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            super(AsyncHandler, self).do_GET()
+
+
+class TestPodiumAsyncAPI(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), AsyncHandler)
+        self.server.requests = []
+        self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True)
+        self.server_thread.start()
+        self.url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        podium_api.register_podium_application("test_id", "test_secret", podium_url=self.url)
+        self.token = PodiumToken("test_token", "bearer", 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def run_api(self, coro_func, **transport_kwargs):
+        async def runner():
+            async with PodiumAsyncAPI(self.token, AsyncioTransport(**transport_kwargs)) as api:
+                return await coro_func(api)
+
+        return asyncio.run(runner())
+
+    def test_laps_list(self):
+        result = self.run_api(lambda api: api.laps.list(self.url + "/paged/laps", per_page=500))
+        expected = get_paged_response_from_json(LAPS_PAGE, "laps")
+        self.assertEqual(result.total, expected.total)
+        self.assertEqual(result.next_uri, expected.next_uri)
+        self.assertEqual([lap.uri for lap in result.laps], [lap.uri for lap in expected.laps])
+        self.assertEqual([lap.lap_time for lap in result.laps], [lap.lap_time for lap in expected.laps])
+        method, path, client, headers = self.server.requests[0]
+        self.assertIn("per_page=100", path)
+        self.assertEqual(headers["Authorization"], "Bearer test_token")
+
+    def test_laps_list_stream_payloads(self):
+        result = self.run_api(lambda api: api.laps.list(self.url + "/paged/laps"), stream_payloads=True)
+        self.assertEqual(result.total, 2)
+        self.assertEqual(result.next_uri, "/laps?start=2")
+        self.assertEqual([lap.uri for lap in result.laps], ["/laps/1", "/laps/2"])
+
+    def test_lap_get_chunked(self):
+        lap = self.run_api(lambda api: api.laps.get(self.url + "/chunked"))
+        self.assertEqual(lap.uri, "/laps/7")
+        self.assertEqual(lap.lap_time, 67.0)
+
+    def test_lap_get_gzip(self):
+        lap = self.run_api(lambda api: api.laps.get(self.url + "/gzip"))
+        self.assertEqual(lap.uri, "/laps/8")
+        self.assertIn("gzip", self.server.requests[0][3]["Accept-Encoding"])
+
+    def test_failure_raises(self):
+        with self.assertRaises(PodiumRequestFailed) as context:
+            self.run_api(lambda api: api.laps.get(self.url + "/missing"))
+        self.assertEqual(context.exception.failure_type, "failure")
+        self.assertEqual(context.exception.results, {"error": "not found"})
+
+    def test_error_raises(self):
+        with self.assertRaises(PodiumRequestFailed) as context:
+            self.run_api(lambda api: api.laps.get("http://127.0.0.1:1/laps/1"))
+        self.assertEqual(context.exception.failure_type, "error")
+
+    def test_redirect_resolves_to_headers(self):
+        headers = self.run_api(lambda api: api.laps.get(self.url + "/moved"))
+        self.assertEqual(headers["Location"], "/elsewhere")
+
+    def test_many_concurrent_requests(self):
+        async def fan_out(api):
+            return await asyncio.gather(*[api.laps.list(self.url + "/paged/laps") for i in range(200)])
+
+        results = self.run_api(fan_out, max_connections_per_host=4)
+        self.assertEqual(len(results), 200)
+        self.assertTrue(all(len(result.laps) == 2 for result in results))
+        ports = set(request[2][1] for request in self.server.requests)
+        self.assertLessEqual(len(ports), 4)
+
+    def test_timeout_excludes_waiting_for_a_connection(self):
+        async def fan_out(api):
+            return await asyncio.gather(*[api.laps.get(self.url + "/slow") for i in range(4)])
+
+        # the requests take 0.8 seconds in turn, each of them 0.2 seconds
+        laps = self.run_api(fan_out, max_connections_per_host=1, timeout=0.5)
+        self.assertEqual([lap.uri for lap in laps], ["/laps/9"] * 4)
+
+    def test_pool_timeout(self):
+        async def fan_out(api):
+            return await asyncio.gather(*[api.laps.get(self.url + "/slow") for i in range(2)])
+
+        with self.assertRaises(PodiumRequestFailed) as context:
+            self.run_api(fan_out, max_connections_per_host=1, pool_timeout=0.05)
+        self.assertEqual(context.exception.failure_type, "error")
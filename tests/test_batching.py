@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import unittest
+
+from mock import Mock, patch
+
+import podium_api
+from podium_api.batching import RacestatBatcher
+from podium_api.racestat import make_racestats_create, RacestatTracker
+from podium_api.types.token import PodiumToken
+
+
+def make_racestat(device_id, total_laps=1):
+    return {
+        "device_id": device_id,
+        "comp_number": str(device_id),
+        "comp_class": "P1",
+        "total_laps": total_laps,
+        "last_lap_time": 1.5,
+        "position_overall": device_id,
+        "position_in_class": device_id,
+        "comp_number_ahead": "",
+        "comp_number_behind": "",
+        "gap_to_ahead": 0.0,
+        "gap_to_behind": 0.0,
+        "laps_to_ahead": 0,
+        "laps_to_behind": 0,
+        "fc_flag": 1,
+        "comp_flag": 0,
+    }
+
+
+class FakeTimer(object):
+    def __init__(self, delay, callback):
+        self.delay = delay
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class TestRacestatBatcher(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+        self.timers = []
+        patcher = patch("podium_api.batching.make_racestats_create")
+        self.create = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def call_later(self, delay, callback):
+        timer = FakeTimer(delay, callback)
+        self.timers.append(timer)
+        return timer
+
+    def make_batcher(self, **kwargs):
+        return RacestatBatcher(self.token, 1, call_later=self.call_later, **kwargs)
+
+    def fire_timer(self):
+        timer = self.timers[-1]
+        self.assertFalse(timer.cancelled)
+        timer.callback()
+
+    def sent(self, index=-1):
+        return self.create.call_args_list[index][0][2]
+
+    def complete(self, index=-1):
+        self.create.call_args_list[index][1]["success_callback"]({}, {})
+
+    def test_coalesces_a_field_into_one_post(self):
+        batcher = self.make_batcher(flush_interval=1.0)
+        for lap in range(1, 4):
+            for device_id in range(60):
+                self.assertTrue(batcher.update(make_racestat(device_id, lap)))
+        self.assertEqual(self.create.call_count, 0)
+        self.assertEqual(len(self.timers), 1)
+        self.assertEqual(self.timers[0].delay, 1.0)
+        self.fire_timer()
+        self.assertEqual(self.create.call_count, 1)
+        self.assertEqual([racestat["device_id"] for racestat in self.sent()], list(range(60)))
+        self.assertTrue(all(racestat["total_laps"] == 3 for racestat in self.sent()))
+        self.assertEqual(batcher.coalesced, 120)
+
+    def test_size_threshold_flushes(self):
+        batcher = self.make_batcher(max_batch_size=10)
+        for device_id in range(10):
+            batcher.update(make_racestat(device_id))
+        self.assertEqual(self.create.call_count, 1)
+        self.assertEqual(len(self.sent()), 10)
+        self.assertTrue(self.timers[0].cancelled)
+
+    def test_backpressure(self):
+        success_cb = Mock()
+        batcher = self.make_batcher(max_batch_size=5, max_pending=8, success_callback=success_cb)
+        for device_id in range(5):
+            batcher.update(make_racestat(device_id))
+        self.assertTrue(batcher.saturated)
+        for device_id in range(5, 13):
+            self.assertTrue(batcher.update(make_racestat(device_id)))
+        # pending is full, new devices are refused but known ones coalesce
+        self.assertFalse(batcher.update(make_racestat(13)))
+        self.assertTrue(batcher.update(make_racestat(5, 2)))
+        self.assertEqual(self.create.call_count, 1)
+        self.complete(0)
+        success_cb.assert_called_with(self.sent(0))
+        # the waiting devices go out as soon as the first batch finished
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual([racestat["device_id"] for racestat in self.sent(1)], list(range(5, 10)))
+        self.assertEqual(self.sent(1)[0]["total_laps"], 2)
+        self.complete(1)
+        self.assertEqual(self.create.call_count, 3)
+        self.assertEqual(batcher.pending_count, 0)
+        self.assertEqual(batcher.sent_batches, 2)
+
+    def test_failed_batch_requeued(self):
+        failure_cb = Mock()
+        batcher = self.make_batcher(failure_callback=failure_cb)
+        batcher.update(make_racestat(1))
+        batcher.update(make_racestat(2))
+        self.fire_timer()
+        batcher.update(make_racestat(2, 5))
+        self.create.call_args[1]["failure_callback"]("failure", {"error": "boom"}, {})
+        failure_cb.assert_called_with("failure", {"error": "boom"}, {})
+        self.assertEqual(batcher.in_flight, 0)
+        self.fire_timer()
+        self.assertEqual([(r["device_id"], r["total_laps"]) for r in self.sent()], [(2, 5), (1, 1)])
+
+    def test_tracker_skips_unchanged_batch(self):
+        self.create.side_effect = make_racestats_create
+        batcher = self.make_batcher(tracker=RacestatTracker())
+        with patch("podium_api.asyncreq.UrlRequest.run"):
+            batcher.update(make_racestat(1))
+            self.fire_timer()
+            self.complete()
+            batcher.update(make_racestat(1))
+            self.fire_timer()
+        self.assertEqual(self.create.call_count, 2)
+        self.assertEqual(batcher.in_flight, 0)
+        self.assertEqual(batcher.tracker.suppressed, 1)
+
+    def test_close_flushes(self):
+        batcher = self.make_batcher()
+        batcher.update(make_racestat(1))
+        batcher.close()
+        self.assertEqual(self.create.call_count, 1)
+        self.assertFalse(batcher.update(make_racestat(2)))
+
+
+class TestRacestatsCreate(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_success_callback(self, mock_request):
+        success_cb = Mock()
+        req = make_racestats_create(self.token, 1, [make_racestat(1), make_racestat(2)], success_callback=success_cb)
+        self.assertEqual(req._method, "POST")
+        self.assertEqual(req.url, "https://podium.live/api/v1/events/1/racestats")
+        self.assertIn(b"racestat%5B1%5D%5Bdevice_id%5D=2", req.req_body)
+        req.on_success()(req, {})
+        self.assertEqual(success_cb.call_args[0][0], {})
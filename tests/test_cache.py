@@ -0,0 +1,147 @@
+import asyncio
+import threading
+import unittest
+
+import podium_api
+from podium_api.aioapi import PodiumAsyncAPI
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.cache import CachingTransport, get_freshness, parse_cache_control
+from podium_api.types.token import PodiumToken
+from podium_api.venues import make_venue_get
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+VENUE_JSON = {
+    "venue": {
+        "id": 1,
+        "URI": "/venues/1",
+        "events_uri": "/venues/1/events",
+        "updated": "2020-01-01T00:00:00Z",
+        "created": "2020-01-01T00:00:00Z",
+        "name": "Road America",
+        "track_map_array": [[43.79, -87.99]] * 100,
+    }
+}
+
+
+class CacheHandler(RecordingHandler):
+    def do_GET(self):
+        if not self.path.startswith("/venues"):
+            return super(CacheHandler, self).do_GET()
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        headers = {"ETag": self.server.etag, "Cache-Control": self.server.cache_control}
+        if self.headers.get("If-None-Match") == self.server.etag:
+            self.send_response(304)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+        self._send(200, VENUE_JSON, headers)
+
+    def do_PUT(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        self._send(200, {})
+
+
+class CacheTestCase(TransportTestCase):
+    def setUp(self):
+        super(CacheTestCase, self).setUp()
+        self.server.RequestHandlerClass = CacheHandler
+        self.server.cache_control = "no-cache"
+        self.server.etag = '"v1"'
+        self.cache = CachingTransport(self.transport, max_entries=2)
+        podium_api.register_podium_transport(self.cache)
+        self.token = PodiumToken("test_token", "bearer", 1)
+
+    def get_venue(self, path="/venues/1", token=None):
+        done = threading.Event()
+        results = []
+
+        def on_success(venue):
+            results.append(venue)
+            done.set()
+
+        make_venue_get(token or self.token, self.url + path, success_callback=on_success)
+        self.assertTrue(done.wait(5))
+        return results[0]
+
+
+class TestCachingTransport(CacheTestCase):
+    def test_revalidates_with_etag(self):
+        for i in range(5):
+            venue = self.get_venue()
+            self.assertEqual(venue.name, "Road America")
+            self.assertEqual(len(venue.track_map_array), 100)
+        self.assertEqual(self.cache.stats, {"hits": 0, "misses": 1, "revalidated": 4})
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertNotIn("If-None-Match", self.server.requests[0][3])
+        self.assertEqual(self.server.requests[1][3]["If-None-Match"], '"v1"')
+
+    def test_changed_response_is_a_miss(self):
+        self.get_venue()
+        self.server.etag = '"v2"'
+        self.get_venue()
+        self.get_venue()
+        self.assertEqual(self.cache.stats, {"hits": 0, "misses": 2, "revalidated": 1})
+        self.assertEqual(self.server.requests[1][3]["If-None-Match"], '"v1"')
+        self.assertEqual(self.server.requests[2][3]["If-None-Match"], '"v2"')
+
+    def test_max_age_skips_request(self):
+        self.server.cache_control = "max-age=60"
+        for i in range(3):
+            self.assertEqual(self.get_venue().venue_id, 1)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.cache.stats, {"hits": 2, "misses": 1, "revalidated": 0})
+
+    def test_no_store(self):
+        self.server.cache_control = "no-store"
+        self.get_venue()
+        self.get_venue()
+        self.assertEqual(len(self.cache), 0)
+        self.assertNotIn("If-None-Match", self.server.requests[1][3])
+
+    def test_keyed_by_token_and_lru(self):
+        self.server.cache_control = "max-age=60"
+        self.get_venue()
+        self.get_venue(token=PodiumToken("other_token", "bearer", 1))
+        self.assertEqual(len(self.server.requests), 2)
+        self.get_venue("/venues/1?expand=True")
+        # three entries with max_entries=2, the least recently used was dropped
+        self.assertEqual(len(self.cache), 2)
+        self.get_venue()
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_other_methods_invalidate(self):
+        self.server.cache_control = "max-age=60"
+        self.get_venue()
+        done = threading.Event()
+        self.cache.request(self.url + "/venues/1", method="PUT", body="", on_success=lambda req, result: done.set())
+        self.assertTrue(done.wait(5))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_async_hit(self):
+        self.server.cache_control = "max-age=60"
+
+        async def get_twice():
+            async with PodiumAsyncAPI(self.token, CachingTransport(AsyncioTransport())) as api:
+                first = await api.venues.get(self.url + "/venues/1")
+                second = await api.venues.get(self.url + "/venues/1")
+                return first, second, api.transport.stats
+
+        first, second, stats = asyncio.run(get_twice())
+        self.assertEqual(second.name, first.name)
+        self.assertEqual(stats, {"hits": 1, "misses": 1, "revalidated": 0})
+
+
+class TestCacheControl(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(
+            parse_cache_control('private, max-age=30, no-cache="x"'),
+            {
+                "private": True,
+                "max-age": "30",
+                "no-cache": "x",
+            },
+        )
+        self.assertEqual(get_freshness({"cache-control": "max-age=30"}, now=100), 130)
+        self.assertEqual(get_freshness({}, now=100), 100)
+        self.assertEqual(get_freshness({"Cache-Control": "no-store, max-age=30"}, now=100), None)
@@ -0,0 +1,167 @@
+import asyncio
+import threading
+
+import podium_api
+from podium_api.aioapi import PodiumAsyncAPI
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.asyncreq import make_request_default
+from podium_api.coalescing import CoalescingTransport
+from podium_api.types.token import PodiumToken
+from podium_api.users import make_user_get
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+USER_JSON = {
+    "user": {
+        "id": 1,
+        "URI": "/users/1",
+        "username": "driver",
+        "name": "Driver",
+        "description": "",
+        "avatar_url": "",
+        "profile_image_url": "",
+        "permalink": "",
+        "links": [],
+        "friendships_uri": "/users/1/friendships",
+        "followers_uri": "/users/1/followers",
+        "events_uri": "/users/1/events",
+        "venues_uri": "/users/1/venues",
+    }
+}
+
+
+class RaisingTransport(object):
+    def __init__(self, on_request):
+        self.on_request = on_request
+
+    def request(self, url, **kwargs):
+        self.on_request()
+        raise ValueError("Unsupported scheme")
+
+
+class SlowHandler(RecordingHandler):
+    def do_GET(self):
+        # hold the responses until the test made all of its requests
+        self.server.release.wait(5)
+        if self.path.startswith("/users"):
+            self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+            self._send(200, USER_JSON)
+        else:
+            super(SlowHandler, self).do_GET()
+
+
+class CoalescingTestCase(TransportTestCase):
+    def setUp(self):
+        super(CoalescingTestCase, self).setUp()
+        self.server.RequestHandlerClass = SlowHandler
+        self.server.release = threading.Event()
+        self.coalescing = CoalescingTransport(self.transport)
+        podium_api.register_podium_transport(self.coalescing)
+        self.token = PodiumToken("test_token", "bearer", 1)
+
+    def tearDown(self):
+        self.server.release.set()
+        super(CoalescingTestCase, self).tearDown()
+
+
+class TestCoalescingTransport(CoalescingTestCase):
+    def test_identical_gets_share_a_request(self):
+        users = []
+        reqs = [make_user_get(self.token, self.url + "/users/1", success_callback=users.append) for i in range(5)]
+        self.assertEqual(self.coalescing.in_flight_count, 1)
+        self.server.release.set()
+        for req in reqs:
+            self.assertTrue(req.wait(5))
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(self.coalescing.coalesced, 4)
+        self.assertEqual([user.username for user in users], ["driver"] * 5)
+        # every caller gets its own object
+        self.assertEqual(len(set(id(user) for user in users)), 5)
+        self.assertEqual(self.coalescing.in_flight_count, 0)
+
+    def test_different_auth_or_params_are_not_shared(self):
+        reqs = [
+            make_user_get(self.token, self.url + "/users/1"),
+            make_user_get(PodiumToken("other_token", "bearer", 1), self.url + "/users/1"),
+            make_user_get(self.token, self.url + "/users/1", expand=True),
+        ]
+        self.assertEqual(self.coalescing.in_flight_count, 3)
+        self.server.release.set()
+        for req in reqs:
+            self.assertTrue(req.wait(5))
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.coalescing.coalesced, 0)
+
+    def test_failures_and_cancel(self):
+        failures = []
+        reqs = [
+            make_request_default(
+                self.url + "/missing", failure_callback=lambda ftype, res, data: failures.append((ftype, res))
+            )
+            for i in range(3)
+        ]
+        reqs[0].cancel()
+        self.server.release.set()
+        for req in reqs[1:]:
+            self.assertTrue(req.wait(5))
+        self.assertEqual(failures, [("failure", {"error": "not found"})] * 2)
+        self.assertEqual(reqs[1].resp_status, 404)
+
+    def test_cancel_all_cancels_shared_request(self):
+        reqs = [make_user_get(self.token, self.url + "/users/1") for i in range(3)]
+        shared = list(self.coalescing._in_flight.values())[0]
+        reqs[0].cancel()
+        reqs[1].cancel()
+        self.assertFalse(shared.request.cancelled)
+        self.assertEqual(self.coalescing.in_flight_count, 1)
+        reqs[2].cancel()
+        self.assertTrue(shared.request.cancelled)
+        self.assertEqual(self.coalescing.in_flight_count, 0)
+
+    def test_late_response_of_cancelled_request(self):
+        first = make_user_get(self.token, self.url + "/users/1")
+        key, cancelled = list(self.coalescing._in_flight.items())[0]
+        first.cancel()
+        users = []
+        second = make_user_get(self.token, self.url + "/users/1", success_callback=users.append)
+        self.assertEqual(self.coalescing.in_flight_count, 1)
+        # the cancelled request is answered anyway, the cancel came too late
+        self.coalescing._complete(key, cancelled, "on_success", None, USER_JSON)
+        self.assertFalse(second.is_finished)
+        self.assertEqual(self.coalescing.in_flight_count, 1)
+        self.server.release.set()
+        self.assertTrue(second.wait(5))
+        self.assertEqual([user.username for user in users], ["driver"])
+        self.assertEqual(self.coalescing.in_flight_count, 0)
+
+    def test_inner_request_raises(self):
+        errors = []
+        joined = []
+
+        def join():
+            joined.append(
+                make_request_default(
+                    "bad://host/users/1", failure_callback=lambda ftype, res, data: errors.append((ftype, res))
+                )
+            )
+
+        coalescing = CoalescingTransport(RaisingTransport(join))
+        podium_api.register_podium_transport(coalescing)
+        self.assertRaises(ValueError, make_request_default, "bad://host/users/1")
+        self.assertTrue(joined[0].wait(5))
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0][0], "error")
+        self.assertIsInstance(joined[0].error, ValueError)
+        self.assertEqual(coalescing.in_flight_count, 0)
+
+    def test_async(self):
+        async def get_users():
+            transport = CoalescingTransport(AsyncioTransport())
+            async with PodiumAsyncAPI(self.token, transport) as api:
+                users = await asyncio.gather(*[api.users.get(self.url + "/users/1") for i in range(3)])
+                return users, transport.coalesced
+
+        self.server.release.set()
+        users, coalesced = asyncio.run(get_users())
+        self.assertEqual([user.user_id for user in users], [1, 1, 1])
+        self.assertEqual(coalesced, 2)
+        self.assertEqual(len(self.server.requests), 1)
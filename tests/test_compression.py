@@ -0,0 +1,76 @@
+import base64
+import gzip
+import json
+from urllib.parse import parse_qs
+
+import podium_api
+from podium_api.asyncreq import make_request_default
+from podium_api.compression import compress_body, CompressingTransport
+from podium_api.presets import make_preset_create
+from podium_api.types.token import PodiumToken
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+class GzipHandler(RecordingHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        self.server.sizes.append(len(body))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        self.server.bodies.append(body.decode("utf-8"))
+        self._send(201, {})
+
+
+class TestCompressingTransport(TransportTestCase):
+    def setUp(self):
+        super(TestCompressingTransport, self).setUp()
+        self.server.RequestHandlerClass = GzipHandler
+        self.server.sizes = []
+        self.server.bodies = []
+        self.compressing = CompressingTransport(self.transport)
+        podium_api.register_podium_transport(self.compressing)
+
+    def test_preset_create(self):
+        # a preview image with the redundancy of a real screenshot
+        image = bytes(range(256)) * 400
+        preset = json.dumps({"screens": [{"gauges": ["rpm", "speed", "oil_temp"] * 20}] * 10})
+        req = make_preset_create(
+            PodiumToken("test_token", "bearer", 1),
+            "Dash",
+            "notes",
+            preset,
+            "dashboard",
+            False,
+            "preview.png",
+            base64.b64encode(image).decode("ascii"),
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(self.server.requests[0][3]["Content-Encoding"], "gzip")
+        form = parse_qs(self.server.bodies[0])
+        self.assertEqual(base64.b64decode(form["preset[preview_image_data]"][0]), image)
+        self.assertEqual(form["preset[preset_data]"], [preset])
+        self.assertEqual(self.compressing.compressed, 1)
+        self.assertLess(self.server.sizes[0] * 10, len(self.server.bodies[0]))
+        self.assertEqual(self.compressing.bytes_saved, len(self.server.bodies[0]) - self.server.sizes[0])
+
+    def test_small_bodies(self):
+        req = make_request_default(self.url + "/small", method="POST", body={"name": "value"})
+        self.assertTrue(req.wait(5))
+        self.assertNotIn("Content-Encoding", self.server.requests[0][3])
+        self.assertEqual(self.server.bodies, ["name=value"])
+        self.assertEqual(self.compressing.compressed, 0)
+
+    def test_hosts(self):
+        self.compressing.hosts = frozenset(("podium.live",))
+        self.assertFalse(self.compressing.should_compress(self.url + "/big", "POST", "a" * 2048, {}))
+        self.assertTrue(self.compressing.should_compress("https://podium.live/big", "POST", "a" * 2048, {}))
+        self.assertFalse(self.compressing.should_compress("https://podium.live/big", "GET", "a" * 2048, {}))
+        self.assertFalse(
+            self.compressing.should_compress("https://podium.live/big", "POST", "a" * 2048, {"Content-Encoding": "br"})
+        )
+
+    def test_compress_body(self):
+        self.assertEqual(gzip.decompress(compress_body("données")), "données".encode("utf-8"))
+        self.assertEqual(compress_body(b"abc" * 100), compress_body(b"abc" * 100))
@@ -0,0 +1,138 @@
+import gzip
+import json
+import unittest
+
+import podium_api
+from podium_api import decoding
+from podium_api.decoding import find_json_decoder, get_json_decoder, PagedPayloadParser
+from podium_api.laps import make_laps_get
+from podium_api.transport import decode_result, PooledTransport
+from podium_api.types.lap import PodiumLap
+from podium_api.types.paged_response import PodiumPagedResponse
+from podium_api.types.token import PodiumToken
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+def make_laps_page(count):
+    laps = [
+        {
+            "URI": "https://podium.live/api/v1/events/1/devices/2/laps/{}".format(number),
+            "raw_data_uri": "https://podium.live/api/v1/events/1/devices/2/laps/{}/raw".format(number),
+            "lap_number": number,
+            "end_time": 1500000000.5 + number,
+            "lap_time": 90.25,
+            "aggregates": {"Speed": {"min": 0, "max": 180.5}, "Notes": 'a "quoted" ] } note\\'},
+        }
+        for number in range(1, count + 1)
+    ]
+    return {"laps": laps, "total": count, "nextURI": "https://podium.live/api/v1/laps?start=100", "prevURI": None}
+
+
+class TestPagedPayloadParser(unittest.TestCase):
+    def parse(self, body, chunk_size, **kwargs):
+        parser = PagedPayloadParser("laps", **kwargs)
+        for i in range(0, len(body), chunk_size):
+            parser.feed(body[i : i + chunk_size])
+        return parser.close()
+
+    def test_chunks(self):
+        page = make_laps_page(20)
+        for indent in (None, 2):
+            body = json.dumps(page, indent=indent).encode("utf-8")
+            for chunk_size in (1, 7, 1000, len(body)):
+                result = self.parse(body, chunk_size, converter=lambda item: item)
+                self.assertEqual(result.payload, page["laps"])
+                self.assertEqual(result.total, 20)
+                self.assertEqual(result.next_uri, page["nextURI"])
+                self.assertIsNone(result.prev_uri)
+                self.assertEqual(result.laps, page["laps"])
+
+    def test_items_converted_as_read(self):
+        body = json.dumps(make_laps_page(3)).encode("utf-8")
+        parser = PagedPayloadParser("laps", item_callback=lambda lap: seen.append(lap))
+        seen = []
+        # the first lap is complete before the second one starts
+        first_end = body.index(b'}}, {"URI"') + 2
+        parser.feed(body[:first_end])
+        self.assertEqual(len(seen), 1)
+        self.assertIsInstance(seen[0], PodiumLap)
+        self.assertEqual(seen[0].lap_number, 1)
+        parser.feed(body[first_end:])
+        self.assertEqual([lap.lap_number for lap in parser.close().payload], [1, 2, 3])
+        self.assertEqual(len(seen), 3)
+
+    def test_items_not_kept(self):
+        body = json.dumps(make_laps_page(3)).encode("utf-8")
+        seen = []
+        parser = PagedPayloadParser("laps", item_callback=seen.append, keep_items=False)
+        parser.feed(body)
+        page = parser.close()
+        self.assertEqual([lap.lap_number for lap in seen], [1, 2, 3])
+        self.assertEqual(page.payload, [])
+        self.assertEqual(page.total, 3)
+
+    def test_invalid(self):
+        body = json.dumps(make_laps_page(2)).encode("utf-8")
+        parser = PagedPayloadParser("laps")
+        parser.feed(body[:-10])
+        self.assertRaises(ValueError, parser.close)
+        parser = PagedPayloadParser("laps")
+        parser.feed(b'{"events": [], "total": 0}')
+        self.assertRaises(KeyError, parser.close)
+        self.assertRaises(ValueError, PagedPayloadParser("laps").feed, b"[1, 2]")
+
+
+class TestJsonDecoder(unittest.TestCase):
+    def tearDown(self):
+        podium_api.unregister_podium_json_decoder()
+
+    def test_default(self):
+        self.assertIs(get_json_decoder(), find_json_decoder())
+        self.assertIs(find_json_decoder(("not_a_json_package", "json")), json.loads)
+        self.assertRaises(ImportError, find_json_decoder, ("not_a_json_package",))
+
+    def test_register(self):
+        calls = []
+
+        def loads(data):
+            calls.append(data)
+            return json.loads(data)
+
+        podium_api.register_podium_json_decoder(loads)
+        self.assertEqual(decode_result(b'{"a": 1}', "application/json; charset=utf-8"), {"a": 1})
+        self.assertEqual(calls, [b'{"a": 1}'])
+        self.assertEqual(decode_result(b"not json", "application/json"), "not json")
+        podium_api.unregister_podium_json_decoder()
+        self.assertIs(get_json_decoder(), decoding.DEFAULT_JSON_DECODER)
+
+
+class LapsHandler(RecordingHandler):
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        body = gzip.compress(json.dumps(make_laps_page(100)).encode("utf-8"))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestStreamPayloads(TransportTestCase):
+    def setUp(self):
+        super(TestStreamPayloads, self).setUp()
+        self.server.RequestHandlerClass = LapsHandler
+        self.transport.close()
+        self.transport = PooledTransport(max_workers=1, chunk_size=1024, stream_payloads=True)
+        podium_api.register_podium_transport(self.transport)
+
+    def test_laps_get(self):
+        results = []
+        req = make_laps_get(PodiumToken("test_token", "bearer", 1), self.url + "/laps", success_callback=results.append)
+        self.assertTrue(req.wait(5))
+        # the request result is the page parsed while it was read
+        self.assertIsInstance(req.result, PodiumPagedResponse)
+        self.assertIs(results[0], req.result)
+        self.assertEqual(len(results[0].payload), 100)
+        self.assertEqual(results[0].payload[99].lap_number, 100)
+        self.assertEqual(results[0].total, 100)
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+
+import podium_api
+from podium_api.asyncreq import get_default_transport
+from podium_api.transport import UrlRequestTransport
+
+IMPORT_SCRIPT = """
+import sys
+
+import {module}
+print("kivy" in sys.modules)
+"""
+
+
+def imports_kivy(module):
+    output = subprocess.check_output([sys.executable, "-c", IMPORT_SCRIPT.format(module=module)])
+    return output.decode("utf-8").strip() == "True"
+
+
+class TestHeadlessImport(unittest.TestCase):
+    def check_module(self, module):
+        # how long the import takes is measured by benchmarks/bench_import.py
+        self.assertFalse(imports_kivy(module), "importing {} loaded kivy".format(module))
+
+    def test_import_api(self):
+        self.check_module("podium_api.api")
+
+    def test_import_aioapi(self):
+        self.check_module("podium_api.aioapi")
+
+
+class TestLogger(unittest.TestCase):
+    def tearDown(self):
+        podium_api.unregister_podium_logger()
+
+    def test_registered_logger(self):
+        logger = object()
+        podium_api.register_podium_logger(logger)
+        self.assertIs(podium_api.get_logger(), logger)
+
+    def test_default_logger(self):
+        if "kivy.logger" in sys.modules:
+            self.assertIs(podium_api.get_logger(), sys.modules["kivy.logger"].Logger)
+        else:
+            self.assertEqual(podium_api.get_logger().name, "podium_api")
+
+
+class TestDefaultTransport(unittest.TestCase):
+    def test_default_transport(self):
+        try:
+            import kivy  # noqa: F401
+        except ImportError:
+            self.assertNotIsInstance(get_default_transport(), UrlRequestTransport)
+        else:
+            self.assertIsInstance(get_default_transport(), UrlRequestTransport)
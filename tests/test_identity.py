@@ -0,0 +1,103 @@
+import asyncio
+import unittest
+
+from mock import patch
+
+import podium_api
+from podium_api.aioapi import PodiumAsyncAPI
+from podium_api.api import PodiumAPI
+from podium_api.identity import IdentityMap
+from podium_api.types.event import get_event_from_json
+from podium_api.types.paged_response import get_paged_response_from_json
+from podium_api.types.token import PodiumToken
+from podium_api.types.venue import get_venue_from_json
+
+
+class TestIdentityMap(unittest.TestCase):
+    def setUp(self):
+        self.identity_map = IdentityMap(max_entries=2)
+        self.venue_json = {
+            "id": 1,
+            "URI": "/venues/1",
+            "events_uri": "/venues/1/events",
+            "created": "2020-01-01T00:00:00Z",
+            "updated": "2020-01-01T00:00:00Z",
+            "name": "Road America",
+        }
+
+    def test_updates_in_place(self):
+        venue = self.identity_map.intern(get_venue_from_json(self.venue_json))
+        newer = get_venue_from_json(dict(self.venue_json, name="Elkhart Lake", updated="2020-02-01T00:00:00Z"))
+        self.assertIs(self.identity_map.intern(newer), venue)
+        self.assertEqual(venue.name, "Elkhart Lake")
+        # an older response does not overwrite newer data
+        self.assertIs(self.identity_map.intern(get_venue_from_json(self.venue_json)), venue)
+        self.assertEqual(venue.name, "Elkhart Lake")
+        self.assertIs(self.identity_map.get("/venues/1"), venue)
+        self.assertEqual(self.identity_map.hits, 2)
+
+    def test_less_expanded_response_keeps_values(self):
+        venue = self.identity_map.intern(get_venue_from_json(dict(self.venue_json, track_map_array=[[43.79, -87.99]])))
+        self.assertIsNotNone(venue.track_map_array)
+        newer = get_venue_from_json(dict(self.venue_json, name="Elkhart Lake", updated="2020-02-01T00:00:00Z"))
+        self.assertIsNone(newer.track_map_array)
+        self.assertIs(self.identity_map.intern(newer), venue)
+        self.assertEqual(venue.name, "Elkhart Lake")
+        self.assertEqual(venue.track_map_array, [[43.79, -87.99]])
+
+    def test_paged_response_and_eviction(self):
+        page = get_paged_response_from_json(
+            {
+                "total": 3,
+                "venues": [dict(self.venue_json, id=i, URI="/venues/{}".format(i)) for i in range(3)],
+            },
+            "venues",
+        )
+        known = self.identity_map.intern(get_venue_from_json(self.venue_json))
+        page = self.identity_map.intern_result(page)
+        # the venues of the page are interned as they are built
+        self.assertEqual(len(self.identity_map), 1)
+        self.assertEqual([venue.uri for venue in page.venues], ["/venues/0", "/venues/1", "/venues/2"])
+        self.assertIs(page.venues[1], known)
+        # /venues/0 was the least recently returned when /venues/2 arrived
+        self.assertEqual(len(self.identity_map), 2)
+        self.assertNotIn("/venues/0", self.identity_map)
+        self.assertEqual(self.identity_map.evicted, 1)
+
+    def test_objects_without_uri(self):
+        self.assertEqual(self.identity_map.intern_result({"a": 1}), {"a": 1})
+        self.assertEqual(len(self.identity_map), 0)
+
+
+class TestIdentityMapAPI(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+        self.identity_map = IdentityMap()
+        self.event_json = {"id": 1, "URI": "/events/1", "title": "Race"}
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    @patch("podium_api.api.make_event_get")
+    def test_callback_api(self, mock_get):
+        api = PodiumAPI(self.token, identity_map=self.identity_map)
+        results = []
+        api.events.get("/events/1", success_callback=results.append)
+        api.events.get("/events/1", success_callback=results.append)
+        for call in mock_get.call_args_list:
+            call[1]["success_callback"](get_event_from_json(self.event_json))
+        self.assertIs(results[0], results[1])
+        self.assertIs(self.identity_map.get("/events/1"), results[0])
+
+    def test_async_api(self):
+        async def fake_call(transport, make_func, token, *args, **kwargs):
+            return get_event_from_json(self.event_json)
+
+        async def get_twice():
+            api = PodiumAsyncAPI(self.token, identity_map=self.identity_map)
+            return await api.events.get("/events/1"), await api.events.get("/events/1")
+
+        with patch("podium_api.aioapi.call_async", fake_call):
+            first, second = asyncio.run(get_twice())
+        self.assertIs(first, second)
@@ -1,12 +1,15 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import math
 import unittest
+from array import array
 
 from mock import Mock, patch
 
 import podium_api
-from podium_api.laps import make_lap_get, make_laps_get
+from podium_api.laps import make_lap_get, make_laps_get, make_laps_table_get
 from podium_api.types.lap import get_lap_from_json
+from podium_api.types.laptable import get_laptable_from_json, get_numpy, LapTable
 from podium_api.types.token import PodiumToken
 
 try:
@@ -166,6 +169,12 @@ class TestFriendshipGet(unittest.TestCase):
         self.result = get_lap_from_json(self.result_json)
         self.check_results()
 
+    def test_lap_is_compact(self):
+        lap = get_lap_from_json(self.result_json)
+        self.assertFalse(hasattr(lap, "__dict__"))
+        with self.assertRaises(AttributeError):
+            lap.not_a_field = 1
+
     def success_cb(self, result):
         self.result = result
 
@@ -255,3 +264,136 @@ class TestFriendshipGet(unittest.TestCase):
 
     def tearDown(self):
         podium_api.unregister_podium_application()
+
+
+def make_lap_json(number, **fields):
+    """
+    Returns the json of lap number as received from podium api, fields
+    replace or add values. Shared by the tests of the other modules.
+    """
+    json = {
+        "URI": "/laps/{}".format(number),
+        "raw_data_uri": "/laps/{}/raw".format(number),
+        "lap_number": number,
+        "end_time": "now",
+        "lap_time": 60.0 + number,
+    }
+    json.update(fields)
+    return json
+
+
+class TestLapTable(unittest.TestCase):
+    # the columns and queries without numpy, whether it is installed or not
+    use_numpy = False
+
+    def setUp(self):
+        if not self.use_numpy:
+            patcher = patch("podium_api.types.laptable.get_numpy", return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+        self.pages = [
+            {
+                "total": 5,
+                "laps": [
+                    make_lap_json(
+                        1, lap_time=2.5, aggregates=[{"channel": "Speed", "min": 10, "max": 120, "avg": 80.0}]
+                    ),
+                    make_lap_json(
+                        2, lap_time=2.0, aggregates=[{"channel": "Speed", "min": 12, "max": 130, "avg": 90.0}]
+                    ),
+                    make_lap_json(3, lap_time=2.25),
+                ],
+                "nextURI": "test/laps?start=3",
+            },
+            {
+                "total": 5,
+                "laps": [
+                    make_lap_json(
+                        4,
+                        lap_time=2.75,
+                        aggregates={"Speed": {"min": 11, "max": 125, "avg": 85.0}, "RPM": {"max": 7000}},
+                    ),
+                    make_lap_json(5, lap_time=None),
+                ],
+                "prevURI": "test/laps?start=0",
+            },
+        ]
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def assertColumnEqual(self, column, expected):
+        self.assertEqual(len(column), len(expected))
+        for value, expected_value in zip(column, expected):
+            if expected_value is None:
+                self.assertTrue(math.isnan(value))
+            else:
+                self.assertAlmostEqual(value, expected_value)
+
+    def test_columns_from_pages(self):
+        table = get_laptable_from_json(self.pages)
+        self.assertEqual(len(table), 5)
+        self.assertEqual(table.uri[0], "/laps/1")
+        self.assertEqual(table.total, 5)
+        self.assertEqual(table.next_uri, None)
+        self.assertEqual(table.prev_uri, None)
+        self.assertColumnEqual(table.lap_number, [1, 2, 3, 4, 5])
+        self.assertColumnEqual(table.lap_time, [2.5, 2.0, 2.25, 2.75, None])
+        self.assertColumnEqual(table.channel("Speed", "max"), [120, 130, None, 125, None])
+        self.assertColumnEqual(table.channel("RPM", "max"), [None, None, None, 7000, None])
+        self.assertEqual(sorted(table.channels), [("RPM", "max"), ("Speed", "avg"), ("Speed", "max"), ("Speed", "min")])
+        with self.assertRaises(KeyError):
+            table.channel("RPM", "min")
+
+    def test_column_type(self):
+        table = get_laptable_from_json(self.pages)
+        column = table.channel("Speed", "max")
+        if self.use_numpy:
+            self.assertIsInstance(column, get_numpy().ndarray)
+            self.assertFalse(column.flags.writeable)
+            self.assertIs(table.channel("Speed", "max"), column)
+        else:
+            self.assertIsInstance(column, array)
+
+    def test_bool_aggregate_ignored(self):
+        table = get_laptable_from_json(
+            {"laps": [make_lap_json(1, aggregates=[{"channel": "Speed", "max": 120, "valid": True}])]}
+        )
+        self.assertEqual(sorted(table.channels), [("Speed", "max")])
+
+    def test_queries(self):
+        table = get_laptable_from_json(self.pages)
+        self.assertEqual(table.best_lap(), 1)
+        self.assertEqual(table.best_lap(("Speed", "min")), 0)
+        self.assertColumnEqual(table.rolling_average(2), [2.25, 2.125, 2.5, None])
+        self.assertAlmostEqual(table.percentile(50), 2.375)
+        self.assertAlmostEqual(table.percentile(100), 2.75)
+        self.assertAlmostEqual(table.percentile(0, ("Speed", "avg")), 80.0)
+        self.assertEqual(table.best_lap(("RPM", "max")), 3)
+
+    def test_concat(self):
+        first = get_laptable_from_json(self.pages[0])
+        self.assertEqual(first.next_uri, "test/laps?start=3")
+        table = LapTable.concat([first, get_laptable_from_json(self.pages[1])])
+        self.assertEqual(len(table), 5)
+        self.assertColumnEqual(table.channel("RPM", "max"), [None, None, None, 7000, None])
+        self.assertColumnEqual(table.channel("Speed", "avg"), [80.0, 90.0, None, 85.0, None])
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_laps_table_get(self, mock_request):
+        success_cb = Mock()
+        req = make_laps_table_get(self.token, "test/laps", start=0, per_page=500, success_callback=success_cb)
+        self.assertEqual(req._method, "GET")
+        self.assertTrue("per_page=100" in req.url)
+        self.assertEqual(req.req_headers["Authorization"], "Bearer {}".format(self.token.token))
+        req.on_success()(req, self.pages[0])
+        table = success_cb.call_args[0][0]
+        self.assertIsInstance(table, LapTable)
+        self.assertColumnEqual(table.lap_time, [2.5, 2.0, 2.25])
+
+
+@unittest.skipUnless(get_numpy(), "numpy is not installed")
+class TestLapTableNumpy(TestLapTable):
+    use_numpy = True
@@ -1,15 +1,24 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import asyncio
+import os
+import tempfile
+import time
 import unittest
+from urllib.parse import parse_qs
 
 from mock import Mock, patch
 
 import podium_api
+from podium_api.aioapi import PodiumAsyncAPI
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.encoding import FileBody, MultipartBody
 from podium_api.logfiles import (
     create_logfile_redirect_handler,
     make_logfile_create,
     make_logfile_get,
     make_logfile_new,
+    make_logfile_upload,
     make_logfiles_get,
 )
 from podium_api.types.logfile import get_logfile_from_json
@@ -21,6 +30,8 @@ try:
 except:
     from urllib import urlencode
 
+from tests.test_transport import RecordingHandler, TransportTestCase
+
 
 class TestLogfileCreate(unittest.TestCase):
     def setUp(self):
@@ -585,3 +596,111 @@ class TestLogfilesGet(unittest.TestCase):
 
     def tearDown(self):
         podium_api.unregister_podium_application()
+
+
+class UploadHandler(RecordingHandler):
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        upload_url = "http://127.0.0.1:{}/upload".format(self.server.server_address[1])
+        self._send(
+            200,
+            {"logfile": {"file_key": "key1", "eventdevice_id": 5, "status": -1, "upload_url": upload_url}},
+        )
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        if self.path == "/upload":
+            self.server.uploaded = body
+            self._send(204, {})
+        else:
+            self.server.created = parse_qs(body.decode("utf-8"))
+            self._send(303, {"location": "/api/v1/logfiles/7"}, {"Location": "/api/v1/logfiles/7"})
+
+
+class TestLogfileUpload(TransportTestCase):
+    def setUp(self):
+        super(TestLogfileUpload, self).setUp()
+        self.server.RequestHandlerClass = UploadHandler
+        self.token = PodiumToken("test_token", "bearer", 1)
+        self.content = os.urandom(300000)
+        fd, self.path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.content)
+
+    def tearDown(self):
+        os.remove(self.path)
+        super(TestLogfileUpload, self).tearDown()
+
+    def test_upload(self):
+        redirects = []
+        failures = []
+        progress = []
+        req = make_logfile_upload(
+            self.token,
+            3,
+            self.path,
+            "rcp",
+            "3.4.5",
+            redirect_callback=redirects.append,
+            failure_callback=lambda *args: failures.append(args),
+            progress_callback=lambda current, total, data: progress.append((current, total)),
+        )
+        self.assertTrue(req.wait(5))
+        for i in range(500):
+            if redirects or failures:
+                break
+            time.sleep(0.01)
+        self.assertEqual(failures, [])
+        self.assertEqual(redirects[0].location, "/api/v1/logfiles/7")
+        self.assertEqual([request[1] for request in self.server.requests][1:], ["/upload", "/api/v1/logfiles"])
+        upload_headers = self.server.requests[1][3]
+        self.assertNotIn("Authorization", upload_headers)
+        self.assertTrue(upload_headers["Content-Type"].startswith("multipart/form-data; boundary="))
+        self.assertIn(self.content, self.server.uploaded)
+        self.assertIn(os.path.basename(self.path).encode("utf-8"), self.server.uploaded)
+        total = len(self.server.uploaded)
+        self.assertEqual(progress[0], (0, total))
+        self.assertEqual(progress[-1], (total, total))
+        self.assertEqual(self.server.created["logfile[file_key]"], ["key1"])
+        self.assertEqual(self.server.created["logfile[eventdevice_id]"], ["5"])
+
+    def test_async_upload(self):
+        progress = []
+
+        async def upload():
+            async with PodiumAsyncAPI(self.token, AsyncioTransport()) as api:
+                return await api.logfiles.upload(
+                    3,
+                    self.path,
+                    "rcp",
+                    "3.4.5",
+                    progress_callback=lambda current, total, data: progress.append(current),
+                )
+
+        redirect = asyncio.run(upload())
+        self.assertEqual(redirect.location, "/api/v1/logfiles/7")
+        self.assertIn(self.content, self.server.uploaded)
+        self.assertEqual(progress[-1], len(self.server.uploaded))
+        self.assertEqual(self.server.created["logfile[file_key]"], ["key1"])
+
+    def test_bodies(self):
+        body = FileBody(self.path, offset=1000, length=70000, chunk_size=4096)
+        self.assertEqual(len(body), 70000)
+        self.assertEqual(b"".join(body), self.content[1000:71000])
+        # a body can be sent again
+        self.assertEqual(b"".join(body), self.content[1000:71000])
+        multipart = MultipartBody(boundary="xyz")
+        multipart.add_field("key", "value")
+        multipart.add_file("file", body, "a.log")
+        encoded = b"".join(multipart)
+        self.assertEqual(len(multipart), len(encoded))
+        self.assertTrue(encoded.startswith(b'--xyz\r\nContent-Disposition: form-data; name="key"\r\n\r\nvalue\r\n'))
+        self.assertTrue(encoded.endswith(self.content[1000:71000] + b"\r\n--xyz--\r\n"))
+
+    def test_empty_file(self):
+        # empty files cannot be memory mapped
+        with open(self.path, "wb"):
+            pass
+        self.assertEqual(b"".join(FileBody(self.path)), b"")
@@ -0,0 +1,127 @@
+import time
+from urllib.parse import parse_qs, urlsplit
+
+from podium_api.logfilewatcher import LogfileStatusWatcher
+from podium_api.types.logfile import (
+    STATUS_COMPLETED,
+    STATUS_PROCESSING,
+    STATUS_QUEUED,
+    STATUS_UNQUEUED,
+)
+from podium_api.types.token import PodiumToken
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+def make_logfile_json(server, path, status):
+    uri = "http://127.0.0.1:{}{}".format(server.server_address[1], path)
+    return {"URI": uri, "file_key": path, "eventdevice_id": 5, "status": status}
+
+
+class LogfilesHandler(RecordingHandler):
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        parts = urlsplit(self.path)
+        uris = list(self.server.statuses)
+        if parts.path == "/api/v1/logfiles":
+            params = parse_qs(parts.query)
+            start = int(params["start"][0])
+            per_page = int(params["per_page"][0])
+            page = {
+                "total": len(uris),
+                "logfiles": [
+                    make_logfile_json(self.server, path, self.server.statuses[path])
+                    for path in uris[start : start + per_page]
+                ],
+            }
+            if start + per_page < self.server.listed:
+                page["nextURI"] = "http://127.0.0.1:{}/api/v1/logfiles?start={}&per_page={}".format(
+                    self.server.server_address[1], start + per_page, per_page
+                )
+            self._send(200, page)
+        else:
+            self._send(200, {"logfile": make_logfile_json(self.server, parts.path, self.server.statuses[parts.path])})
+
+
+class TestLogfileStatusWatcher(TransportTestCase):
+    def setUp(self):
+        super(TestLogfileStatusWatcher, self).setUp()
+        self.server.RequestHandlerClass = LogfilesHandler
+        self.server.statuses = dict(("/api/v1/logfiles/{}".format(i), STATUS_QUEUED) for i in range(6))
+        # only the first four logfiles are listed
+        self.server.listed = 4
+        self.now = 100.0
+        self.timers = []
+        self.transitions = []
+        self.watcher = LogfileStatusWatcher(
+            PodiumToken("test_token", "bearer", 1),
+            transition_callback=lambda uri, old, new, logfile: self.transitions.append(
+                (uri[len(self.url) :], old, new)
+            ),
+            per_page=2,
+            call_later=lambda delay, callback: self.timers.append(delay) or FakeTimer(),
+            clock=lambda: self.now,
+        )
+
+    def poll(self):
+        self.watcher.poll()
+        for i in range(500):
+            if not self.watcher.scanning:
+                return
+            time.sleep(0.01)
+        self.fail("poll did not finish")
+
+    def test_batched_polls(self):
+        for uri in ("/api/v1/logfiles/0", "/api/v1/logfiles/3", "/api/v1/logfiles/5"):
+            self.watcher.watch(self.url + uri)
+        self.poll()
+        # two pages, then the logfile that is not listed on its own
+        self.assertEqual(
+            [request[1].split("?")[0] for request in self.server.requests],
+            ["/api/v1/logfiles", "/api/v1/logfiles", "/api/v1/logfiles/5"],
+        )
+        self.assertEqual(self.watcher.requests, 3)
+        self.assertEqual(
+            sorted(self.transitions),
+            [(uri, None, STATUS_QUEUED) for uri in ("/api/v1/logfiles/0", "/api/v1/logfiles/3", "/api/v1/logfiles/5")],
+        )
+
+        self.server.statuses["/api/v1/logfiles/0"] = STATUS_COMPLETED
+        self.server.statuses["/api/v1/logfiles/3"] = STATUS_PROCESSING
+        self.transitions = []
+        self.poll()
+        self.assertEqual(
+            sorted(self.transitions),
+            [
+                ("/api/v1/logfiles/0", STATUS_QUEUED, STATUS_COMPLETED),
+                ("/api/v1/logfiles/3", STATUS_QUEUED, STATUS_PROCESSING),
+            ],
+        )
+        # completed logfiles are no longer watched
+        self.assertNotIn(self.url + "/api/v1/logfiles/0", self.watcher)
+        self.assertEqual(len(self.watcher), 2)
+
+    def test_backoff(self):
+        self.watcher.watch(self.url + "/api/v1/logfiles/1", status=STATUS_UNQUEUED)
+        self.assertEqual(self.timers, [10.0])
+        self.now += 10
+        self.poll()
+        watched = self.watcher._watched[self.url + "/api/v1/logfiles/1"]
+        self.assertEqual((watched.status, watched.interval), (STATUS_QUEUED, 10.0))
+        self.now += 10
+        self.poll()
+        self.assertEqual(watched.interval, 15.0)
+        self.now += 15
+        self.poll()
+        self.assertEqual(watched.interval, 22.5)
+        self.assertEqual(self.timers[-1], 22.5)
+        self.server.statuses["/api/v1/logfiles/1"] = STATUS_PROCESSING
+        self.now += 22.5
+        self.poll()
+        self.assertEqual(watched.interval, 3.0)
+        # a single page is enough
+        self.assertEqual(self.watcher.requests, 4)
+
+
+class FakeTimer(object):
+    def cancel(self):
+        pass
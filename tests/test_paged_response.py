@@ -0,0 +1,94 @@
+import unittest
+
+from podium_api.types.lap import PodiumLap
+from podium_api.types.paged_response import (
+    get_paged_response_from_json,
+    LazyPayload,
+    PodiumPagedResponse,
+)
+from tests.test_laps import make_lap_json
+
+
+class TestLazyPayload(unittest.TestCase):
+    def setUp(self):
+        self.converted = []
+
+        def convert(json):
+            self.converted.append(json["lap_number"])
+            return json["lap_number"] * 10
+
+        self.payload = LazyPayload([make_lap_json(i) for i in range(5)], convert)
+
+    def test_built_on_access(self):
+        self.assertEqual(len(self.payload), 5)
+        self.assertEqual(self.converted, [])
+        self.assertEqual(self.payload[3], 30)
+        self.assertEqual(self.payload[-1], 40)
+        self.assertEqual(self.payload[:2], [0, 10])
+        self.assertEqual(self.converted, [3, 4, 0, 1])
+        self.assertEqual(self.payload.built_count, 4)
+        self.assertRaises(IndexError, lambda: self.payload[5])
+
+    def test_built_once(self):
+        self.assertEqual(list(self.payload), [0, 10, 20, 30, 40])
+        self.assertEqual(list(self.payload), [0, 10, 20, 30, 40])
+        self.assertEqual(self.converted, [0, 1, 2, 3, 4])
+        self.assertEqual(self.payload, [0, 10, 20, 30, 40])
+        self.assertIn(20, self.payload)
+        self.assertEqual(self.payload.index(20), 2)
+
+    def test_json_dropped_once_built(self):
+        self.payload[2]
+        self.assertEqual(self.payload._items[2], None)
+        self.assertEqual(self.payload._items[3]["lap_number"], 3)
+        items = [make_lap_json(0)]
+        payload = LazyPayload(items, lambda json: json["lap_number"])
+        payload[0]
+        # the list given is left alone
+        self.assertEqual(items[0]["lap_number"], 0)
+
+    def test_list_operations(self):
+        self.payload.append(50)
+        self.payload.insert(0, -10)
+        self.assertEqual(len(self.payload), 7)
+        self.assertEqual(self.converted, [])
+        self.assertEqual(self.payload + [60], [-10, 0, 10, 20, 30, 40, 50, 60])
+        self.assertEqual([-20] + self.payload, [-20, -10, 0, 10, 20, 30, 40, 50])
+        self.payload.sort(reverse=True)
+        self.assertEqual(self.payload, [50, 40, 30, 20, 10, 0, -10])
+        self.payload[1:3] = [45]
+        del self.payload[0]
+        self.payload += [-20]
+        self.assertEqual(self.payload.copy(), [45, 20, 10, 0, -10, -20])
+        self.assertEqual(sorted(self.converted), [0, 1, 2, 3, 4])
+
+    def test_malformed_item_raises_on_access(self):
+        page = get_paged_response_from_json({"total": 2, "laps": [make_lap_json(1), {"URI": "/laps/2"}]}, "laps")
+        self.assertEqual(page.laps[0].lap_number, 1)
+        self.assertRaises(KeyError, lambda: page.laps[1])
+
+    def test_map(self):
+        self.payload[1]
+        mapped = self.payload.map(lambda value: value + 1)
+        self.assertEqual(mapped.built_count, 1)
+        self.assertEqual(mapped[4], 41)
+        self.assertEqual(self.converted, [1, 4])
+        self.assertEqual(mapped, [1, 11, 21, 31, 41])
+
+
+class TestGetPagedResponseFromJson(unittest.TestCase):
+    def test_lazy_laps(self):
+        page = get_paged_response_from_json(
+            {"total": 3, "laps": [make_lap_json(i) for i in range(3)], "nextURI": "/laps?start=3"}, "laps"
+        )
+        self.assertIsInstance(page.payload, LazyPayload)
+        self.assertEqual(page.payload.built_count, 0)
+        self.assertIsInstance(page.laps[2], PodiumLap)
+        self.assertEqual(page.laps[2].lap_time, 62.0)
+        self.assertIs(page.laps[2], page.payload[2])
+        self.assertEqual(page.payload.built_count, 1)
+        self.assertEqual(page.next_uri, "/laps?start=3")
+
+    def test_parsed_page(self):
+        page = PodiumPagedResponse([], 0, None, None, payload_name="laps")
+        self.assertIs(get_paged_response_from_json(page, "laps"), page)
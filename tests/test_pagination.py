@@ -0,0 +1,273 @@
+import asyncio
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer
+
+from mock import Mock, patch
+
+import podium_api
+from podium_api.aioapi import PodiumAsyncAPI
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.laps import make_laps_get
+from podium_api.pagination import make_bulk_get, make_paged_get, make_pages_get
+from podium_api.transport import PooledTransport
+from podium_api.types.exceptions import PodiumRequestFailed
+from podium_api.types.token import PodiumToken
+from tests.test_laps import make_lap_json
+from tests.test_transport import RecordingHandler
+
+try:
+    from urllib.parse import parse_qs, urlsplit
+except:
+    from urlparse import parse_qs, urlsplit
+
+
+PAGE_SIZE = 2
+TOTAL_LAPS = 5
+
+
+class PagedLapsHandler(RecordingHandler):
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path != "/laps":
+            return super(PagedLapsHandler, self).do_GET()
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        query = parse_qs(parts.query)
+        start = int(query.get("start", ["0"])[0])
+        per_page = int(query.get("per_page", [str(PAGE_SIZE)])[0])
+        if self.server.fail_at is not None and start >= self.server.fail_at:
+            return self._send(500, {"error": "boom"})
+        end = min(start + per_page, TOTAL_LAPS)
+        payload = {"total": TOTAL_LAPS, "laps": [make_lap_json(i) for i in range(start, end)]}
+        if end < TOTAL_LAPS:
+            payload["nextURI"] = "{}/laps?start={}&per_page={}".format(self.server.url, end, per_page)
+        if start > 0:
+            prev_start = max(start - per_page, 0)
+            payload["prevURI"] = "{}/laps?start={}&per_page={}".format(self.server.url, prev_start, per_page)
+        self._send(200, payload)
+
+
+class PagedServerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), PagedLapsHandler)
+        self.server.requests = []
+        self.server.fail_at = None
+        self.url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        self.server.url = self.url
+        self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True)
+        self.server_thread.start()
+        self.token = PodiumToken("test_token", "bearer", 1)
+        podium_api.register_podium_application("test_id", "test_secret", podium_url=self.url)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def wait_for_requests(self, count, timeout=2):
+        deadline = time.time() + timeout
+        while len(self.server.requests) < count and time.time() < deadline:
+            time.sleep(0.005)
+        return len(self.server.requests) >= count
+
+
+class TestMakePagedGet(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_paged_get(self, mock_request):
+        success_cb = Mock()
+        req = make_paged_get(self.token, "test/laps?start=100", "laps", success_callback=success_cb)
+        self.assertEqual(req._method, "GET")
+        self.assertEqual(req.url, "test/laps?start=100")
+        self.assertEqual(req.req_headers["Authorization"], "Bearer {}".format(self.token.token))
+        req.on_success()(req, {"total": 101, "laps": [make_lap_json(100)], "prevURI": "test/laps?start=0"})
+        page = success_cb.call_args[0][0]
+        self.assertEqual(page.payload_name, "laps")
+        self.assertEqual(page.laps[0].uri, "/laps/100")
+        self.assertEqual(page.prev_uri, "test/laps?start=0")
+
+
+class TestMakePagesGet(PagedServerTestCase):
+    def setUp(self):
+        super(TestMakePagesGet, self).setUp()
+        self.transport = PooledTransport(max_workers=2)
+        podium_api.register_podium_transport(self.transport)
+        self.done = threading.Event()
+
+    def tearDown(self):
+        podium_api.unregister_podium_transport()
+        self.transport.close()
+        super(TestMakePagesGet, self).tearDown()
+
+    def test_all_items_in_order(self):
+        items = []
+        complete = []
+
+        def on_complete(pages, count):
+            complete.append((pages, count))
+            self.done.set()
+
+        make_pages_get(
+            self.token,
+            make_laps_get,
+            self.url + "/laps",
+            per_page=PAGE_SIZE,
+            item_callback=items.append,
+            complete_callback=on_complete,
+        )
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual([lap.lap_number for lap in items], list(range(TOTAL_LAPS)))
+        self.assertEqual(complete, [(3, TOTAL_LAPS)])
+
+    def test_prefetch_overlaps_consumption(self):
+        overlapped = []
+
+        def on_page(page):
+            if page.next_uri is not None:
+                # the next page must already be requested while this one is consumed
+                overlapped.append(self.wait_for_requests(len(overlapped) + 2))
+
+        make_pages_get(
+            self.token,
+            make_laps_get,
+            self.url + "/laps",
+            per_page=PAGE_SIZE,
+            page_callback=on_page,
+            complete_callback=lambda pages, count: self.done.set(),
+        )
+        self.assertTrue(self.done.wait(10))
+        self.assertEqual(overlapped, [True, True])
+
+    def test_failure_stops_stream(self):
+        self.server.fail_at = 2
+        items = []
+        failures = []
+
+        def on_failure(failure_type, results, data):
+            failures.append((failure_type, results))
+            self.done.set()
+
+        stream = make_pages_get(
+            self.token,
+            make_laps_get,
+            self.url + "/laps",
+            per_page=PAGE_SIZE,
+            item_callback=items.append,
+            failure_callback=on_failure,
+        )
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual(failures, [("failure", {"error": "boom"})])
+        self.assertEqual(len(items), 2)
+        self.assertTrue(stream.finished)
+
+
+class TestMakeBulkGet(PagedServerTestCase):
+    def setUp(self):
+        super(TestMakeBulkGet, self).setUp()
+        self.transport = PooledTransport(max_workers=4)
+        podium_api.register_podium_transport(self.transport)
+        self.done = threading.Event()
+
+    def tearDown(self):
+        podium_api.unregister_podium_transport()
+        self.transport.close()
+        super(TestMakeBulkGet, self).tearDown()
+
+    def test_windows_merged_in_order(self):
+        results = []
+        pages = []
+
+        def on_success(items):
+            results.append(items)
+            self.done.set()
+
+        make_bulk_get(
+            self.token,
+            make_laps_get,
+            self.url + "/laps",
+            per_page=1,
+            concurrency=3,
+            page_callback=pages.append,
+            success_callback=on_success,
+        )
+        self.assertTrue(self.done.wait(5))
+        self.assertEqual([lap.lap_number for lap in results[0]], list(range(TOTAL_LAPS)))
+        self.assertEqual([page.laps[0].lap_number for page in pages], list(range(TOTAL_LAPS)))
+        starts = sorted(parse_qs(urlsplit(request[1]).query)["start"][0] for request in self.server.requests)
+        self.assertEqual(starts, [str(i) for i in range(TOTAL_LAPS)])
+
+    def test_failure_cancels(self):
+        self.server.fail_at = 2
+        failures = []
+        successes = []
+
+        def on_failure(failure_type, results, data):
+            failures.append(failure_type)
+            self.done.set()
+
+        fetch = make_bulk_get(
+            self.token,
+            make_laps_get,
+            self.url + "/laps",
+            per_page=PAGE_SIZE,
+            success_callback=successes.append,
+            failure_callback=on_failure,
+        )
+        self.assertTrue(self.done.wait(5))
+        time.sleep(0.05)
+        self.assertEqual(failures, ["failure"])
+        self.assertEqual(successes, [])
+        self.assertTrue(fetch.finished)
+
+
+class TestAsyncIterPages(PagedServerTestCase):
+    def run_api(self, coro_func):
+        async def runner():
+            async with PodiumAsyncAPI(self.token, AsyncioTransport()) as api:
+                return await coro_func(api)
+
+        return asyncio.run(runner())
+
+    def test_iter_items(self):
+        async def collect(api):
+            return [lap async for lap in api.laps.iter_items(self.url + "/laps", per_page=PAGE_SIZE)]
+
+        laps = self.run_api(collect)
+        self.assertEqual([lap.lap_number for lap in laps], list(range(TOTAL_LAPS)))
+
+    def test_iter_pages_prefetch(self):
+        async def collect(api):
+            seen = []
+            async for page in api.laps.iter_pages(self.url + "/laps", per_page=PAGE_SIZE):
+                await asyncio.sleep(0.05)
+                seen.append((len(page.laps), len(self.server.requests)))
+            return seen
+
+        seen = self.run_api(collect)
+        # while page N was consumed the request for page N+1 was already made
+        self.assertEqual(seen, [(2, 2), (2, 3), (1, 3)])
+
+    def test_early_exit(self):
+        async def first(api):
+            async for lap in api.laps.iter_items(self.url + "/laps", per_page=PAGE_SIZE):
+                return lap
+
+        lap = self.run_api(first)
+        self.assertEqual(lap.lap_number, 0)
+
+    def test_list_all(self):
+        laps = self.run_api(lambda api: api.laps.list_all(self.url + "/laps", per_page=PAGE_SIZE, concurrency=2))
+        self.assertEqual([lap.lap_number for lap in laps], list(range(TOTAL_LAPS)))
+        self.assertEqual(len(self.server.requests), 3)
+
+    def test_list_all_failure(self):
+        self.server.fail_at = 2
+        with self.assertRaises(PodiumRequestFailed):
+            self.run_api(lambda api: api.laps.list_all(self.url + "/laps", per_page=1))
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import json
 import unittest
 
 from mock import Mock, patch
@@ -9,6 +10,8 @@ from podium_api.racestat import (
     create_racestat_redirect_handler,
     make_racestat_create,
     make_racestat_get,
+    make_racestats_create,
+    RacestatTracker,
 )
 from podium_api.types.racestat import get_racestat_from_json
 from podium_api.types.redirect import get_redirect_from_json
@@ -242,6 +245,131 @@ class TestRacestatCreate(unittest.TestCase):
         podium_api.unregister_podium_application()
 
 
+class TestRacestatsCreate(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+        self.racestats = [
+            {
+                "device_id": index,
+                "comp_number": "12{}".format(index),
+                "comp_class": "GT & P1",
+                "total_laps": 10,
+                "last_lap_time": 1.234,
+                "position_overall": 3,
+                "position_in_class": 2,
+                "comp_number_ahead": "456",
+                "comp_number_behind": None,
+                "gap_to_ahead": 1e20,
+                "gap_to_behind": -4.5,
+                "laps_to_ahead": 0,
+                "laps_to_behind": 33,
+                "fc_flag": True,
+                "comp_flag": "ü",
+            }
+            for index in range(3)
+        ]
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_form_body_matches_urlencode(self, mock_request):
+        req = make_racestats_create(self.token, 1, self.racestats)
+        expected = {}
+        for index, racestat in enumerate(self.racestats):
+            for key, value in racestat.items():
+                expected["racestat[{}][{}]".format(index, key)] = value
+        self.assertEqual(req.req_body, urlencode(expected).encode("ascii"))
+        self.assertEqual(req.req_headers["Content-Type"], "application/x-www-form-urlencoded")
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_json_body(self, mock_request):
+        req = make_racestats_create(self.token, 1, self.racestats, json_body=True)
+        self.assertEqual(req.req_headers["Content-Type"], "application/json")
+        self.assertEqual(json.loads(req.req_body.decode("utf-8")), {"racestat": self.racestats})
+
+
+class TestRacestatTracker(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        self.token = PodiumToken("test_token", "test_type", 1)
+        self.tracker = RacestatTracker()
+        self.fields = {
+            "comp_number": "1234",
+            "comp_class": "P1",
+            "total_laps": 10,
+            "last_lap_time": 1.234,
+            "position_overall": 3,
+            "position_in_class": 2,
+            "comp_number_ahead": "456",
+            "comp_number_behind": "789",
+            "gap_to_ahead": 11.11,
+            "gap_to_behind": 22.22,
+            "laps_to_ahead": 11,
+            "laps_to_behind": 22,
+            "fc_flag": 1,
+            "comp_flag": 3,
+        }
+
+    def tearDown(self):
+        podium_api.unregister_podium_application()
+
+    def create(self, **kwargs):
+        fields = dict(self.fields)
+        fields.update(kwargs)
+        failure_callback = fields.pop("failure_callback", None)
+        changed_only = fields.pop("changed_only", False)
+        return make_racestat_create(
+            self.token,
+            1,
+            2,
+            tracker=self.tracker,
+            changed_only=changed_only,
+            failure_callback=failure_callback,
+            **fields
+        )
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_unchanged_racestat_suppressed(self, mock_request):
+        req = self.create()
+        self.assertEqual(
+            req.req_body, urlencode(dict(("racestat[{}]".format(key), value) for key, value in self.fields.items()))
+        )
+        self.assertEqual(self.create(), None)
+        self.assertEqual(self.tracker.suppressed, 1)
+        # another event or device is tracked on its own
+        self.assertNotEqual(make_racestat_create(self.token, 2, 2, tracker=self.tracker, **self.fields), None)
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_changed_only(self, mock_request):
+        self.create()
+        req = self.create(total_laps=11, last_lap_time=1.5, changed_only=True)
+        self.assertEqual(req.req_body, urlencode({"racestat[total_laps]": 11, "racestat[last_lap_time]": 1.5}))
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_failure_reverts(self, mock_request):
+        failure_cb = Mock()
+        req = self.create(failure_callback=failure_cb)
+        req.on_failure()(req, {"error": "boom"})
+        self.assertEqual(failure_cb.call_args[0][0], "failure")
+        self.assertNotEqual(self.create(), None)
+
+    @patch("podium_api.asyncreq.UrlRequest.run")
+    def test_bulk_filters_unchanged(self, mock_request):
+        first = dict(self.fields, device_id=1)
+        second = dict(self.fields, device_id=2)
+        make_racestats_create(self.token, 1, [first, second], tracker=self.tracker)
+        self.assertEqual(make_racestats_create(self.token, 1, [first, second], tracker=self.tracker), None)
+        req = make_racestats_create(
+            self.token, 1, [first, dict(second, fc_flag=2)], tracker=self.tracker, changed_only=True
+        )
+        self.assertEqual(req.req_body, urlencode({"racestat[0][device_id]": 2, "racestat[0][fc_flag]": 2}).encode())
+        self.tracker.forget(1)
+        req = make_racestats_create(self.token, 1, [first], tracker=self.tracker, changed_only=True)
+        self.assertEqual(len(req.req_body.split(b"&")), 15)
+
+
 class TestRacestatGet(unittest.TestCase):
     def setUp(self):
         podium_api.register_podium_application("test_id", "test_secret")
@@ -293,6 +421,11 @@ class TestRacestatGet(unittest.TestCase):
     def success_cb(self, result):
         self.result = result
 
+    def test_racestat_is_compact(self):
+        self.result = get_racestat_from_json(self.result_json)
+        self.check_results()
+        self.assertFalse(hasattr(self.result, "__dict__"))
+
     @patch("podium_api.asyncreq.UrlRequest.run")
     def test_racestat_get(self, mock_request):
         req = make_racestat_get(
@@ -0,0 +1,159 @@
+import time
+from urllib.parse import parse_qs
+
+import podium_api
+from podium_api.asyncreq import make_request_default
+from podium_api.refresh import TokenRefreshTransport
+from podium_api.types.token import get_token_from_json, PodiumToken
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+class OAuthHandler(RecordingHandler):
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        if self.headers.get("Authorization") in self.server.accepted:
+            self._send(200, {"path": self.path})
+        else:
+            self._send(401, {"error": "invalid_token"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = parse_qs(self.rfile.read(length).decode("utf-8"))
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        # let the other requests queue up behind the refresh
+        time.sleep(0.05)
+        if body.get("refresh_token") == ["refresh"] and self.server.refresh_ok:
+            self._send(
+                200,
+                {
+                    "access_token": "fresh",
+                    "token_type": "bearer",
+                    "created_at": int(time.time()),
+                    "expires_in": 7200,
+                    "refresh_token": "refresh2",
+                },
+            )
+        else:
+            self._send(401, {"error": "invalid_grant"})
+
+
+class RefreshTestCase(TransportTestCase):
+    def setUp(self):
+        super(RefreshTestCase, self).setUp()
+        self.server.RequestHandlerClass = OAuthHandler
+        self.server.refresh_ok = True
+        self.server.accepted = ["Bearer fresh"]
+        self.token = PodiumToken("stale", "bearer", int(time.time()), refresh_token="refresh", expires_in=7200)
+        self.refreshing = TokenRefreshTransport(self.token, self.transport)
+        podium_api.register_podium_transport(self.refreshing)
+
+    def get(self, count):
+        results = []
+        failures = []
+        reqs = [
+            make_request_default(
+                self.url + "/protected",
+                header=self.token.json_header,
+                success_callback=lambda res, data: results.append(res),
+                failure_callback=lambda ftype, res, data: failures.append((ftype, res)),
+            )
+            for i in range(count)
+        ]
+        for req in reqs:
+            self.assertTrue(req.wait(5))
+        return reqs, results, failures
+
+    def wait_refreshed(self, timeout=5):
+        deadline = time.time() + timeout
+        while self.refreshing._refreshing:
+            if time.time() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def paths(self, command):
+        return [request[1] for request in self.server.requests if request[0] == command]
+
+
+class TestTokenRefreshTransport(RefreshTestCase):
+    def test_unauthorized_requests_are_replayed(self):
+        reqs, results, failures = self.get(3)
+        self.assertEqual(failures, [])
+        self.assertEqual(results, [{"path": "/protected"}] * 3)
+        self.assertEqual(self.paths("POST"), ["/oauth/token"])
+        self.assertEqual(self.refreshing.refreshes, 1)
+        self.assertEqual(self.refreshing.replayed, 3)
+        self.assertEqual(reqs[0].resp_status, 200)
+        # the token held by the callers was updated in place
+        self.assertEqual(self.token.token, "fresh")
+        self.assertEqual(self.token.refresh_token, "refresh2")
+        self.assertEqual(self.token.json_header["Authorization"], "Bearer fresh")
+
+    def test_expired_token_is_refreshed_first(self):
+        self.token.created = int(time.time()) - 7200
+        reqs, results, failures = self.get(2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(self.paths("POST"), ["/oauth/token"])
+        # the requests waited for the refresh and were sent once
+        self.assertEqual(self.paths("GET"), ["/protected", "/protected"])
+        self.assertEqual(self.refreshing.replayed, 0)
+
+    def test_refresh_failure(self):
+        self.server.refresh_ok = False
+        reqs, results, failures = self.get(2)
+        self.assertEqual(results, [])
+        self.assertEqual(failures, [("failure", {"error": "invalid_token"})] * 2)
+        self.assertEqual(reqs[0].resp_status, 401)
+        self.assertEqual(self.token.token, "stale")
+
+    def test_no_refresh_storm_after_failure(self):
+        self.server.refresh_ok = False
+        self.server.accepted.append("Bearer stale")
+        # within the refresh margin of the expiry
+        self.token.created = int(time.time()) - 7200 + 30
+        for i in range(3):
+            reqs, results, failures = self.get(2)
+            self.assertEqual(failures, [])
+            # the failed refresh of the first request finished
+            self.assertTrue(self.wait_refreshed())
+        self.assertEqual(self.paths("POST"), ["/oauth/token"])
+        self.assertEqual(len(self.paths("GET")), 6)
+        # once expired the token is refreshed again
+        self.token.created = int(time.time()) - 7200
+        reqs, results, failures = self.get(1)
+        self.assertEqual(self.paths("POST"), ["/oauth/token"] * 2)
+        self.assertEqual(failures, [("failure", {"error": "invalid_grant"})])
+
+    def test_previous_tokens_are_bounded(self):
+        for i in range(5):
+            self.refreshing._on_refreshed(PodiumToken("token{}".format(i), "bearer", int(time.time())))
+        self.assertEqual(list(self.refreshing._previous_tokens), ["token2", "token3"])
+        self.assertTrue(self.refreshing._owns({"Authorization": "Bearer token3"}))
+        self.assertFalse(self.refreshing._owns({"Authorization": "Bearer stale"}))
+
+    def test_without_refresh_token(self):
+        self.token.refresh_token = None
+        reqs, results, failures = self.get(1)
+        self.assertEqual(failures, [("failure", {"error": "invalid_token"})])
+        self.assertEqual(self.paths("POST"), [])
+
+    def test_other_authorizations_pass_through(self):
+        failures = []
+        req = make_request_default(
+            self.url + "/protected",
+            header=PodiumToken("other", "bearer", 1).json_header,
+            failure_callback=lambda ftype, res, data: failures.append(ftype),
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(failures, ["failure"])
+        self.assertEqual(self.refreshing.refreshes, 0)
+
+
+class TestTokenFromJson(RefreshTestCase):
+    def test_expiry(self):
+        token = get_token_from_json(
+            {"access_token": "a", "token_type": "bearer", "created_at": 100, "expires_in": 60, "refresh_token": "r"}
+        )
+        self.assertEqual(token.expires_at, 160)
+        self.assertEqual(token.refresh_token, "r")
+        self.assertIsNone(PodiumToken("a", "bearer", 100).expires_at)
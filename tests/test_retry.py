@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+import podium_api
+from podium_api.aiotransport import AsyncioTransport
+from podium_api.asyncreq import make_request_default
+from podium_api.retry import parse_retry_after, RetryBudget, RetryPolicy, RetryTransport
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+class FlakyHandler(RecordingHandler):
+    def _fail_first(self, count, status, headers=None):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        seen = len([request for request in self.server.requests if request[1] == self.path])
+        if seen <= count:
+            self._send(status, {"error": "unavailable"}, headers)
+        else:
+            self._send(200, {"path": self.path})
+
+    def do_GET(self):
+        if self.path.startswith("/flaky"):
+            self._fail_first(2, 503)
+        elif self.path.startswith("/throttled"):
+            self._fail_first(1, 429, {"Retry-After": "0"})
+        elif self.path.startswith("/slow-down"):
+            self._fail_first(1, 429, {"Retry-After": "3600"})
+        elif self.path.startswith("/down"):
+            self._fail_first(100, 503)
+        else:
+            super(FlakyHandler, self).do_GET()
+
+    def do_POST(self):
+        self._fail_first(1, 503)
+
+
+class RetryTestCase(TransportTestCase):
+    def setUp(self):
+        super(RetryTestCase, self).setUp()
+        self.server.RequestHandlerClass = FlakyHandler
+        self.retrying = RetryTransport(self.transport, policy=RetryPolicy(backoff=0.01, jitter=False))
+        podium_api.register_podium_transport(self.retrying)
+
+    def fetch(self, path, method="GET"):
+        results = []
+        failures = []
+        req = make_request_default(
+            self.url + path,
+            method=method,
+            body={} if method == "POST" else None,
+            success_callback=lambda res, data: results.append(res),
+            failure_callback=lambda ftype, res, data: failures.append((ftype, res)),
+        )
+        self.assertTrue(req.wait(5))
+        return req, results, failures
+
+    def count(self, path):
+        return len([request for request in self.server.requests if request[1] == path])
+
+
+class TestRetryTransport(RetryTestCase):
+    def test_retries_until_success(self):
+        req, results, failures = self.fetch("/flaky")
+        self.assertEqual(results, [{"path": "/flaky"}])
+        self.assertEqual(failures, [])
+        self.assertEqual(self.count("/flaky"), 3)
+        self.assertEqual(self.retrying.retries, 2)
+        self.assertEqual(req.resp_status, 200)
+
+    def test_gives_up_after_max_retries(self):
+        req, results, failures = self.fetch("/down")
+        self.assertEqual(failures, [("failure", {"error": "unavailable"})])
+        self.assertEqual(self.count("/down"), 4)
+        self.assertEqual(req.resp_status, 503)
+
+    def test_retry_after(self):
+        req, results, failures = self.fetch("/throttled")
+        self.assertEqual(len(results), 1)
+        # waiting an hour is longer than max_backoff, the failure is returned
+        req, results, failures = self.fetch("/slow-down")
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.count("/slow-down"), 1)
+
+    def test_post_is_not_retried(self):
+        req, results, failures = self.fetch("/flaky", method="POST")
+        self.assertEqual(len(failures), 1)
+        self.assertEqual(self.count("/flaky"), 1)
+
+    def test_connection_errors(self):
+        errors = []
+        req = make_request_default(
+            "http://127.0.0.1:1/refused", failure_callback=lambda ftype, res, data: errors.append(ftype)
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(errors, ["error"])
+        self.assertEqual(self.retrying.retries, 3)
+
+    def test_budget(self):
+        self.retrying.budget = RetryBudget(ratio=0, max_tokens=1)
+        req, results, failures = self.fetch("/down")
+        self.assertEqual(self.count("/down"), 2)
+        self.assertEqual(self.retrying.exhausted, 1)
+        self.assertEqual(len(failures), 1)
+
+    def test_async(self):
+        async def fetch():
+            retrying = RetryTransport(AsyncioTransport(), policy=RetryPolicy(backoff=0.01, jitter=False))
+            req = retrying.request(self.url + "/flaky", on_success=lambda req, result: None)
+            await req.wait()
+            retrying.close()
+            return req
+
+        req = asyncio.run(fetch())
+        self.assertEqual(req.result, {"path": "/flaky"})
+        self.assertEqual(self.count("/flaky"), 3)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    def test_delay(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, random=lambda: 0.5)
+        self.assertEqual([policy.get_delay(retries) for retries in range(4)], [0.5, 1, 2, 2.5])
+        self.assertEqual(policy.get_delay(0, retry_after=4), 4)
+        self.assertIsNone(policy.get_delay(0, retry_after=6))
+
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=1)
+        self.assertTrue(policy.should_retry("GET", 503, 0))
+        self.assertTrue(policy.should_retry("PUT", None, 0))
+        self.assertFalse(policy.should_retry("GET", 503, 1))
+        self.assertFalse(policy.should_retry("GET", 404, 0))
+        self.assertFalse(policy.should_retry("POST", 503, 0))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("120"), 120)
+        self.assertEqual(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470), 10)
+        self.assertIsNone(parse_retry_after("soon"))
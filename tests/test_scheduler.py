@@ -0,0 +1,122 @@
+import threading
+import unittest
+
+import podium_api
+from podium_api.asyncreq import make_request_default
+from podium_api.scheduler import (
+    BACKGROUND,
+    default_classify,
+    INTERACTIVE,
+    NORMAL,
+    request_priority,
+    SchedulingTransport,
+    TokenBucket,
+)
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+class HeldHandler(RecordingHandler):
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        # hold the responses until the test queued its requests
+        self.server.release.wait(5)
+        self._send(200, {"path": self.path})
+
+    def do_POST(self):
+        self.do_GET()
+
+
+class SchedulerTestCase(TransportTestCase):
+    def setUp(self):
+        super(SchedulerTestCase, self).setUp()
+        self.server.RequestHandlerClass = HeldHandler
+        self.server.release = threading.Event()
+        self.transport.close()
+        self.transport = podium_api.transport.PooledTransport(max_workers=8, max_connections_per_host=8, timeout=5)
+        self.scheduler = SchedulingTransport(self.transport, max_concurrency=1)
+        podium_api.register_podium_transport(self.scheduler)
+        self.completed = []
+
+    def tearDown(self):
+        self.server.release.set()
+        super(SchedulerTestCase, self).tearDown()
+
+    def fetch(self, path, method="GET"):
+        return make_request_default(
+            self.url + path,
+            method=method,
+            body={} if method == "POST" else None,
+            success_callback=lambda res, data: self.completed.append(res["path"]),
+        )
+
+
+class TestSchedulingTransport(SchedulerTestCase):
+    def test_max_concurrency(self):
+        self.scheduler.max_concurrency = 2
+        reqs = [self.fetch("/users/{}".format(i)) for i in range(5)]
+        self.assertEqual(self.scheduler.in_flight, 2)
+        self.assertEqual(self.scheduler.queued_count, 3)
+        self.server.release.set()
+        for req in reqs:
+            self.assertTrue(req.wait(5))
+        self.assertEqual(len(self.completed), 5)
+        self.assertEqual(self.scheduler.started, 5)
+        self.assertEqual(self.scheduler.in_flight, 0)
+
+    def test_priorities(self):
+        reqs = [
+            self.fetch("/first"),
+            self.fetch("/events/1/laps"),
+            self.fetch("/users/1"),
+            self.fetch("/events/1/alertmessages", method="POST"),
+        ]
+        with request_priority(INTERACTIVE):
+            reqs.append(self.fetch("/users/2"))
+        self.server.release.set()
+        for req in reqs:
+            self.assertTrue(req.wait(5))
+        self.assertEqual(
+            self.completed, ["/first", "/events/1/alertmessages", "/users/2", "/users/1", "/events/1/laps"]
+        )
+
+    def test_cancel(self):
+        reqs = [self.fetch("/first"), self.fetch("/laps/1"), self.fetch("/laps/2"), self.fetch("/users/1")]
+        reqs[3].cancel()
+        self.assertEqual(self.scheduler.cancel_queued(BACKGROUND), 2)
+        self.assertTrue(reqs[1].cancelled)
+        self.server.release.set()
+        self.assertTrue(reqs[0].wait(5))
+        self.assertEqual(self.completed, ["/first"])
+        self.assertEqual(self.scheduler.queued_count, 0)
+        self.assertEqual(self.scheduler.started, 1)
+
+    def test_rate(self):
+        scheduled = []
+        self.scheduler.max_concurrency = 10
+        self.scheduler.bucket = TokenBucket(1, burst=2)
+        self.scheduler.call_later = lambda delay, callback: scheduled.append(delay)
+        self.server.release.set()
+        for i in range(3):
+            self.fetch("/users/{}".format(i))
+        self.assertEqual(self.scheduler.started, 2)
+        self.assertEqual(self.scheduler.queued_count, 1)
+        self.assertEqual(len(scheduled), 1)
+        self.assertGreater(scheduled[0], 0.9)
+
+
+class TestScheduling(unittest.TestCase):
+    def test_classify(self):
+        self.assertEqual(default_classify("https://podium.live/api/v1/events/1/racestats", "POST"), INTERACTIVE)
+        self.assertEqual(default_classify("https://podium.live/api/v1/alertmessages/2", "GET"), INTERACTIVE)
+        self.assertEqual(default_classify("https://podium.live/api/v1/devices/1/logfiles?start=0", "GET"), BACKGROUND)
+        self.assertEqual(default_classify("https://podium.live/api/v1/devices/1/logfiles", "POST"), NORMAL)
+        self.assertEqual(default_classify("https://podium.live/api/v1/users/1", "GET"), NORMAL)
+
+    def test_token_bucket(self):
+        now = [0.0]
+        bucket = TokenBucket(2, burst=2, clock=lambda: now[0])
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0)
+        self.assertEqual(bucket.take(), 0.5)
+        now[0] = 0.5
+        self.assertEqual(bucket.take(), 0)
@@ -0,0 +1,240 @@
+import gzip
+import json
+import threading
+import unittest
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import podium_api
+from podium_api.asyncreq import get_transport, make_request_default
+from podium_api.laps import make_lap_get
+from podium_api.transport import (
+    get_content_decoder,
+    PooledTransport,
+    UrlRequestTransport,
+)
+from podium_api.types.token import PodiumToken
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # buffer each response into one write
+    wbufsize = -1
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        if self.path.startswith("/missing"):
+            self._send(404, {"error": "not found"})
+        elif self.path.startswith("/moved"):
+            self._send(302, {}, {"Location": "/elsewhere"})
+        elif self.path.startswith("/laps"):
+            self._send(
+                200,
+                {
+                    "lap": {
+                        "URI": "/laps/1",
+                        "raw_data_uri": "/laps/1/raw",
+                        "lap_number": 1,
+                        "end_time": "now",
+                        "lap_time": 1.5,
+                    }
+                },
+            )
+        else:
+            self._send(200, {"path": self.path})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode("utf-8")
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        self._send(200, {"body": body})
+
+
+class TransportTestCase(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), RecordingHandler)
+        self.server.requests = []
+        self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True)
+        self.server_thread.start()
+        self.url = "http://127.0.0.1:{}".format(self.server.server_address[1])
+        self.transport = PooledTransport(max_workers=2, max_connections_per_host=1, timeout=5)
+        podium_api.register_podium_application("test_id", "test_secret", podium_url=self.url)
+        podium_api.register_podium_transport(self.transport)
+
+    def tearDown(self):
+        podium_api.unregister_podium_transport()
+        podium_api.unregister_podium_application()
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestPooledTransport(TransportTestCase):
+    def test_registered_transport(self):
+        self.assertIs(get_transport(), self.transport)
+        podium_api.unregister_podium_transport()
+        self.assertIsInstance(get_transport(), UrlRequestTransport)
+
+    def test_success(self):
+        results = []
+        req = make_request_default(
+            self.url + "/test", params={"a": 1}, success_callback=lambda res, data: results.append(res)
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(results, [{"path": "/test?a=1"}])
+        self.assertEqual(req.resp_status, 200)
+
+    def test_post_body(self):
+        results = []
+        req = make_request_default(
+            self.url + "/test",
+            method="POST",
+            body={"racestat[comp_number]": "42"},
+            header={"Content-Type": "application/x-www-form-urlencoded"},
+            success_callback=lambda res, data: results.append(res),
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(results, [{"body": "racestat%5Bcomp_number%5D=42"}])
+
+    def test_failure(self):
+        failures = []
+        req = make_request_default(
+            self.url + "/missing", failure_callback=lambda ftype, res, data: failures.append((ftype, res))
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(failures, [("failure", {"error": "not found"})])
+
+    def test_redirect(self):
+        redirects = []
+        req = make_request_default(
+            self.url + "/moved", redirect_callback=lambda req, headers, data: redirects.append(headers)
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(redirects[0]["Location"], "/elsewhere")
+
+    def test_error(self):
+        errors = []
+        req = make_request_default(
+            "http://127.0.0.1:1/unreachable", failure_callback=lambda ftype, res, data: errors.append(ftype)
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(errors, ["error"])
+        self.assertIsNotNone(req.error)
+
+    def test_progress(self):
+        progress = []
+        req = make_request_default(
+            self.url + "/test", progress_callback=lambda cur, tot, data: progress.append((cur, tot))
+        )
+        self.assertTrue(req.wait(5))
+        self.assertEqual(progress[0][0], 0)
+        self.assertEqual(progress[-1][0], progress[-1][1])
+
+    def test_keep_alive(self):
+        for i in range(5):
+            req = make_request_default(self.url + "/test")
+            self.assertTrue(req.wait(5))
+        ports = set(request[2][1] for request in self.server.requests)
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertEqual(len(ports), 1)
+
+    def test_make_lap_get(self):
+        laps = []
+        token = PodiumToken("test_token", "bearer", 1)
+        req = make_lap_get(token, self.url + "/laps/1", success_callback=laps.append)
+        self.assertTrue(req.wait(5))
+        self.assertEqual(laps[0].uri, "/laps/1")
+        self.assertEqual(laps[0].lap_time, 1.5)
+        self.assertEqual(self.server.requests[0][3]["Authorization"], "Bearer test_token")
+
+    def test_cancel(self):
+        blocker = threading.Event()
+        transport = PooledTransport(max_workers=1)
+        transport._executor.submit(blocker.wait)
+        results = []
+        req = transport.request(self.url + "/test", on_success=lambda req, res: results.append(res))
+        req.cancel()
+        blocker.set()
+        transport.close()
+        self.assertTrue(req.cancelled)
+        self.assertEqual(results, [])
+
+
+class CompressedHandler(RecordingHandler):
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        body = json.dumps({"laps": [{"lap_number": i, "lap_time": 60.5} for i in range(500)]}).encode("utf-8")
+        accepted = self.headers.get("Accept-Encoding", "")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if "gzip" in accepted:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestCompressedResponses(TransportTestCase):
+    def setUp(self):
+        super(TestCompressedResponses, self).setUp()
+        self.server.RequestHandlerClass = CompressedHandler
+
+    def get(self, **kwargs):
+        results = []
+        req = make_request_default(self.url + "/laps", success_callback=lambda res, data: results.append(res), **kwargs)
+        self.assertTrue(req.wait(5))
+        return req, results
+
+    def test_gzip(self):
+        req, results = self.get()
+        self.assertIn("gzip", self.server.requests[0][3]["Accept-Encoding"])
+        self.assertEqual(req.resp_headers["Content-Encoding"], "gzip")
+        self.assertEqual(len(results[0]["laps"]), 500)
+
+    def test_gzip_progress(self):
+        progress = []
+        req, results = self.get(progress_callback=lambda cur, tot, data: progress.append((cur, tot)))
+        self.assertEqual(len(results[0]["laps"]), 500)
+        # progress counts the compressed bytes received
+        compressed_size = int(req.resp_headers["Content-Length"])
+        self.assertEqual(progress[-1], (compressed_size, compressed_size))
+
+    def test_decompress_disabled(self):
+        self.transport.close()
+        self.transport = PooledTransport(max_workers=1, decompress=False)
+        podium_api.register_podium_transport(self.transport)
+        req, results = self.get()
+        self.assertEqual(self.server.requests[0][3]["Accept-Encoding"], "identity")
+        self.assertEqual(len(results[0]["laps"]), 500)
+
+    def test_content_decoder(self):
+        data = b"podium" * 1000
+        raw = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        raw_deflate = raw.compress(data) + raw.flush()
+        for encoding, compressed in (
+            ("gzip", gzip.compress(data)),
+            ("deflate", zlib.compress(data)),
+            ("deflate", raw_deflate),
+        ):
+            for size in (1, 100):
+                decoder = get_content_decoder(encoding)
+                decoded = b"".join(
+                    decoder.decompress(compressed[i : i + size]) for i in range(0, len(compressed), size)
+                )
+                self.assertEqual(decoded + decoder.flush(), data)
+        self.assertIsNone(get_content_decoder(None))
+        self.assertIsNone(get_content_decoder("identity"))
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import threading
+
+from podium_api.types.token import PodiumToken
+from podium_api.upload import make_logfile_resumable_upload, UploadManifest
+from tests.test_transport import RecordingHandler, TransportTestCase
+
+
+class UploadHandler(RecordingHandler):
+    """
+    Stand-in for the logfile endpoints and the presigned upload_url, which
+    takes the whole file in a single POST.
+    """
+
+    def do_GET(self):
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        upload_url = "http://127.0.0.1:{}/upload".format(self.server.server_address[1])
+        self._send(
+            200,
+            {"logfile": {"file_key": "key1", "eventdevice_id": 5, "status": -1, "upload_url": upload_url}},
+        )
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        self.server.requests.append((self.command, self.path, self.client_address, dict(self.headers)))
+        if self.path == "/upload":
+            if self.server.drop_uploads:
+                # the connection dies before the upload is answered
+                self.server.drop_uploads -= 1
+                self.close_connection = True
+                return
+            self.server.uploads.append(body)
+            self._send(200, {})
+        elif self.server.fail_create:
+            self._send(500, {"error": "unavailable"})
+        else:
+            self._send(303, {"location": "/api/v1/logfiles/7"}, {"Location": "/api/v1/logfiles/7"})
+
+
+class TestResumableUpload(TransportTestCase):
+    def setUp(self):
+        super(TestResumableUpload, self).setUp()
+        self.server.RequestHandlerClass = UploadHandler
+        self.server.uploads = []
+        self.server.drop_uploads = 0
+        self.server.fail_create = False
+        self.token = PodiumToken("test_token", "bearer", 1)
+        self.content = os.urandom(200000)
+        fd, self.path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "wb") as f:
+            f.write(self.content)
+
+    def tearDown(self):
+        for path in (self.path, self.path + ".upload"):
+            if os.path.exists(path):
+                os.remove(path)
+        super(TestResumableUpload, self).tearDown()
+
+    def upload(self, **kwargs):
+        done = threading.Event()
+        outcome = {"progress": []}
+
+        def on_redirect(redirect):
+            outcome["redirect"] = redirect
+            done.set()
+
+        def on_failure(failure_type, result, data):
+            outcome["failure"] = (failure_type, result)
+            done.set()
+
+        upload = make_logfile_resumable_upload(
+            self.token,
+            3,
+            self.path,
+            "rcp",
+            "3.4.5",
+            redirect_callback=on_redirect,
+            failure_callback=on_failure,
+            progress_callback=lambda current, total, data: outcome["progress"].append((current, total)),
+            **kwargs
+        )
+        self.assertTrue(done.wait(5))
+        return upload, outcome
+
+    def paths(self, command):
+        return [request[1] for request in self.server.requests if request[0] == command]
+
+    def test_upload(self):
+        upload, outcome = self.upload()
+        self.assertEqual(outcome["redirect"].location, "/api/v1/logfiles/7")
+        self.assertEqual(len(self.server.uploads), 1)
+        # the whole file is POSTed once
+        self.assertIn(self.content, self.server.uploads[0])
+        self.assertEqual(self.paths("POST"), ["/upload", "/api/v1/logfiles"])
+        self.assertEqual(upload.attempts, 1)
+        current, total = outcome["progress"][-1]
+        self.assertEqual(current, total)
+        self.assertFalse(os.path.exists(self.path + ".upload"))
+
+    def test_sent_again_after_error(self):
+        self.server.drop_uploads = 1
+        upload, outcome = self.upload()
+        self.assertEqual(outcome["redirect"].location, "/api/v1/logfiles/7")
+        self.assertEqual(upload.attempts, 2)
+        self.assertEqual(len(self.server.uploads), 1)
+        self.assertIn(self.content, self.server.uploads[0])
+        self.assertEqual(len(self.paths("GET")), 1)
+
+    def test_max_attempts(self):
+        self.server.drop_uploads = 2
+        upload, outcome = self.upload(max_attempts=2)
+        self.assertEqual(outcome["failure"][0], "error")
+        self.assertEqual(upload.attempts, 2)
+        self.assertFalse(os.path.exists(self.path + ".upload"))
+
+    def test_resume_create(self):
+        self.server.fail_create = True
+        upload, outcome = self.upload()
+        self.assertEqual(outcome["failure"], ("failure", {"error": "unavailable"}))
+        manifest = UploadManifest.load(self.path, self.path + ".upload")
+        self.assertEqual(manifest.file_key, "key1")
+        self.assertEqual(manifest.eventdevice_id, 5)
+        self.server.fail_create = False
+        requests = len(self.server.requests)
+
+        upload, outcome = self.upload()
+        self.assertEqual(outcome["redirect"].location, "/api/v1/logfiles/7")
+        # the file was neither prepared nor sent again
+        self.assertEqual([request[1] for request in self.server.requests[requests:]], ["/api/v1/logfiles"])
+        self.assertEqual(upload.attempts, 0)
+        self.assertFalse(os.path.exists(self.path + ".upload"))
+
+    def test_changed_file(self):
+        manifest = UploadManifest(self.path, self.path + ".upload", "key1", 5)
+        manifest.save()
+        self.assertEqual(UploadManifest.load(self.path, self.path + ".upload").file_key, "key1")
+        with open(self.path, "ab") as f:
+            f.write(b"more")
+        self.assertIsNone(UploadManifest.load(self.path, self.path + ".upload"))
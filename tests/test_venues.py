@@ -1,13 +1,17 @@
 #!/usr/bin/env python
 # -*- coding: utf-8 -*-
+import os
+import tempfile
 import unittest
 
 from mock import Mock, patch
 
 import podium_api
+from podium_api.transport import LocalRequest, PooledTransport
 from podium_api.types.token import PodiumToken
 from podium_api.types.venue import get_venue_from_json
 from podium_api.venues import make_venue_get, make_venues_get
+from podium_api.venuestore import VenueStore
 
 try:
     from urllib.parse import urlencode
@@ -253,3 +257,104 @@ class TestVenueGet(unittest.TestCase):
 
     def tearDown(self):
         podium_api.unregister_podium_application()
+
+
+class TestVenueStore(unittest.TestCase):
+    def setUp(self):
+        podium_api.register_podium_application("test_id", "test_secret")
+        # PooledTransport answers stored venues inline instead of on the Kivy clock
+        podium_api.register_podium_transport(PooledTransport())
+        self.token = PodiumToken("test_token", "test_type", 1)
+        self.store = VenueStore()
+        self.venue_json = {
+            "URI": "test/venues/1234",
+            "events_uri": "venue/events",
+            "id": 1234,
+            "created": "2018-03-02T16:23:00Z",
+            "updated": "2018-03-02T16:23:00Z",
+            "track_map_array": [[43.79, -87.99], [43.8, -87.98]],
+            "sector_points": [[43.79, -87.99]],
+        }
+
+    def success_cb(self, result):
+        self.result = result
+
+    def test_put_and_get(self):
+        self.assertTrue(self.store.put(self.venue_json))
+        self.assertFalse(self.store.put(self.venue_json))
+        self.assertEqual(self.store.get(1234), self.venue_json)
+        self.assertEqual(self.store.get("test/venues/1234"), self.venue_json)
+        self.assertEqual(self.store.get(1234, updated="2018-03-02T16:23:00Z"), self.venue_json)
+        self.assertIsNone(self.store.get(1234, updated="2019-01-01T00:00:00Z"))
+        updated_json = dict(self.venue_json, updated="2019-01-01T00:00:00Z", track_map_array=[])
+        self.assertTrue(self.store.put(updated_json))
+        self.assertEqual(self.store.get(1234)["track_map_array"], [])
+        self.assertEqual(len(self.store), 1)
+        self.store.remove("test/venues/1234")
+        self.assertEqual(len(self.store), 0)
+
+    @patch("podium_api.venuestore.time.time")
+    def test_max_age(self, mock_time):
+        self.store.max_age = 60
+        mock_time.return_value = 1000.0
+        self.store.put(self.venue_json)
+        mock_time.return_value = 1059.0
+        self.assertEqual(self.store.get(1234), self.venue_json)
+        mock_time.return_value = 1061.0
+        self.assertIsNone(self.store.get(1234))
+        # the updated timestamp is known, the age does not matter
+        self.assertEqual(self.store.get(1234, updated="2018-03-02T16:23:00Z"), self.venue_json)
+        # receiving the same version again resets the age
+        self.assertFalse(self.store.put(self.venue_json))
+        self.assertEqual(self.store.get(1234), self.venue_json)
+        self.store.max_age = None
+        mock_time.return_value = 1000000.0
+        self.assertEqual(self.store.get(1234), self.venue_json)
+
+    def test_persists(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "venues.sqlite")
+            store = VenueStore(path)
+            store.put(self.venue_json)
+            store.close()
+            store = VenueStore(path)
+            self.assertEqual(store.get(1234), self.venue_json)
+            store.close()
+
+    @patch("podium_api.transport.PooledTransport.request")
+    def test_venue_get_stores_and_reads(self, mock_request):
+        make_venue_get(self.token, "test/venues/1234", store=self.store, success_callback=self.success_cb)
+        self.assertEqual(mock_request.call_count, 1)
+        on_success = mock_request.call_args[1]["on_success"]
+        on_success(None, {"venue": self.venue_json})
+        self.assertEqual(self.result.track_map_array, self.venue_json["track_map_array"])
+        self.result = None
+        req = make_venue_get(self.token, "test/venues/1234", store=self.store, success_callback=self.success_cb)
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertIsInstance(req, LocalRequest)
+        self.assertTrue(req.is_finished)
+        self.assertEqual(self.result.venue_id, 1234)
+        self.assertEqual(self.result.sector_points, self.venue_json["sector_points"])
+        # a newer venue is requested again
+        make_venue_get(
+            self.token,
+            "test/venues/1234",
+            store=self.store,
+            updated="2019-01-01T00:00:00Z",
+            success_callback=self.success_cb,
+        )
+        self.assertEqual(mock_request.call_count, 2)
+
+    @patch("podium_api.transport.PooledTransport.request")
+    def test_venues_get_stores_page(self, mock_request):
+        make_venues_get(self.token, "test/venues", store=self.store, success_callback=self.success_cb)
+        other_json = dict(self.venue_json, id=5678, URI="test/venues/5678")
+        mock_request.call_args[1]["on_success"](None, {"total": 2, "venues": [self.venue_json, other_json]})
+        self.assertEqual(len(self.result.venues), 2)
+        self.assertEqual(len(self.store), 2)
+        self.assertEqual(self.store.get("test/venues/5678")["id"], 5678)
+
+    def tearDown(self):
+        self.store.close()
+        podium_api.unregister_podium_transport()
+        podium_api.unregister_podium_application()